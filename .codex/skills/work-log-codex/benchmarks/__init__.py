@@ -0,0 +1 @@
+"""Synthetic histories and benchmarks for the work-log pipeline."""
@@ -0,0 +1,216 @@
+"""Time `build_report` and `generate_work_log.main` on synthetic histories.
+
+Run from the skill root:
+
+    python -m benchmarks.run_benchmarks --scales small,medium --output bench.json
+
+Each scale is generated once into a scratch directory, then every target is
+timed `--repeat` times. Results are JSON with a stable schema so runs from
+different commits can be diffed; one extra profiled `build_report` run per
+scale records the `--profile` stage breakdown, and `microbenchmarks` time
+hot helpers on the scale's transcript text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from benchmarks.synthetic_history import GeneratedHistory, HistorySpec, generate_history  # noqa: E402
+from scripts import generate_work_log  # noqa: E402
+from scripts.source_claude import load_claude_events  # noqa: E402
+from scripts.source_codex import load_codex_events  # noqa: E402
+from wl_parser.profiling import StageProfiler  # noqa: E402
+from wl_parser.work_log_parser import (  # noqa: E402
+    _SKIP_LINE_ANYWHERE,
+    _SKIP_LINE_PREFIX,
+    NOISE_HINT_PATTERNS,
+    SYSTEM_TAG_PATTERNS,
+    build_report,
+)
+
+
+RESULTS_SCHEMA_VERSION = 1
+
+SCALES: dict[str, HistorySpec] = {
+    "tiny": HistorySpec(projects=2, sessions_per_project=2, events_per_session=20, commits_per_repo=3),
+    "small": HistorySpec(projects=5, sessions_per_project=10, events_per_session=60, commits_per_repo=20),
+    "medium": HistorySpec(
+        projects=20, sessions_per_project=25, events_per_session=120, commits_per_repo=50, days=7
+    ),
+    "large": HistorySpec(
+        projects=40,
+        sessions_per_project=60,
+        events_per_session=300,
+        large_output_bytes=64 * 1024,
+        commits_per_repo=200,
+        days=30,
+    ),
+}
+
+
+def _timings(run: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        run()
+        runs.append(round(time.perf_counter() - began, 6))
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def _run_build_report(history: GeneratedHistory, jobs: int, **kwargs: Any) -> dict[str, Any]:
+    return build_report(
+        history.start, history.end, "UTC", history.claude_home, history.codex_home, jobs=jobs, **kwargs
+    )
+
+
+def _run_generate_work_log(history: GeneratedHistory, jobs: int, output_root: Path) -> None:
+    argv = [
+        "generate_work_log.py",
+        "--range",
+        history.start.date().isoformat(),
+        "--end-date",
+        history.end.date().isoformat(),
+        "--timezone",
+        "UTC",
+        "--claude-home",
+        str(history.claude_home),
+        "--codex-home",
+        str(history.codex_home),
+        "--output-mode",
+        "write-only",
+        "--output-root",
+        str(output_root),
+        "--jobs",
+        str(jobs),
+    ]
+    with patch.object(sys, "argv", argv), contextlib.redirect_stdout(io.StringIO()):
+        generate_work_log.main()
+
+
+def _transcript_lines(history: GeneratedHistory) -> list[str]:
+    events = load_claude_events(history.claude_home) + load_codex_events(history.codex_home)
+    return [
+        line.strip()
+        for event in events
+        for line in (event.get("text") or "").splitlines()
+        if line.strip()
+    ]
+
+
+def benchmark_skip_lines(lines: list[str], repeat: int = 3) -> dict[str, Any]:
+    """Time the skip-line check of `_first_meaningful_line` over `lines`.
+
+    `per_pattern` is the check before the patterns were combined, one
+    `search` per pattern; `combined` is `_SKIP_LINE_PREFIX` /
+    `_SKIP_LINE_ANYWHERE`. Both must skip the same lines.
+    """
+    patterns = SYSTEM_TAG_PATTERNS + NOISE_HINT_PATTERNS
+
+    def per_pattern() -> list[bool]:
+        return [any(pattern.search(line) for pattern in patterns) for line in lines]
+
+    def combined() -> list[bool]:
+        return [bool(_SKIP_LINE_PREFIX.match(line) or _SKIP_LINE_ANYWHERE.search(line)) for line in lines]
+
+    skipped = per_pattern()
+    if combined() != skipped:
+        raise AssertionError("combined skip-line patterns disagree with the per-pattern check")
+    return {
+        "lines": len(lines),
+        "skipped": sum(skipped),
+        "per_pattern": _timings(per_pattern, repeat),
+        "combined": _timings(combined, repeat),
+    }
+
+
+def benchmark_scale(
+    name: str, spec: HistorySpec, workdir: Path, repeat: int = 3, jobs: int = 1
+) -> dict[str, Any]:
+    """Generate `spec` under `workdir` and time each target on it."""
+    began = time.perf_counter()
+    history = generate_history(workdir / name, spec)
+    generate_seconds = round(time.perf_counter() - began, 6)
+    output_root = workdir / name / "work-logs"
+
+    with StageProfiler() as profiler:
+        report = _run_build_report(history, jobs, profiler=profiler)
+    return {
+        "scale": name,
+        "spec": spec.to_dict(),
+        "jobs": jobs,
+        "files": history.files,
+        "events": history.events,
+        "sessions": len(report["sessions"]),
+        "commits": report["summary"]["total_commits"],
+        "generate_seconds": generate_seconds,
+        "targets": {
+            "build_report": _timings(lambda: _run_build_report(history, jobs), repeat),
+            "generate_work_log": _timings(lambda: _run_generate_work_log(history, jobs, output_root), repeat),
+        },
+        "profile": profiler.to_dict(),
+        "microbenchmarks": {"skip_lines": benchmark_skip_lines(_transcript_lines(history), repeat)},
+    }
+
+
+def run_benchmarks(
+    scales: list[str], repeat: int = 3, jobs: int = 1, workdir: Path | None = None
+) -> dict[str, Any]:
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="work-log-bench-")))
+        results = [benchmark_scale(name, SCALES[name], workdir, repeat, jobs) for name in scales]
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the work-log pipeline on synthetic histories")
+    parser.add_argument(
+        "--scales",
+        default="tiny,small",
+        help=f"Comma-separated scales to run ({', '.join(SCALES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per target")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes passed to the loaders")
+    parser.add_argument("--workdir", default=None, help="Keep the generated histories here")
+    parser.add_argument("--output", default=None, help="Write results JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scales.split(",") if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    workdir = Path(args.workdir).expanduser() if args.workdir else None
+    results = run_benchmarks(args.scales.split(","), args.repeat, args.jobs, workdir)
+    text = json.dumps(results, indent=2) + "\n"
+    if args.output:
+        Path(args.output).expanduser().write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
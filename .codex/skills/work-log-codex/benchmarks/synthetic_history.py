@@ -0,0 +1,345 @@
+"""Deterministic synthetic `~/.claude` / `~/.codex` trees and git repos.
+
+The trees follow the layouts the loaders read (see `references/sources.md`):
+Claude project transcripts with subagent files and `history.jsonl`, and Codex
+rollout files under dated `sessions/` directories. The same `HistorySpec`
+always produces byte-identical files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import subprocess
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+
+GIT_USER = "Synthetic User"
+GIT_EMAIL = "synthetic@example.com"
+
+_WORDS = (
+    "parser", "report", "session", "cache", "window", "summary", "loader", "commit",
+    "project", "timeline", "duration", "fixture", "index", "render", "token", "stream",
+)
+
+# Harness and tool chatter real prompts and replies carry, which the parser
+# skips when picking a session's first prompt and closing note.
+_NOISE_BLOCKS = (
+    "<system-reminder>\nThe user opened parser.py in the IDE.\n</system-reminder>",
+    "# AGENTS.md instructions for /repo\n\n<INSTRUCTIONS>\nKeep changes small.\n</INSTRUCTIONS>",
+    "Step 1: read the failing test",
+    "⏺ Update(parser.py)\n  ⎿  Updated parser.py with 2 additions",
+    "```python\nprint(report)\n```",
+)
+
+@dataclass(frozen=True)
+class HistorySpec:
+    """Shape of a generated history.
+
+    Every project gets `sessions_per_project` Claude and as many Codex
+    sessions of `events_per_session` rows each, spread over `days` days from
+    `start`. Every `subagent_every`-th session also spawns a subagent session,
+    every `large_output_every`-th row carries a tool output of
+    `large_output_bytes`, every `noise_every`-th prompt or reply text is
+    preceded by harness noise (system reminders, AGENTS.md blocks, `Step N:`
+    and `⏺` lines, code fences), and each project repo gets
+    `commits_per_repo` commits inside the same days.
+    """
+
+    projects: int = 3
+    sessions_per_project: int = 2
+    events_per_session: int = 30
+    text_bytes: int = 160
+    large_output_bytes: int = 16 * 1024
+    large_output_every: int = 10
+    noise_every: int = 4
+    subagent_every: int = 3
+    commits_per_repo: int = 5
+    days: int = 1
+    start: datetime = field(default_factory=lambda: datetime(2026, 3, 11, 1, 0, tzinfo=timezone.utc))
+    seed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["start"] = self.start.isoformat()
+        return data
+
+
+@dataclass(frozen=True)
+class GeneratedHistory:
+    claude_home: Path
+    codex_home: Path
+    repo_paths: list[str]
+    start: datetime
+    end: datetime
+    files: int
+    events: int
+
+
+def _window(spec: HistorySpec) -> tuple[datetime, datetime]:
+    """Whole days covered by `spec`, as inclusive report bounds."""
+    first_day = spec.start.replace(hour=0, minute=0, second=0, microsecond=0)
+    return first_day, first_day + timedelta(days=spec.days, seconds=-1)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _sentence(rng: random.Random, size: int) -> str:
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _message_text(spec: HistorySpec, rng: random.Random, position: int) -> str:
+    """Prompt or reply text, preceded by harness noise every `noise_every` messages."""
+    text = _sentence(rng, spec.text_bytes)
+    block, offset = divmod(position, 3 * spec.noise_every)
+    if offset < 3:
+        # Picked by position, not `rng`, so timings match a noise-free spec.
+        return f"{_NOISE_BLOCKS[block % len(_NOISE_BLOCKS)]}\n{text}"
+    return text
+
+
+def _session_id(rng: random.Random) -> str:
+    value = f"{rng.getrandbits(128):032x}"
+    return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+
+def _write_jsonl(file_path: Path, rows: list[dict[str, Any]]) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            handle.write("\n")
+
+
+def _session_times(spec: HistorySpec, rng: random.Random, index: int) -> list[datetime]:
+    day = index % spec.days
+    begin = spec.start + timedelta(days=day, minutes=rng.randrange(0, 10 * 60))
+    times = []
+    moment = begin
+    for _ in range(spec.events_per_session):
+        times.append(moment)
+        moment += timedelta(seconds=rng.randrange(20, 240))
+    return times
+
+
+def _commit_command(rng: random.Random) -> str:
+    return f'git add -A && git commit -m "feat: {_sentence(rng, 40)}"'
+
+
+def _claude_rows(
+    spec: HistorySpec, rng: random.Random, session_id: str, cwd: str, times: list[datetime]
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for position, moment in enumerate(times):
+        base = {"sessionId": session_id, "cwd": cwd, "timestamp": _iso(moment)}
+        if position % 3 == 0:
+            content: Any = _message_text(spec, rng, position)
+            rows.append({**base, "type": "user", "message": {"role": "user", "content": content}})
+            continue
+        if position % 3 == 1:
+            command = _commit_command(rng) if position % 15 == 1 else f"rg {rng.choice(_WORDS)}"
+            rows.append(
+                {
+                    **base,
+                    "type": "assistant",
+                    "message": {
+                        "role": "assistant",
+                        "content": [
+                            {"type": "text", "text": _message_text(spec, rng, position)},
+                            {
+                                "type": "tool_use",
+                                "id": f"toolu_{position}",
+                                "name": "Bash",
+                                "input": {"command": command},
+                            },
+                        ],
+                        "usage": {
+                            "input_tokens": rng.randrange(100, 5000),
+                            "output_tokens": rng.randrange(10, 800),
+                            "cache_read_input_tokens": rng.randrange(0, 20000),
+                        },
+                    },
+                }
+            )
+            continue
+        size = spec.large_output_bytes if position % spec.large_output_every == 2 else spec.text_bytes
+        rows.append(
+            {
+                **base,
+                "type": "user",
+                "message": {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"toolu_{position - 1}",
+                            "content": _sentence(rng, size),
+                        }
+                    ],
+                },
+            }
+        )
+    return rows
+
+
+def _codex_rows(
+    spec: HistorySpec,
+    rng: random.Random,
+    session_id: str,
+    cwd: str,
+    times: list[datetime],
+    subagent_of: str | None = None,
+) -> list[dict[str, Any]]:
+    meta: dict[str, Any] = {"id": session_id, "cwd": cwd, "timestamp": _iso(times[0])}
+    if subagent_of is not None:
+        meta["source"] = {"subagent": {"thread_spawn": {"parent_thread_id": subagent_of, "depth": 1}}}
+    rows: list[dict[str, Any]] = [{"timestamp": _iso(times[0]), "type": "session_meta", "payload": meta}]
+    for position, moment in enumerate(times[1:], start=1):
+        stamp = _iso(moment)
+        if position % 3 == 1:
+            role, kind = ("user", "input_text") if position % 6 == 1 else ("assistant", "output_text")
+            payload: dict[str, Any] = {
+                "type": "message",
+                "role": role,
+                "content": [{"type": kind, "text": _message_text(spec, rng, position)}],
+            }
+        elif position % 3 == 2:
+            command = _commit_command(rng) if position % 15 == 2 else f"rg {rng.choice(_WORDS)}"
+            payload = {
+                "type": "function_call",
+                "name": "shell",
+                "call_id": f"call_{position}",
+                "arguments": json.dumps({"command": ["bash", "-lc", command]}),
+            }
+        else:
+            size = spec.large_output_bytes if position % spec.large_output_every == 0 else spec.text_bytes
+            payload = {
+                "type": "function_call_output",
+                "call_id": f"call_{position - 1}",
+                "output": _sentence(rng, size),
+            }
+        rows.append({"timestamp": stamp, "type": "response_item", "payload": payload})
+    return rows
+
+
+def _make_repo(repo: Path, spec: HistorySpec, rng: random.Random) -> None:
+    repo.mkdir(parents=True, exist_ok=True)
+    env = {**os.environ, "GIT_CONFIG_NOSYSTEM": "1"}
+
+    def git(*args: str, stdin: bytes | None = None) -> None:
+        subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, input=stdin, env=env)
+
+    git("init", "-q")
+    git("symbolic-ref", "HEAD", "refs/heads/main")
+    git("config", "user.name", GIT_USER)
+    git("config", "user.email", GIT_EMAIL)
+    if spec.commits_per_repo <= 0:
+        return
+    # One fast-import stream instead of an add/commit pair per commit.
+    first = int(spec.start.timestamp())
+    span = int(_window(spec)[1].timestamp()) - first
+    epochs = sorted(first + rng.randrange(0, span) for _ in range(spec.commits_per_repo))
+    stream: list[bytes] = []
+    for mark, epoch in enumerate(epochs, start=1):
+        message = f"feat: {_sentence(rng, 40)}".encode()
+        body = "\n".join(_sentence(rng, 60) for _ in range(rng.randrange(1, 20))).encode() + b"\n"
+        path = f"src/{rng.choice(_WORDS)}_{rng.randrange(0, 8)}.py"
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(f"mark :{mark}\n".encode())
+        stream.append(f"author {GIT_USER} <{GIT_EMAIL}> {epoch} +0000\n".encode())
+        stream.append(f"committer {GIT_USER} <{GIT_EMAIL}> {epoch} +0000\n".encode())
+        stream.append(f"data {len(message)}\n".encode() + message + b"\n")
+        if mark > 1:
+            stream.append(f"from :{mark - 1}\n".encode())
+        stream.append(f"M 100644 inline {path}\n".encode())
+        stream.append(f"data {len(body)}\n".encode() + body + b"\n")
+    git("fast-import", "--quiet", stdin=b"".join(stream))
+
+
+def generate_history(
+    root: Path, spec: HistorySpec | None = None, make_repos: bool = True
+) -> GeneratedHistory:
+    """Write a synthetic history under `root` and return where it lives.
+
+    `root/claude` and `root/codex` stand in for `~/.claude` and `~/.codex`;
+    project repos live under `root/repos`. With `make_repos=False` the project
+    paths are recorded in the histories but no git repos are created.
+    """
+    spec = spec or HistorySpec()
+    rng = random.Random(spec.seed)
+    claude_home = root / "claude"
+    codex_home = root / "codex"
+    repo_paths: list[str] = []
+    history_rows: list[dict[str, Any]] = []
+    files = 0
+    events = 0
+    session_index = 0
+
+    for project in range(spec.projects):
+        repo = root / "repos" / f"project-{project:03d}"
+        cwd = str(repo)
+        repo_paths.append(cwd)
+        if make_repos:
+            _make_repo(repo, spec, rng)
+        project_dir = claude_home / "projects" / cwd.replace("/", "-")
+
+        for _ in range(spec.sessions_per_project):
+            times = _session_times(spec, rng, session_index)
+            claude_id = _session_id(rng)
+            rows = _claude_rows(spec, rng, claude_id, cwd, times)
+            _write_jsonl(project_dir / f"{claude_id}.jsonl", rows)
+            history_rows.append(
+                {
+                    "display": rows[0]["message"]["content"][:80],
+                    "pastedContents": {},
+                    "timestamp": int(times[0].timestamp() * 1000),
+                    "project": cwd,
+                }
+            )
+            files += 1
+            events += len(rows)
+
+            codex_id = _session_id(rng)
+            day_dir = codex_home / "sessions" / times[0].strftime("%Y/%m/%d")
+            rows = _codex_rows(spec, rng, codex_id, cwd, times)
+            _write_jsonl(day_dir / f"rollout-{times[0].strftime('%Y-%m-%dT%H-%M-%S')}-{codex_id}.jsonl", rows)
+            files += 1
+            events += len(rows)
+
+            if spec.subagent_every and session_index % spec.subagent_every == 0:
+                sub_times = times[len(times) // 2 :] or times
+                rows = _claude_rows(spec, rng, claude_id, cwd, sub_times)
+                _write_jsonl(project_dir / claude_id / "subagents" / f"agent-{session_index:04d}.jsonl", rows)
+                sub_id = _session_id(rng)
+                sub_rows = _codex_rows(spec, rng, sub_id, cwd, sub_times, subagent_of=codex_id)
+                _write_jsonl(
+                    day_dir / f"rollout-{sub_times[0].strftime('%Y-%m-%dT%H-%M-%S')}-{sub_id}.jsonl", sub_rows
+                )
+                files += 2
+                events += len(rows) + len(sub_rows)
+            session_index += 1
+
+    history_rows.sort(key=lambda row: row["timestamp"])
+    _write_jsonl(claude_home / "history.jsonl", history_rows)
+    start, end = _window(spec)
+    return GeneratedHistory(
+        claude_home=claude_home,
+        codex_home=codex_home,
+        repo_paths=repo_paths,
+        start=start,
+        end=end,
+        files=files,
+        events=events,
+    )
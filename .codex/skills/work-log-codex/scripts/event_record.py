@@ -0,0 +1,297 @@
+"""Compact event record shared by the loaders, event store and report builder."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+try:
+    from scripts.jsonl_stream import read_jsonl_row
+    from scripts.timestamps import timestamp_epoch
+except ImportError:  # imported as a top-level module from scripts/
+    from jsonl_stream import read_jsonl_row
+    from timestamps import timestamp_epoch
+
+
+def _extract_role(tool: str | None, event_type: Any, title: Any, raw: dict[str, Any]) -> str | None:
+    if event_type in {"user", "assistant"}:
+        return event_type
+
+    if tool == "codex":
+        payload = raw.get("payload", {})
+        if isinstance(payload, dict):
+            if payload.get("type") == "message":
+                role = payload.get("role")
+                if isinstance(role, str) and role:
+                    return role
+        if isinstance(title, str) and title in {"user", "assistant"}:
+            return title
+        return None
+
+    message = raw.get("message")
+    if isinstance(message, dict):
+        role = message.get("role")
+        if isinstance(role, str) and role:
+            return role
+    return None
+
+
+def _extract_tool_names(tool: str | None, event_type: Any, raw: dict[str, Any]) -> tuple[str, ...]:
+    names: list[str] = []
+    if tool == "claude":
+        if event_type == "tool_use":
+            name = raw.get("tool_name") or raw.get("name")
+            if isinstance(name, str) and name:
+                return (name,)
+        message = raw.get("message")
+        content = message.get("content", []) if isinstance(message, dict) else []
+        if isinstance(content, list):
+            for block in content:
+                if not isinstance(block, dict):
+                    continue
+                if block.get("type") == "tool_use":
+                    name = block.get("name")
+                    if isinstance(name, str) and name:
+                        names.append(name)
+        return tuple(names)
+
+    payload = raw.get("payload", {})
+    if isinstance(payload, dict):
+        payload_type = payload.get("type")
+        if payload_type in {"function_call", "tool_call"}:
+            name = payload.get("name")
+            if isinstance(name, str) and name:
+                names.append(name)
+        if payload_type == "message":
+            content = payload.get("content", [])
+            if isinstance(content, list):
+                for item in content:
+                    if not isinstance(item, dict):
+                        continue
+                    if item.get("type") in {"tool_call", "function_call"}:
+                        name = item.get("name")
+                        if isinstance(name, str) and name:
+                            names.append(name)
+    return tuple(names)
+
+
+def _extract_usage(tool: str | None, raw: dict[str, Any]) -> dict[str, int] | None:
+    usage = raw.get("usage")
+    if tool == "claude" and not isinstance(usage, dict):
+        message = raw.get("message")
+        if isinstance(message, dict):
+            usage = message.get("usage")
+    elif tool == "codex" and not isinstance(usage, dict):
+        payload = raw.get("payload")
+        if isinstance(payload, dict):
+            usage = payload.get("usage")
+    if not isinstance(usage, dict):
+        return None
+    return {
+        "input": int(usage.get("input_tokens", 0) or 0),
+        "output": int(usage.get("output_tokens", 0) or 0),
+        "cache_creation": int(usage.get("cache_creation_input_tokens", 0) or 0),
+        "cache_read": int(usage.get("cache_read_input_tokens", 0) or 0),
+    }
+
+
+def _command_text(value: Any) -> str | None:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and value and all(isinstance(part, str) for part in value):
+        return " ".join(value)
+    return None
+
+
+def _tool_input_commands(tool_input: Any) -> list[str]:
+    """Shell commands mentioning `git commit` in one tool call's input."""
+    if isinstance(tool_input, str):
+        # Codex function_call arguments arrive as a JSON string; skip the
+        # decode entirely unless a commit can be in there.
+        if "git commit" not in tool_input:
+            return []
+        try:
+            tool_input = json.loads(tool_input)
+        except ValueError:
+            return [tool_input]
+    if not isinstance(tool_input, dict):
+        return []
+    commands: list[str] = []
+    for key in ("command", "cmd"):
+        text = _command_text(tool_input.get(key))
+        if text and "git commit" in text:
+            commands.append(text)
+    return commands
+
+
+def _extract_commit_commands(tool: str | None, event_type: Any, raw: dict[str, Any]) -> tuple[str, ...]:
+    """`git commit` commands from the tool-call inputs of a Claude or Codex row.
+
+    Only the places a shell command can be issued are read: Claude `tool_use`
+    input and Codex `function_call` / `local_shell_call` arguments. Commands
+    echoed elsewhere in the row (tool output, quoted text) are not picked up;
+    `extract_command_strings` is the deep-scan fallback for those.
+    """
+    commands: list[str] = []
+    if tool == "claude":
+        if event_type == "tool_use":
+            commands.extend(_tool_input_commands(raw.get("tool_input") or raw.get("input")))
+        message = raw.get("message")
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "tool_use":
+                    commands.extend(_tool_input_commands(block.get("input")))
+        return tuple(commands)
+
+    payload = raw.get("payload")
+    if not isinstance(payload, dict):
+        return ()
+    payload_type = payload.get("type")
+    if payload_type in {"function_call", "tool_call"}:
+        commands.extend(_tool_input_commands(payload.get("arguments")))
+    elif payload_type == "local_shell_call":
+        commands.extend(_tool_input_commands(payload.get("action")))
+    elif payload_type == "message":
+        content = payload.get("content")
+        if isinstance(content, list):
+            for item in content:
+                if isinstance(item, dict) and item.get("type") in {"tool_call", "function_call"}:
+                    commands.extend(_tool_input_commands(item.get("arguments")))
+    return tuple(commands)
+
+
+def extract_command_strings(value: Any) -> list[str]:
+    """Every string anywhere inside `value` that mentions `git commit`."""
+    commands: list[str] = []
+    if isinstance(value, str):
+        if "git commit" in value:
+            commands.append(value)
+        return commands
+    if isinstance(value, dict):
+        for nested in value.values():
+            commands.extend(extract_command_strings(nested))
+        return commands
+    if isinstance(value, list):
+        for nested in value:
+            commands.extend(extract_command_strings(nested))
+    return commands
+
+
+@dataclass(slots=True, eq=True)
+class Event:
+    """One normalized Claude or Codex event.
+
+    Everything the report needs from the source row (role, token usage, tool
+    call names and `git commit` commands) is extracted when the event is built,
+    so the row itself is not kept. `raw` re-reads it from `evidence_path` at
+    `raw_offset` on demand. Item access (`event["text"]`, `event.get(...)`)
+    mirrors the dict events the loaders used to return.
+    """
+
+    tool: str | None
+    session_id: str | None = None
+    project_path: str | None = None
+    cwd: str | None = None
+    timestamp: Any = None
+    ts_epoch: float | None = None
+    event_type: str | None = None
+    title: str | None = None
+    text: str | None = None
+    evidence_path: str | None = None
+    confidence: str | None = None
+    is_subagent: bool = False
+    role: str | None = None
+    usage: dict[str, int] | None = None
+    tool_names: tuple[str, ...] = ()
+    commit_commands: tuple[str, ...] = ()
+    raw_offset: int | None = None
+    _raw: dict[str, Any] | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_row(
+        cls,
+        row: dict[str, Any],
+        raw_offset: int | None = None,
+        keep_raw: bool = False,
+        **values: Any,
+    ) -> Event:
+        """Build an event from `values`, extracting the row-derived fields from `row`."""
+        tool = values.get("tool")
+        if "ts_epoch" not in values:
+            values["ts_epoch"] = timestamp_epoch(values.get("timestamp"))
+        return cls(
+            role=_extract_role(tool, values.get("event_type"), values.get("title"), row),
+            usage=_extract_usage(tool, row),
+            tool_names=_extract_tool_names(tool, values.get("event_type"), row),
+            commit_commands=_extract_commit_commands(tool, values.get("event_type"), row),
+            raw_offset=raw_offset,
+            _raw=row if keep_raw else None,
+            **values,
+        )
+
+    @classmethod
+    def coerce(cls, event: Event | dict[str, Any]) -> Event:
+        """Return `event` as an `Event`; dict events keep their `raw` in memory."""
+        if isinstance(event, cls):
+            return event
+        values = {key: event[key] for key in _DICT_KEYS if key in event}
+        values["tool"] = event.get("tool")
+        raw = event.get("raw")
+        return cls.from_row(raw if isinstance(raw, dict) else {}, keep_raw=isinstance(raw, dict), **values)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Event:
+        """Inverse of `to_dict`."""
+        values = dict(data)
+        values["tool_names"] = tuple(values.get("tool_names", ()))
+        values["commit_commands"] = tuple(values.get("commit_commands", ()))
+        return cls(**values)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready fields without the row itself."""
+        return {name: getattr(self, name) for name in _STORED_FIELDS}
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        if self._raw is not None:
+            return self._raw
+        if self.raw_offset is None or self.evidence_path is None:
+            return {}
+        return read_jsonl_row(self.evidence_path, self.raw_offset) or {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _ITEM_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _ITEM_KEYS or key == "raw":
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _ITEM_KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _ITEM_KEYS else default
+
+
+_STORED_FIELDS = tuple(item.name for item in fields(Event) if item.name != "_raw")
+_ITEM_KEYS = frozenset(_STORED_FIELDS) | {"raw"}
+# Keys a plain dict event may carry; row-derived fields are recomputed from `raw`.
+_DICT_KEYS = (
+    "tool",
+    "session_id",
+    "project_path",
+    "cwd",
+    "timestamp",
+    "ts_epoch",
+    "event_type",
+    "title",
+    "text",
+    "evidence_path",
+    "confidence",
+    "is_subagent",
+)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 import re
@@ -13,7 +14,8 @@ if str(SKILL_ROOT) not in sys.path:
     sys.path.insert(0, str(SKILL_ROOT))
 
 from wl_parser.formatters import format_appendix, format_debug, format_obsidian, format_report, format_terminal  # noqa: E402
-from wl_parser.work_log_parser import build_report, parse_time_shortcut  # noqa: E402
+from wl_parser.profiling import StageProfiler, profile_stage  # noqa: E402
+from wl_parser.work_log_parser import DEFAULT_GIT_JOBS, build_report, open_report_caches, parse_time_shortcut  # noqa: E402
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -33,6 +35,13 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--summary-file", default=None)
     parser.add_argument("--emit-json", default=None)
     parser.add_argument("--emit-project-dir", default=None)
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--clear-git-cache", action="store_true")
+    parser.add_argument("--clear-day-cache", action="store_true")
+    parser.add_argument("--git-jobs", type=int, default=DEFAULT_GIT_JOBS)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--deep-commit-scan", action="store_true")
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="PATH")
     parser.add_argument(
         "--mode",
         choices=("report", "report+appendix", "debug", "all"),
@@ -227,15 +236,33 @@ def _output_path_for(kind: str, report: dict, root: Path) -> Path:
 def main() -> int:
     args = build_parser().parse_args()
     start, end = parse_time_shortcut(args.time_range, args.timezone, args.end_date)
-    report = build_report(
-        start=start,
-        end=end,
-        timezone_name=args.timezone,
-        claude_home=Path(args.claude_home).expanduser(),
-        codex_home=Path(args.codex_home).expanduser(),
-        project_filter=args.project,
-    )
+    cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else None
+    profiler = StageProfiler() if args.profile else None
+    with profiler if profiler is not None else nullcontext():
+        with open_report_caches(
+            cache_dir, clear_git_cache=args.clear_git_cache, clear_day_cache=args.clear_day_cache
+        ) as caches:
+            report = build_report(
+                start=start,
+                end=end,
+                timezone_name=args.timezone,
+                claude_home=Path(args.claude_home).expanduser(),
+                codex_home=Path(args.codex_home).expanduser(),
+                project_filter=args.project,
+                git_jobs=args.git_jobs,
+                jobs=args.jobs,
+                deep_commit_scan=args.deep_commit_scan,
+                profiler=profiler,
+                **caches,
+            )
+        with profile_stage(profiler, "output"):
+            _write_outputs(args, report)
+    if profiler is not None:
+        profiler.write(args.profile)
+    return 0
+
 
+def _write_outputs(args: argparse.Namespace, report: dict) -> None:
     if args.emit_json:
         json_path = Path(args.emit_json).expanduser()
         json_path.parent.mkdir(parents=True, exist_ok=True)
@@ -243,9 +270,9 @@ def main() -> int:
 
     if args.emit_project_dir:
         # Reuse parser CLI contract without shelling out.
-        from wl_parser.work_log_parser import _emit_project_bundles  # noqa: PLC0415
+        from wl_parser.project_bundles import emit_project_bundles  # noqa: PLC0415
 
-        _emit_project_bundles(report, Path(args.emit_project_dir).expanduser())
+        emit_project_bundles(report, Path(args.emit_project_dir).expanduser())
 
     summary_markdown = _read_summary(args.summary_file, report)
 
@@ -277,8 +304,6 @@ def main() -> int:
             for path in written_paths:
                 print(f"已寫入：{path}")
 
-    return 0
-
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,208 @@
+"""Idle-gap activity windows: the one interval engine behind every duration.
+
+A window is a `[first, last]` pair of points from one activity stream, where
+consecutive points are at most the idle gap apart. Points may be epoch floats
+(with gaps in seconds) or datetimes (with `timedelta` gaps); the functions
+only subtract and compare them. Windows of several streams merge into the
+windows of the combined stream, so totals, per-project and per-day figures
+are all unions of windows built once per stream.
+
+Large streams of epoch floats take a NumPy path when NumPy is importable:
+gap splits, running window ends and minute flooring become array operations
+over the same float64 values, so both paths give identical results.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from typing import Any, Callable, Hashable, Iterable, Sequence
+
+try:  # optional; only speeds up large streams
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+IDLE_THRESHOLD_MINUTES = 30
+IDLE_GAP_SECONDS = IDLE_THRESHOLD_MINUTES * 60
+# Below this many points or windows the NumPy call overhead outweighs the loop.
+VECTORIZE_MIN_SIZE = 2048
+
+
+def epoch_array(points: Iterable[float] = ()) -> array:
+    """Compact `array('d')` of epoch points; NumPy wraps it without a copy."""
+    return array("d", points)
+
+
+def _vectorize(values: Sequence[Any]) -> bool:
+    return (
+        np is not None
+        and len(values) >= VECTORIZE_MIN_SIZE
+        and isinstance(values[0], float)
+    )
+
+
+def _np_whole_minutes(seconds: Any) -> int:
+    # `np.rint` rounds half to even like `round`, and float floor division of
+    # whole microsecond counts is exact, so this matches `whole_minutes`.
+    return int((np.rint(seconds * 1_000_000) // 60_000_000).astype(np.int64).sum())
+
+
+def _np_activity_windows(points: Sequence[float], idle_gap: float, presorted: bool) -> list[list[float]]:
+    if isinstance(points, array):
+        values = np.frombuffer(points, dtype=np.float64)
+    else:
+        values = np.asarray(points, dtype=np.float64)
+    if not presorted:
+        values = np.sort(values)
+    breaks = np.flatnonzero(np.diff(values) > idle_gap) + 1
+    firsts = values[np.concatenate(([0], breaks))]
+    lasts = values[np.concatenate((breaks - 1, [len(values) - 1]))]
+    return np.column_stack((firsts, lasts)).tolist()
+
+
+def _np_union_minutes(starts: Any, ends: Any, join_gap: float) -> int:
+    """Minutes of the union of windows sorted by start, without a Python loop.
+
+    A window opens a new merged window when it starts more than `join_gap`
+    after the furthest end so far; the merged window ends at that running end.
+    """
+    reach = np.maximum.accumulate(ends)
+    breaks = np.flatnonzero(starts[1:] - reach[:-1] > join_gap) + 1
+    firsts = starts[np.concatenate(([0], breaks))]
+    lasts = reach[np.concatenate((breaks - 1, [len(starts) - 1]))]
+    return _np_whole_minutes(lasts - firsts)
+
+
+def whole_minutes(seconds: float) -> int:
+    """Completed minutes in `seconds`, floored like a timedelta would be."""
+    # Round to the microsecond first so float epochs floor like timedeltas do.
+    return round(seconds * 1_000_000) // 60_000_000
+
+
+def activity_windows(
+    points: Iterable[Any], idle_gap: Any = IDLE_GAP_SECONDS, presorted: bool = False
+) -> list[list[Any]]:
+    """Split `points` into windows wherever two neighbours are more than `idle_gap` apart.
+
+    Pass `presorted=True` when the points are already in order to skip the sort.
+    """
+    if not hasattr(points, "__len__"):
+        points = list(points)
+    if _vectorize(points):
+        return _np_activity_windows(points, idle_gap, presorted)
+    windows: list[list[Any]] = []
+    for point in points if presorted else sorted(points):
+        if windows and point - windows[-1][1] <= idle_gap:
+            windows[-1][1] = point
+        else:
+            windows.append([point, point])
+    return windows
+
+
+def merge_windows(
+    windows: Iterable[Sequence[Any]], join_gap: Any = IDLE_GAP_SECONDS, presorted: bool = False
+) -> list[list[Any]]:
+    """Union of `windows`, also joining windows at most `join_gap` apart.
+
+    With the idle gap this yields the windows of the streams' combined points;
+    with a zero gap only overlapping or touching windows are joined. Pass
+    `presorted=True` when the windows are already ordered by start.
+    """
+    merged: list[list[Any]] = []
+    for begin, finish in windows if presorted else sorted(windows, key=lambda window: window[0]):
+        if merged and begin - merged[-1][1] <= join_gap:
+            if finish > merged[-1][1]:
+                merged[-1][1] = finish
+        else:
+            merged.append([begin, finish])
+    return merged
+
+
+def window_minutes(
+    windows: Iterable[Sequence[Any]], minutes: Callable[[Any], int] = whole_minutes
+) -> int:
+    """Sum `minutes(last - first)` over already merged windows."""
+    return sum(minutes(finish - begin) for begin, finish in windows)
+
+
+def active_minutes(
+    points: Iterable[float], idle_gap: float = IDLE_GAP_SECONDS, presorted: bool = False
+) -> int:
+    """Whole active minutes of one stream of epoch points."""
+    return window_minutes(activity_windows(points, idle_gap, presorted))
+
+
+class WindowIndex:
+    """Labelled windows, sorted by start once, answering union queries.
+
+    Each entry is `(labels, window)`, where `labels` is a tuple such as
+    `(day, project)`. `minutes()` is the union over every window and
+    `minutes_by(position)` the union per value of one label; neither sorts
+    again, since a sorted list stays sorted when split by label. Large
+    indexes of epoch windows with the default minute rule are answered with
+    NumPy when it is available.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[tuple[Hashable, ...], Sequence[Any]]],
+        join_gap: Any = IDLE_GAP_SECONDS,
+        minutes: Callable[[Any], int] = whole_minutes,
+    ) -> None:
+        self._entries = sorted(entries, key=lambda entry: entry[1][0])
+        self._join_gap = join_gap
+        self._minutes = minutes
+        self._columns: tuple[Any, Any] | None = None
+
+    def _vectorized(self) -> bool:
+        return (
+            np is not None
+            and self._minutes is whole_minutes
+            and len(self._entries) >= VECTORIZE_MIN_SIZE
+            and isinstance(self._entries[0][1][0], float)
+        )
+
+    def _arrays(self) -> tuple[Any, Any]:
+        if self._columns is None:
+            starts = epoch_array(window[0] for _labels, window in self._entries)
+            ends = epoch_array(window[1] for _labels, window in self._entries)
+            self._columns = (np.frombuffer(starts, dtype=np.float64), np.frombuffer(ends, dtype=np.float64))
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _union_minutes(self, windows: list[Sequence[Any]]) -> int:
+        return window_minutes(merge_windows(windows, self._join_gap, presorted=True), self._minutes)
+
+    def minutes(self) -> int:
+        if self._vectorized():
+            return _np_union_minutes(*self._arrays(), self._join_gap)
+        return self._union_minutes([window for _labels, window in self._entries])
+
+    def minutes_by(self, position: int) -> dict[Hashable, int]:
+        if self._vectorized():
+            return self._np_minutes_by(position)
+        grouped: dict[Hashable, list[Sequence[Any]]] = defaultdict(list)
+        for labels, window in self._entries:
+            grouped[labels[position]].append(window)
+        return {label: self._union_minutes(windows) for label, windows in grouped.items()}
+
+    def _np_minutes_by(self, position: int) -> dict[Hashable, int]:
+        codes: dict[Hashable, int] = {}
+        labels = np.fromiter(
+            (codes.setdefault(labels[position], len(codes)) for labels, _window in self._entries),
+            dtype=np.int64,
+            count=len(self._entries),
+        )
+        starts, ends = self._arrays()
+        # A stable sort by label keeps each label's windows in start order.
+        order = np.argsort(labels, kind="stable")
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(labels[order])) + 1, [len(order)]))
+        totals = {}
+        for first, stop in zip(bounds[:-1], bounds[1:]):
+            picked = order[first:stop]
+            totals[int(labels[picked[0]])] = _np_union_minutes(starts[picked], ends[picked], self._join_gap)
+        return {label: totals[code] for label, code in codes.items()}
@@ -0,0 +1,392 @@
+"""Streaming JSONL reader shared by the Claude and Codex loaders."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import mmap
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, NamedTuple
+
+try:
+    from scripts.timestamps import timestamp_epoch
+except ImportError:  # imported as a top-level module from scripts/
+    from timestamps import timestamp_epoch
+
+
+MalformedLineHandler = Callable[[Path, int, str], None]
+LineFilter = Callable[[bytes], bool]
+Window = tuple[float, float]
+
+READ_BUFFER_SIZE = 1 << 20
+# Files smaller than this are scanned linearly; seeking would not pay off.
+SEEK_MIN_BYTES = 1 << 20
+# Rows within this many seconds of each other may be written out of order.
+ORDER_SLACK_SECONDS = 300.0
+PROBE_MAX_LINES = 64
+LINEAR_SCAN_BYTES = 64 * 1024
+
+
+def _open_zstd(file_path: Path) -> IO[bytes]:
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        import zstandard
+
+        handle = open(file_path, "rb")
+        try:
+            reader = zstandard.ZstdDecompressor().stream_reader(handle, closefd=True)
+        except BaseException:
+            handle.close()
+            raise
+        return io.BufferedReader(reader, READ_BUFFER_SIZE)
+    return zstd.open(file_path, "rb")
+
+
+def _zstd_available() -> bool:
+    try:
+        from compression import zstd  # noqa: F401  # Python 3.14+
+    except ImportError:
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+_DECOMPRESSORS: dict[str, Callable[[Path], IO[bytes]]] = {
+    ".gz": lambda file_path: gzip.open(file_path, "rb"),
+}
+if _zstd_available():
+    _DECOMPRESSORS[".zst"] = _open_zstd
+
+# Rotated histories are picked up next to the live `.jsonl` files; `.zst`
+# only when a zstd codec (Python 3.14 `compression.zstd` or the optional
+# `zstandard` package) can be imported.
+JSONL_SUFFIXES = (".jsonl", *(f".jsonl{suffix}" for suffix in _DECOMPRESSORS))
+
+_TIMESTAMP_VALUE = re.compile(rb'"timestamp"\s*:\s*"([^"\\]{1,64})"')
+
+
+class SourceChunk(NamedTuple):
+    """Events parsed from one source file starting at a byte offset.
+
+    `events` pairs each event with the byte offset just past its line, `offset`
+    is where the next incremental read should resume, and `state` carries the
+    per-file context (session id, cwd, ...) needed to parse the following lines.
+    """
+
+    events: list[tuple[int, Any]]
+    offset: int
+    state: dict[str, Any]
+
+
+def is_compressed(file_path: Path) -> bool:
+    """Whether `file_path` is a rotated `.jsonl.gz` / `.jsonl.zst` history."""
+    return Path(file_path).suffix in _DECOMPRESSORS
+
+
+def is_jsonl_path(file_path: Path) -> bool:
+    """Whether `file_path` is a JSONL file the loaders can read, compressed or not."""
+    return file_path.name.endswith(JSONL_SUFFIXES)
+
+
+def jsonl_stem(file_path: Path) -> str:
+    """File name without its `.jsonl[.gz|.zst]` suffix."""
+    name = file_path.name
+    for suffix in JSONL_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return file_path.stem
+
+
+def iter_jsonl_files(directory: Path, recursive: bool = False) -> list[Path]:
+    """Sorted JSONL files under `directory`, compressed ones included.
+
+    A rotated copy is left out while its uncompressed `.jsonl` still exists,
+    so a file caught mid-rotation is not read twice.
+    """
+    candidates = directory.rglob("*.jsonl*") if recursive else directory.glob("*.jsonl*")
+    paths = sorted(path for path in candidates if is_jsonl_path(path) and path.is_file())
+    plain = {path for path in paths if path.suffix == ".jsonl"}
+    return [path for path in paths if path in plain or path.with_suffix("") not in plain]
+
+
+def modified_before(file_path: Path, start: datetime | None) -> bool:
+    """Whether `file_path` was last modified before `start` (or cannot be stat'ed)."""
+    if start is None:
+        return False
+    try:
+        return file_path.stat().st_mtime < start.timestamp()
+    except OSError:
+        return True
+
+
+def open_jsonl(file_path: Path) -> IO[bytes]:
+    """Open a JSONL file for binary reading, decompressing rotated histories as a stream.
+
+    Offsets into a compressed file count decompressed bytes.
+    """
+    decompress = _DECOMPRESSORS.get(Path(file_path).suffix)
+    if decompress is None:
+        return open(file_path, "rb", buffering=READ_BUFFER_SIZE)
+    return decompress(file_path)
+
+
+def _seek(handle: IO[bytes], offset: int) -> None:
+    if handle.seekable():
+        handle.seek(offset)
+        return
+    # Forward-only decompression streams: read up to `offset` instead.
+    while offset > 0:
+        chunk = handle.read(min(offset, READ_BUFFER_SIZE))
+        if not chunk:
+            return
+        offset -= len(chunk)
+
+
+def iter_jsonl_lines(
+    file_path: Path,
+    start_offset: int = 0,
+    on_error: MalformedLineHandler | None = None,
+    skip_line: LineFilter | None = None,
+    end_offset: int | None = None,
+    stop_line: LineFilter | None = None,
+) -> Iterator[tuple[int, int, dict[str, Any]]]:
+    """Yield `(line_start, line_end, row)` for each JSON object line after `start_offset`.
+
+    `line_end` is the byte position just past the row's line, so a caller can
+    resume from the last yielded offset; `line_start` lets `read_jsonl_row`
+    fetch the row again later. A trailing line without a newline is only
+    yielded when it already parses; a half-written row is left for the next
+    read. Lines for which `skip_line(raw_bytes)` is true are never decoded.
+    Reading stops before the first line starting at or after `end_offset`, or
+    at the first line for which `stop_line(raw_bytes)` is true. Compressed
+    files are decompressed chunk by chunk as the lines are read.
+    """
+    try:
+        handle = open_jsonl(file_path)
+    except FileNotFoundError:
+        return
+    with handle:
+        if start_offset:
+            _seek(handle, start_offset)
+        position = start_offset
+        line_number = 0
+        while end_offset is None or position < end_offset:
+            try:
+                raw_line = handle.readline()
+            except (OSError, EOFError) as error:  # corrupt or truncated archive
+                if on_error is not None:
+                    on_error(file_path, line_number + 1, str(error))
+                return
+            if not raw_line:
+                return
+            line_number += 1
+            line_start = position
+            position += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                continue
+            if stop_line is not None and stop_line(line):
+                return
+            if skip_line is not None and skip_line(line):
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                if on_error is not None:
+                    on_error(file_path, line_number, str(error))
+                continue
+            if not isinstance(row, dict):
+                if on_error is not None:
+                    on_error(file_path, line_number, "not a JSON object")
+                continue
+            yield line_start, position, row
+
+
+def outside_window(line: bytes, window: Window, keep: tuple[bytes, ...] = ()) -> bool:
+    """Whether a raw JSONL row can be skipped for `window` without decoding it.
+
+    The `"timestamp"` values are pulled out of the bytes with one regex scan.
+    A row is skipped only when it has at least one, every one of them parses,
+    and all fall outside `[start, end]` epoch seconds; a timestamp nested in
+    tool output can therefore cost an extra decode but never drop a row. Rows
+    containing any `keep` marker (e.g. state-setting rows) are always decoded.
+    """
+    if any(marker in line for marker in keep):
+        return False
+    values = _TIMESTAMP_VALUE.findall(line)
+    if not values:
+        return False
+    start, end = window
+    for value in values:
+        epoch = timestamp_epoch(value.decode("ascii", "replace"))
+        if epoch is None or start <= epoch <= end:
+            return False
+    return True
+
+
+def past_window(line: bytes, end: float) -> bool:
+    """Whether every `"timestamp"` value in a raw row parses and lies after `end`."""
+    values = _TIMESTAMP_VALUE.findall(line)
+    if not values:
+        return False
+    for value in values:
+        epoch = timestamp_epoch(value.decode("ascii", "replace"))
+        if epoch is None or epoch <= end:
+            return False
+    return True
+
+
+def _row_epoch(line: bytes) -> float | None:
+    try:
+        row = json.loads(line)
+    except ValueError:
+        return None
+    return timestamp_epoch(row.get("timestamp")) if isinstance(row, dict) else None
+
+
+def _stamped_line_at(mm: mmap.mmap, position: int, limit: int) -> tuple[int, int, float] | None:
+    """`(line_start, line_end, epoch)` of the first stamped line starting in `[position, limit)`."""
+    if position > 0 and mm[position - 1] != 0x0A:
+        newline = mm.find(b"\n", position)
+        if newline == -1:
+            return None
+        position = newline + 1
+    for _ in range(PROBE_MAX_LINES):
+        if position >= limit:
+            return None
+        newline = mm.find(b"\n", position)
+        line_end = len(mm) if newline == -1 else newline + 1
+        epoch = _row_epoch(mm[position:line_end])
+        if epoch is not None:
+            return position, line_end, epoch
+        position = line_end
+    return None
+
+
+def _seek_window_start(mm: mmap.mmap, head: int, target: float) -> int | None:
+    """Line start from which every row stamped `>= target` follows, or None.
+
+    Binary-searches line boundaries in `[head, len(mm))` by their top-level
+    `timestamp`, assuming rows were appended in time order. None means the
+    probed timestamps went backwards, so the file cannot be seeked safely.
+    """
+    lo, hi = head, len(mm)
+    probes: list[tuple[int, float]] = []
+    while hi - lo > LINEAR_SCAN_BYTES:
+        mid = (lo + hi) // 2
+        probe = _stamped_line_at(mm, mid, hi)
+        if probe is None:
+            hi = mid
+            continue
+        line_start, line_end, epoch = probe
+        probes.append((line_start, epoch))
+        if epoch < target:
+            lo = line_end
+        else:
+            hi = mid
+    probes.sort()
+    for (_offset, earlier), (_next_offset, later) in zip(probes, probes[1:]):
+        if later < earlier - ORDER_SLACK_SECONDS:
+            return None
+    return lo
+
+
+def iter_window_lines(
+    file_path: Path,
+    window: Window,
+    keep: tuple[bytes, ...] = (),
+) -> Iterator[tuple[int, int, dict[str, Any]]]:
+    """Yield the rows of a time-ordered JSONL file that can fall inside `window`.
+
+    Rows are filtered with `outside_window` as in a linear scan. Uncompressed
+    files of at least `SEEK_MIN_BYTES` are memory-mapped and binary-searched
+    for the window start (less `ORDER_SLACK_SECONDS`) and reading stops at the
+    first row proven to be past the window end (plus the same slack). The first line
+    is always considered, since it holds the session header, and the scan
+    stays linear when the probes see timestamps going backwards or a `keep`
+    row lies in the span that would be skipped.
+    """
+    start, end = window
+
+    def skip_line(line: bytes) -> bool:
+        return outside_window(line, window, keep)
+
+    try:
+        size = Path(file_path).stat().st_size
+    except OSError:
+        return
+    seek_to = None
+    if size >= SEEK_MIN_BYTES and not is_compressed(file_path):
+        with open(file_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head = mm.find(b"\n") + 1 or size
+            seek_to = _seek_window_start(mm, head, start - ORDER_SLACK_SECONDS)
+            if seek_to is not None and any(mm.find(marker, head, seek_to) != -1 for marker in keep):
+                seek_to = None
+    if seek_to is None:
+        yield from iter_jsonl_lines(file_path, skip_line=skip_line)
+        return
+
+    yield from iter_jsonl_lines(file_path, skip_line=skip_line, end_offset=head)
+    yield from iter_jsonl_lines(
+        file_path,
+        seek_to,
+        skip_line=skip_line,
+        stop_line=lambda line: past_window(line, end + ORDER_SLACK_SECONDS),
+    )
+
+
+def window_bounds(start: Any, end: Any) -> Window:
+    """Epoch bounds for optional `start` / `end` datetimes."""
+    return (
+        start.timestamp() if start is not None else float("-inf"),
+        end.timestamp() if end is not None else float("inf"),
+    )
+
+
+def iter_jsonl_entries(
+    file_path: Path,
+    start_offset: int = 0,
+    on_error: MalformedLineHandler | None = None,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield `(end_offset, row)` for each JSON object line after `start_offset`."""
+    for _line_start, line_end, row in iter_jsonl_lines(file_path, start_offset, on_error):
+        yield line_end, row
+
+
+def read_jsonl_row(file_path: Path | str, line_start: int) -> dict[str, Any] | None:
+    """Re-read the JSON object on the line starting at byte `line_start`.
+
+    Returns None when the file is gone or the line no longer holds an object.
+    For a compressed file this decompresses everything before `line_start`.
+    """
+    try:
+        with open_jsonl(Path(file_path)) as handle:
+            _seek(handle, line_start)
+            line = handle.readline()
+    except (OSError, EOFError):
+        return None
+    try:
+        row = json.loads(line)
+    except ValueError:
+        return None
+    return row if isinstance(row, dict) else None
+
+
+def iter_jsonl_rows(
+    file_path: Path,
+    on_error: MalformedLineHandler | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield JSON object rows one line at a time from a buffered binary stream.
+
+    Blank lines are ignored. Lines that are not valid UTF-8 JSON objects are
+    skipped and, when `on_error` is given, reported as `(path, line_no, reason)`.
+    A missing file yields nothing.
+    """
+    for _offset, row in iter_jsonl_entries(file_path, on_error=on_error):
+        yield row
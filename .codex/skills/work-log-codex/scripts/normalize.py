@@ -6,6 +6,11 @@ from pathlib import Path
 import re
 from typing import Any
 
+try:
+    from scripts.intervals import activity_windows, merge_windows, window_minutes
+except ImportError:  # imported as a top-level module from scripts/
+    from intervals import activity_windows, merge_windows, window_minutes
+
 
 CLAUSE_SPLIT_PATTERN = re.compile(
     r"[。；;：:]|，(?=(?:我正在|我現在|我在|我接著|現在|目前|先|再|接下來|下一步|之後|接著|再來|然後|準備|預計|待辦|規劃|確認))"
@@ -229,33 +234,25 @@ def build_activity_windows(
     timestamps: list[Any], idle_threshold_minutes: int = 30
 ) -> list[tuple[datetime, datetime, int]]:
     parsed = sorted(ts for ts in (parse_timestamp(value) for value in timestamps) if ts)
-    if not parsed:
-        return []
+    return _windows_from_sorted(parsed, idle_threshold_minutes)
 
-    windows: list[tuple[datetime, datetime, int]] = []
-    window_start = parsed[0]
-    window_end = parsed[0]
-
-    for current in parsed[1:]:
-        delta_minutes = (current - window_end).total_seconds() / 60
-        if delta_minutes <= idle_threshold_minutes:
-            window_end = current
-            continue
-        windows.append(_finalize_activity_window(window_start, window_end))
-        window_start = current
-        window_end = current
 
-    windows.append(_finalize_activity_window(window_start, window_end))
-    return windows
+def _windows_from_sorted(
+    parsed: list[datetime], idle_threshold_minutes: int
+) -> list[tuple[datetime, datetime, int]]:
+    return [
+        (start, end, _started_minutes(end - start))
+        for start, end in activity_windows(
+            parsed, timedelta(minutes=idle_threshold_minutes), presorted=True
+        )
+    ]
 
 
-def _finalize_activity_window(
-    start: datetime, end: datetime
-) -> tuple[datetime, datetime, int]:
-    if end <= start:
-        return (start, end, 0)
-    minutes = max(1, int(((end - start).total_seconds() + 59) // 60))
-    return (start, end, minutes)
+def _started_minutes(span: timedelta) -> int:
+    # Any activity counts as at least a minute; partial minutes round up.
+    if span <= timedelta(0):
+        return 0
+    return max(1, int((span.total_seconds() + 59) // 60))
 
 
 def bucket_active_minutes(
@@ -425,9 +422,7 @@ def summarize_project_events(
     filtered_events = [event for event in events if _should_include_event(event)]
     timestamps = [event.get("timestamp") for event in filtered_events]
     parsed = sorted(ts for ts in (parse_timestamp(value) for value in timestamps) if ts)
-    activity_windows = build_activity_windows(
-        timestamps, idle_threshold_minutes=idle_threshold_minutes
-    )
+    project_windows = _windows_from_sorted(parsed, idle_threshold_minutes)
     confirmed_done: list[str] = []
     inferred_done: list[str] = []
     in_progress: list[str] = []
@@ -457,7 +452,7 @@ def summarize_project_events(
         if evidence_path:
             _append_unique(evidence, str(evidence_path))
 
-    if not activity_windows or not any(minutes > 0 for _start, _end, minutes in activity_windows):
+    if not project_windows or not any(minutes > 0 for _start, _end, minutes in project_windows):
         warnings.append("Sparse event history; effective work time is low-confidence.")
 
     session_count = len(
@@ -473,8 +468,8 @@ def summarize_project_events(
         "blocked": blocked,
         "evidence": evidence,
         "warnings": warnings,
-        "active_minutes": sum(minutes for _start, _end, minutes in activity_windows),
-        "activity_windows": [(start, end) for start, end, _minutes in activity_windows],
+        "active_minutes": sum(minutes for _start, _end, minutes in project_windows),
+        "activity_windows": [(start, end) for start, end, _minutes in project_windows],
         "coverage_start": parsed[0] if parsed else None,
         "coverage_end": parsed[-1] if parsed else None,
     }
@@ -590,26 +585,8 @@ def _merge_activity_windows(projects: list[dict[str, Any]]) -> int:
     if not windows:
         return sum(project.get("active_minutes", 0) for project in projects)
 
-    windows.sort(key=lambda item: item[0])
-    merged: list[tuple[datetime, datetime]] = []
-    current_start, current_end = windows[0]
-
-    for start, end in windows[1:]:
-        if start <= current_end:
-            if end > current_end:
-                current_end = end
-            continue
-        merged.append((current_start, current_end))
-        current_start, current_end = start, end
-
-    merged.append((current_start, current_end))
-
-    total = 0
-    for start, end in merged:
-        if end <= start:
-            continue
-        total += max(1, int(((end - start).total_seconds() + 59) // 60))
-    return total
+    # Projects' windows only merge where they overlap or touch.
+    return window_minutes(merge_windows(windows, timedelta(0)), _started_minutes)
 
 
 def _normalize_window(window: Any) -> tuple[datetime, datetime] | None:
@@ -1,30 +1,54 @@
 from __future__ import annotations
 
 import json
-from json import JSONDecodeError
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    from scripts.event_record import Event
+    from scripts.jsonl_stream import (
+        SourceChunk,
+        Window,
+        is_compressed,
+        is_jsonl_path,
+        iter_jsonl_files,
+        iter_jsonl_lines,
+        iter_jsonl_rows,
+        iter_window_lines,
+        jsonl_stem,
+        modified_before,
+        window_bounds,
+    )
+    from scripts.source_pool import map_sources
+except ImportError:  # imported as a top-level module from scripts/
+    from event_record import Event
+    from jsonl_stream import (
+        SourceChunk,
+        Window,
+        is_compressed,
+        is_jsonl_path,
+        iter_jsonl_files,
+        iter_jsonl_lines,
+        iter_jsonl_rows,
+        iter_window_lines,
+        jsonl_stem,
+        modified_before,
+        window_bounds,
+    )
+    from source_pool import map_sources
+
+
+# Source kinds in loader order; unresolved project paths are filled per kind.
+SOURCE_KINDS = ("transcript", "session_note", "project")
+# Session notes are rewritten in place, so they are always re-read in full.
+APPEND_ONLY_KINDS = frozenset({"transcript", "project"})
+
 
 def _is_subagent_path(file_path: Path) -> bool:
     return "subagents" in file_path.parts
 
 
-def _read_jsonl(file_path: Path) -> list[dict[str, Any]]:
-    if not file_path.exists():
-        return []
-    rows: list[dict[str, Any]] = []
-    for raw_line in file_path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        try:
-            rows.append(json.loads(line))
-        except JSONDecodeError:
-            continue
-    return rows
-
-
 def _extract_text(content: Any) -> str | None:
     if isinstance(content, str):
         return content.strip() or None
@@ -66,7 +90,7 @@ def _extract_title(text: str | None) -> str | None:
 
 def load_claude_history_entries(history_file: Path) -> list[dict[str, Any]]:
     entries: list[dict[str, Any]] = []
-    for row in _read_jsonl(history_file):
+    for row in iter_jsonl_rows(history_file):
         project = row.get("project")
         if not project:
             continue
@@ -102,69 +126,88 @@ def _build_display_project_map(
     return display_to_project, latest_project
 
 
-def _match_project_from_text(
-    text: str | None, display_to_project: dict[str, str]
-) -> str | None:
+def _display_key(text: str | None) -> str | None:
+    """Key a transcript row's text is looked up by in the history display map."""
     if not text:
         return None
-    stripped = text.strip()
-    if not stripped:
-        return None
-    return display_to_project.get(stripped)
-
-
-def _infer_transcript_project(
-    rows: list[dict[str, Any]], display_to_project: dict[str, str], latest_project: str | None
-) -> tuple[str | None, str]:
-    for row in rows:
+    return text.strip() or None
+
+
+def _read_transcript(file_path: Path, start_offset: int, state: dict[str, Any]) -> SourceChunk:
+    """Parse transcript rows, leaving every project unresolved.
+
+    Rows are matched to a project through `history.jsonl` displays, which can
+    be written after the row, so matching waits for `resolve_claude_projects`.
+    The distinct display keys of the file, in order, are kept in `state` for
+    the session-level match (the first row that matches a display).
+    """
+    events: list[tuple[int, Event]] = []
+    offset = start_offset
+    displays = list(state.get("displays", []))
+    seen = set(displays)
+    for line_start, offset, row in iter_jsonl_lines(file_path, start_offset):
         text = _extract_text(row.get("content")) or _extract_text(row)
-        matched = _match_project_from_text(text, display_to_project)
-        if matched:
-            return matched, "high"
-    if latest_project:
-        return latest_project, "low"
-    return None, "low"
-
-
-def _extract_tmp_session_events(root: Path, latest_project: str | None) -> list[dict[str, Any]]:
-    events: list[dict[str, Any]] = []
-    sessions_dir = root / "sessions"
-    if not sessions_dir.exists():
-        return events
-
-    for file_path in sorted(sessions_dir.glob("*-session.tmp")):
-        current_section: str | None = None
-        lines = file_path.read_text(encoding="utf-8").splitlines()
-        date_text = file_path.stem.replace("-session", "")
-        timestamp = f"{date_text}T00:00:00"
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            if stripped.startswith("### "):
-                current_section = stripped.removeprefix("### ").strip()
+        display = _display_key(text)
+        if display is not None and display not in seen:
+            seen.add(display)
+            displays.append(display)
+        events.append(
+            (
+                offset,
+                Event.from_row(
+                    row,
+                    raw_offset=line_start,
+                    tool="claude",
+                    session_id=jsonl_stem(file_path),
+                    project_path=None,
+                    cwd=row.get("cwd"),
+                    timestamp=row.get("timestamp"),
+                    event_type=row.get("type"),
+                    title=_extract_title(text),
+                    text=text,
+                    evidence_path=str(file_path),
+                    confidence=None,
+                    is_subagent=_is_subagent_path(file_path),
+                ),
+            )
+        )
+    return SourceChunk(events, offset, {"displays": displays})
+
+
+def _read_tmp_session(file_path: Path) -> SourceChunk:
+    events: list[tuple[int, Event]] = []
+    current_section: str | None = None
+    content = file_path.read_text(encoding="utf-8")
+    date_text = file_path.stem.replace("-session", "")
+    timestamp = f"{date_text}T00:00:00"
+    for line_number, line in enumerate(content.splitlines()):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("### "):
+            current_section = stripped.removeprefix("### ").strip()
+            continue
+        if stripped.startswith("-"):
+            text = stripped.removeprefix("-").strip()
+            if not text or text == "[ ]":
                 continue
-            if stripped.startswith("-"):
-                text = stripped.removeprefix("-").strip()
-                if not text or text == "[ ]":
-                    continue
-                events.append(
-                    {
-                        "tool": "claude",
-                        "session_id": file_path.stem,
-                        "project_path": latest_project,
-                        "cwd": None,
-                        "timestamp": timestamp,
-                        "event_type": "session_note",
-                        "title": current_section,
-                        "text": text,
-                        "evidence_path": str(file_path),
-                        "confidence": "low",
-                        "is_subagent": False,
-                        "raw": {"section": current_section, "text": text},
-                    }
+            # Notes are plain Markdown bullets; title and text are the whole row.
+            events.append(
+                (
+                    line_number,
+                    Event.from_row(
+                        {},
+                        tool="claude",
+                        session_id=file_path.stem,
+                        timestamp=timestamp,
+                        event_type="session_note",
+                        title=current_section,
+                        text=text,
+                        evidence_path=str(file_path),
+                    ),
                 )
-    return events
+            )
+    return SourceChunk(events, len(content.encode("utf-8")), {})
 
 
 def _should_skip_project_file(file_path: Path) -> bool:
@@ -176,56 +219,154 @@ def _should_skip_project_file(file_path: Path) -> bool:
     return False
 
 
-def _extract_project_file_events(file_path: Path, latest_project: str | None) -> list[dict[str, Any]]:
-    events: list[dict[str, Any]] = []
-    for row in _read_jsonl(file_path):
+def _read_project_file(file_path: Path, start_offset: int, window: Window | None = None) -> SourceChunk:
+    # Project rows carry their own cwd, so rows outside `window` can be
+    # skipped without affecting the rows that are kept.
+    if window is None:
+        rows = iter_jsonl_lines(file_path, start_offset)
+    else:
+        rows = iter_window_lines(file_path, window)
+    events: list[tuple[int, Event]] = []
+    offset = start_offset
+    for line_start, offset, row in rows:
         text = _extract_text(row.get("message")) or _extract_text(row.get("content")) or _extract_text(row.get("data"))
         cwd = row.get("cwd")
-        project_path = cwd if isinstance(cwd, str) and cwd.strip() else latest_project
-        confidence = "medium" if project_path else "low"
+        cwd = cwd if isinstance(cwd, str) and cwd.strip() else None
         events.append(
-            {
-                "tool": "claude",
-                "session_id": row.get("sessionId") or file_path.stem,
-                "project_path": project_path,
-                "cwd": cwd if isinstance(cwd, str) and cwd.strip() else None,
-                "timestamp": row.get("timestamp"),
-                "event_type": row.get("type"),
-                "title": _extract_title(text),
-                "text": text,
-                "evidence_path": str(file_path),
-                "confidence": confidence,
-                "is_subagent": _is_subagent_path(file_path),
-                "raw": row,
-            }
+            (
+                offset,
+                Event.from_row(
+                    row,
+                    raw_offset=line_start,
+                    tool="claude",
+                    session_id=row.get("sessionId") or file_path.stem,
+                    project_path=cwd,
+                    cwd=cwd,
+                    timestamp=row.get("timestamp"),
+                    event_type=row.get("type"),
+                    title=_extract_title(text),
+                    text=text,
+                    evidence_path=str(file_path),
+                    confidence="medium" if cwd else None,
+                    is_subagent=_is_subagent_path(file_path),
+                ),
+            )
         )
-    return events
+    return SourceChunk(events, offset, {})
 
 
-def _extract_project_fallback_events(root: Path, latest_project: str | None) -> list[dict[str, Any]]:
+def iter_claude_sources(root: Path, start: datetime | None = None) -> list[tuple[str, Path]]:
+    """List `(kind, path)` sources in loader order, skipping files older than `start`."""
+    sources: list[tuple[str, Path]] = []
+    transcripts_dir = root / "transcripts"
+    if transcripts_dir.exists():
+        sources.extend(("transcript", path) for path in iter_jsonl_files(transcripts_dir))
+    sessions_dir = root / "sessions"
+    if sessions_dir.exists():
+        sources.extend(("session_note", path) for path in sorted(sessions_dir.glob("*-session.tmp")))
     projects_dir = root / "projects"
-    if not projects_dir.exists():
-        return []
+    if projects_dir.exists():
+        sources.extend(
+            ("project", path)
+            for path in iter_jsonl_files(projects_dir, recursive=True)
+            if not _should_skip_project_file(path)
+        )
+    return [(kind, path) for kind, path in sources if not modified_before(path, start)]
+
 
-    events: list[dict[str, Any]] = []
-    for file_path in sorted(projects_dir.rglob("*.jsonl")):
+def claude_source_kind(root: Path, file_path: Path) -> str | None:
+    """Kind `iter_claude_sources` lists `file_path` under, or None if it is not a source.
+
+    Decided from the path alone, so deleted files are still classified.
+    """
+    try:
+        parts = file_path.relative_to(root).parts
+    except ValueError:
+        return None
+    if len(parts) == 2 and parts[0] == "sessions" and file_path.name.endswith("-session.tmp"):
+        return "session_note"
+    if len(parts) == 2 and parts[0] == "transcripts" and is_jsonl_path(file_path):
+        kind = "transcript"
+    elif len(parts) >= 2 and parts[0] == "projects" and is_jsonl_path(file_path):
         if _should_skip_project_file(file_path):
+            return None
+        kind = "project"
+    else:
+        return None
+    # A rotated copy is left out while its live file is still there.
+    if is_compressed(file_path) and file_path.with_suffix("").exists():
+        return None
+    return kind
+
+
+def read_claude_source(
+    kind: str,
+    file_path: Path,
+    start_offset: int = 0,
+    state: dict[str, Any] | None = None,
+    window: Window | None = None,
+) -> SourceChunk:
+    """Parse one Claude source from `start_offset`, resuming with `state`.
+
+    With a `window`, project files are read window-first instead (see
+    `iter_window_lines`): rows whose timestamps all fall outside it are
+    dropped before JSON decoding, and large files are seeked into.
+    """
+    if kind == "transcript":
+        return _read_transcript(file_path, start_offset, state or {})
+    if kind == "session_note":
+        return _read_tmp_session(file_path)
+    return _read_project_file(file_path, start_offset, window)
+
+
+def resolve_claude_projects(
+    kind: str,
+    events: list[Event],
+    state: dict[str, Any],
+    latest_project: str | None,
+    display_to_project: dict[str, str] | None = None,
+) -> None:
+    """Fill project paths left unresolved by `read_claude_source` in place.
+
+    Transcript rows are matched against the current `display_to_project`, so
+    a history entry written after a row was read still applies to it.
+    """
+    display_to_project = display_to_project or {}
+    session_match = None
+    if kind == "transcript":
+        matches = (display_to_project.get(display) for display in state.get("displays", []))
+        session_match = next((project for project in matches if project), None)
+    for event in events:
+        if event.confidence is not None:
             continue
-        events.extend(_extract_project_file_events(file_path, latest_project))
-    return events
+        if kind == "transcript":
+            matched_project = display_to_project.get(_display_key(event.text)) or session_match
+            event.project_path = matched_project or latest_project
+            event.confidence = "high" if matched_project else "low"
+        elif kind == "project":
+            event.project_path = latest_project
+            event.confidence = "medium" if latest_project else "low"
+        else:
+            event.project_path = latest_project
+            event.confidence = "low"
 
 
-def _dedupe_events(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    deduped: list[dict[str, Any]] = []
+def load_claude_context(root: Path) -> tuple[dict[str, str], str | None]:
+    """Return the history display-to-project map and the latest history project."""
+    return _build_display_project_map(load_claude_history_entries(root / "history.jsonl"))
+
+
+def dedupe_claude_events(events: list[Event]) -> list[Event]:
+    deduped: list[Event] = []
     seen: set[tuple[Any, ...]] = set()
     for event in events:
         key = (
-            event.get("session_id"),
-            event.get("project_path"),
-            event.get("timestamp"),
-            event.get("event_type"),
-            event.get("text"),
-            event.get("evidence_path"),
+            event.session_id,
+            event.project_path,
+            event.timestamp,
+            event.event_type,
+            event.text,
+            event.evidence_path,
         )
         if key in seen:
             continue
@@ -234,46 +375,33 @@ def _dedupe_events(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return deduped
 
 
-def load_claude_events(root: Path) -> list[dict[str, Any]]:
-    history_entries = load_claude_history_entries(root / "history.jsonl")
-    display_to_project, latest_project = _build_display_project_map(history_entries)
-    events: list[dict[str, Any]] = []
-
-    transcripts_dir = root / "transcripts"
-    if not transcripts_dir.exists():
-        events.extend(_extract_tmp_session_events(root, latest_project))
-        events.extend(_extract_project_fallback_events(root, latest_project))
-        return _dedupe_events(events)
-
-    for file_path in sorted(transcripts_dir.glob("*.jsonl")):
-        session_id = file_path.stem
-        rows = _read_jsonl(file_path)
-        session_project, session_confidence = _infer_transcript_project(
-            rows, display_to_project, latest_project
-        )
-        for row in rows:
-            text = _extract_text(row.get("content")) or _extract_text(row)
-            matched_project = _match_project_from_text(text, display_to_project)
-            project_path = matched_project or session_project
-            confidence = "high" if matched_project else session_confidence
-            events.append(
-                {
-                    "tool": "claude",
-                    "session_id": session_id,
-                    "project_path": project_path,
-                    "cwd": row.get("cwd"),
-                    "timestamp": row.get("timestamp"),
-                    "event_type": row.get("type"),
-                    "title": _extract_title(text),
-                    "text": text,
-                    "evidence_path": str(file_path),
-                    "confidence": confidence,
-                    "is_subagent": _is_subagent_path(file_path),
-                    "raw": row,
-                }
-            )
-
-    events.extend(_extract_tmp_session_events(root, latest_project))
-    events.extend(_extract_project_fallback_events(root, latest_project))
-
-    return _dedupe_events(events)
+def load_claude_events(
+    root: Path,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    jobs: int = 1,
+    prefilter: bool = False,
+    stats: dict[str, int] | None = None,
+) -> list[Event]:
+    """Load Claude events, skipping files last modified before `start`.
+
+    Claude paths carry no date, so only the mtime lower bound can prune files.
+    With `prefilter`, project-file rows stamped outside `[start, end]` are
+    skipped before JSON decoding; callers that filter by time afterwards get
+    the same result faster. With `jobs > 1` files are parsed in a process
+    pool and merged back in source order. `stats`, when given, receives the
+    number of `files` read, `events_parsed` and `events` left after dedupe.
+    """
+    display_to_project, latest_project = load_claude_context(root)
+    sources = iter_claude_sources(root, start)
+    context: dict[str, Any] = {"window": window_bounds(start, end)} if prefilter else {}
+    chunks = map_sources(read_claude_source, sources, jobs, context=context)
+    events: list[Event] = []
+    for (kind, _file_path), chunk in zip(sources, chunks):
+        file_events = [event for _offset, event in chunk.events]
+        resolve_claude_projects(kind, file_events, chunk.state, latest_project, display_to_project)
+        events.extend(file_events)
+    deduped = dedupe_claude_events(events)
+    if stats is not None:
+        stats.update(files=len(sources), events_parsed=len(events), events=len(deduped))
+    return deduped
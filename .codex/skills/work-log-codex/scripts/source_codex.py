@@ -1,9 +1,39 @@
 from __future__ import annotations
 
-import json
-from json import JSONDecodeError
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    from scripts.event_record import Event
+    from scripts.jsonl_stream import (
+        SourceChunk,
+        Window,
+        is_compressed,
+        is_jsonl_path,
+        iter_jsonl_lines,
+        iter_window_lines,
+        modified_before,
+        window_bounds,
+    )
+    from scripts.source_pool import map_sources
+except ImportError:  # imported as a top-level module from scripts/
+    from event_record import Event
+    from jsonl_stream import (
+        SourceChunk,
+        Window,
+        is_compressed,
+        is_jsonl_path,
+        iter_jsonl_lines,
+        iter_window_lines,
+        modified_before,
+        window_bounds,
+    )
+    from source_pool import map_sources
+
+
+# Source kinds in loader order; every Codex source is append-only JSONL.
+SOURCE_KINDS = ("index", "history", "session")
 
 
 def _extract_message_text(payload: dict[str, Any]) -> str | None:
@@ -54,125 +84,216 @@ def _extract_text(row: dict[str, Any]) -> str | None:
 
 def _build_event(
     row: dict[str, Any],
+    line_start: int,
     file_path: Path,
     session_id: str | None,
     cwd: str | None,
     is_subagent: bool,
-) -> dict[str, Any]:
+) -> Event:
     project_path = cwd
-    return {
-        "tool": "codex",
-        "session_id": session_id,
-        "project_path": project_path,
-        "cwd": cwd,
-        "timestamp": row.get("timestamp"),
-        "event_type": row.get("type"),
-        "title": _extract_title(row),
-        "text": _extract_text(row),
-        "evidence_path": str(file_path),
-        "confidence": "high" if session_id else "medium",
-        "is_subagent": is_subagent,
-        "raw": row,
-    }
-
-
-def _safe_json_loads(raw_line: str) -> dict[str, Any] | None:
-    try:
-        return json.loads(raw_line)
-    except JSONDecodeError:
-        return None
+    return Event.from_row(
+        row,
+        raw_offset=line_start,
+        tool="codex",
+        session_id=session_id,
+        project_path=project_path,
+        cwd=cwd,
+        timestamp=row.get("timestamp"),
+        event_type=row.get("type"),
+        title=_extract_title(row),
+        text=_extract_text(row),
+        evidence_path=str(file_path),
+        confidence="high" if session_id else "medium",
+        is_subagent=is_subagent,
+    )
 
 
-def _load_history_events(root_path: Path) -> list[dict[str, Any]]:
-    history_file = root_path / "history.jsonl"
-    if not history_file.exists():
-        return []
-    events: list[dict[str, Any]] = []
-    for raw_line in history_file.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        row = _safe_json_loads(line)
-        if not row:
-            continue
-        text = row.get("text")
-        events.append(
-            {
-                "tool": "codex",
-                "session_id": row.get("session_id"),
-                "project_path": None,
-                "cwd": None,
-                "timestamp": row.get("ts"),
-                "event_type": "history",
-                "title": text.splitlines()[0].strip() if isinstance(text, str) and text.strip() else None,
-                "text": text if isinstance(text, str) and text.strip() else None,
-                "evidence_path": str(history_file),
-                "confidence": "low",
-                "is_subagent": False,
-                "raw": row,
-            }
-        )
-    return events
+def _history_event(row: dict[str, Any], line_start: int, history_file: Path) -> Event:
+    text = row.get("text")
+    return Event.from_row(
+        row,
+        raw_offset=line_start,
+        tool="codex",
+        session_id=row.get("session_id"),
+        timestamp=row.get("ts"),
+        event_type="history",
+        title=text.splitlines()[0].strip() if isinstance(text, str) and text.strip() else None,
+        text=text if isinstance(text, str) and text.strip() else None,
+        evidence_path=str(history_file),
+        confidence="low",
+    )
 
 
-def _load_index_events(root_path: Path) -> list[dict[str, Any]]:
-    index_file = root_path / "session_index.jsonl"
-    if not index_file.exists():
-        return []
-    events: list[dict[str, Any]] = []
-    for raw_line in index_file.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        row = _safe_json_loads(line)
+def _index_event(row: dict[str, Any], line_start: int, index_file: Path) -> Event:
+    title = row.get("thread_name")
+    return Event.from_row(
+        row,
+        raw_offset=line_start,
+        tool="codex",
+        session_id=row.get("id"),
+        timestamp=row.get("updated_at"),
+        event_type="session_index",
+        title=title if isinstance(title, str) and title.strip() else None,
+        text=title if isinstance(title, str) and title.strip() else None,
+        evidence_path=str(index_file),
+        confidence="low",
+    )
+
+
+def _read_session_file(
+    file_path: Path,
+    start_offset: int,
+    state: dict[str, Any],
+    window: Window | None = None,
+) -> SourceChunk:
+    if window is None:
+        rows = iter_jsonl_lines(file_path, start_offset)
+    else:
+        # session_meta rows set the context for every later row, so they are
+        # decoded even when stamped outside `window`.
+        rows = iter_window_lines(file_path, window, keep=(b'"session_meta"',))
+    events: list[tuple[int, Event]] = []
+    offset = start_offset
+    session_id: str | None = state.get("session_id")
+    cwd: str | None = state.get("cwd")
+    is_subagent = bool(state.get("is_subagent"))
+    for line_start, offset, row in rows:
         if not row:
             continue
-        title = row.get("thread_name")
-        events.append(
-            {
-                "tool": "codex",
-                "session_id": row.get("id"),
-                "project_path": None,
-                "cwd": None,
-                "timestamp": row.get("updated_at"),
-                "event_type": "session_index",
-                "title": title if isinstance(title, str) and title.strip() else None,
-                "text": title if isinstance(title, str) and title.strip() else None,
-                "evidence_path": str(index_file),
-                "confidence": "low",
-                "is_subagent": False,
-                "raw": row,
-            }
-        )
-    return events
+        if row.get("type") == "session_meta":
+            payload = row.get("payload", {})
+            if isinstance(payload, dict):
+                session_id = payload.get("id") or session_id
+                cwd = payload.get("cwd") or cwd
+                source = payload.get("source")
+                is_subagent = isinstance(source, dict) and "subagent" in source
+
+        events.append((offset, _build_event(row, line_start, file_path, session_id, cwd, is_subagent)))
+    return SourceChunk(events, offset, {"session_id": session_id, "cwd": cwd, "is_subagent": is_subagent})
+
+
+def _dated_dir_first_day(parts: tuple[str, ...]) -> date | None:
+    """Return the earliest day a `YYYY[/MM[/DD]]` session directory can hold."""
+    if not parts or len(parts) > 3 or not all(part.isdigit() for part in parts):
+        return None
+    year = int(parts[0])
+    month = int(parts[1]) if len(parts) > 1 else 1
+    day = int(parts[2]) if len(parts) > 2 else 1
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _iter_session_files(
+    session_root: Path, start: datetime | None, end: datetime | None
+) -> Iterator[Path]:
+    """Yield session files in sorted order, pruning those outside the window.
+
+    Dated directories after `end` are never walked. Earlier directories are
+    pruned by mtime only, since a resumed session keeps appending to its file.
+    """
+    last_day = end.date() + timedelta(days=1) if end is not None else None
+
+    def _walk(directory: Path, parts: tuple[str, ...]) -> Iterator[Path]:
+        for child in sorted(directory.iterdir()):
+            if child.is_dir():
+                child_parts = (*parts, child.name)
+                first_day = _dated_dir_first_day(child_parts)
+                if last_day is not None and first_day is not None and first_day > last_day:
+                    continue
+                yield from _walk(child, child_parts)
+            elif is_jsonl_path(child) and not modified_before(child, start):
+                # Skip a rotated copy while the live file is still there.
+                if is_compressed(child) and child.with_suffix("").exists():
+                    continue
+                yield child
 
+    yield from _walk(session_root, ())
 
-def load_codex_events(root: Path | str) -> list[dict[str, Any]]:
+
+def iter_codex_sources(
+    root: Path | str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[tuple[str, Path]]:
+    """List `(kind, path)` sources in loader order, pruning sessions outside the window."""
     root_path = Path(root)
-    events = _load_index_events(root_path) + _load_history_events(root_path)
+    sources: list[tuple[str, Path]] = []
+    for kind, name in (("index", "session_index.jsonl"), ("history", "history.jsonl")):
+        file_path = root_path / name
+        if file_path.exists():
+            sources.append((kind, file_path))
     session_root = root_path / "sessions"
-    if not session_root.exists():
-        return events
-
-    for file_path in sorted(session_root.rglob("*.jsonl")):
-        session_id: str | None = None
-        cwd: str | None = None
-        is_subagent = False
-        for raw_line in file_path.read_text(encoding="utf-8").splitlines():
-            if not raw_line.strip():
-                continue
+    if session_root.exists():
+        sources.extend(("session", path) for path in _iter_session_files(session_root, start, end))
+    return sources
+
+
+def codex_source_kind(root: Path | str, file_path: Path) -> str | None:
+    """Kind `iter_codex_sources` lists `file_path` under, or None if it is not a source.
+
+    Decided from the path alone, so deleted files are still classified.
+    """
+    try:
+        parts = file_path.relative_to(root).parts
+    except ValueError:
+        return None
+    if parts == ("session_index.jsonl",):
+        return "index"
+    if parts == ("history.jsonl",):
+        return "history"
+    if len(parts) < 2 or parts[0] != "sessions" or not is_jsonl_path(file_path):
+        return None
+    if is_compressed(file_path) and file_path.with_suffix("").exists():
+        return None
+    return "session"
+
+
+def read_codex_source(
+    kind: str,
+    file_path: Path,
+    start_offset: int = 0,
+    state: dict[str, Any] | None = None,
+    window: Window | None = None,
+) -> SourceChunk:
+    """Parse one Codex source from `start_offset`, resuming with `state`.
+
+    With a `window` the whole session file is read window-first instead (see
+    `iter_window_lines`): rows whose timestamps all fall outside it are
+    dropped before JSON decoding, and large files are seeked into.
+    """
+    if kind == "session":
+        return _read_session_file(file_path, start_offset, state or {}, window)
+    build = _index_event if kind == "index" else _history_event
+    events: list[tuple[int, Event]] = []
+    offset = start_offset
+    for line_start, offset, row in iter_jsonl_lines(file_path, start_offset):
+        if row:
+            events.append((offset, build(row, line_start, file_path)))
+    return SourceChunk(events, offset, {})
 
-            row = _safe_json_loads(raw_line)
-            if not row:
-                continue
-            if row.get("type") == "session_meta":
-                payload = row.get("payload", {})
-                if isinstance(payload, dict):
-                    session_id = payload.get("id") or session_id
-                    cwd = payload.get("cwd") or cwd
-                    source = payload.get("source")
-                    is_subagent = isinstance(source, dict) and "subagent" in source
 
-            events.append(_build_event(row, file_path, session_id, cwd, is_subagent))
+def load_codex_events(
+    root: Path | str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    jobs: int = 1,
+    prefilter: bool = False,
+    stats: dict[str, int] | None = None,
+) -> list[Event]:
+    """Load Codex events, skipping session files that cannot overlap `[start, end]`.
 
+    With `prefilter`, session rows stamped outside the window are also skipped
+    before JSON decoding. With `jobs > 1` files are parsed in a process pool
+    and merged back in source order. `stats`, when given, receives the number
+    of `files` read and `events` parsed.
+    """
+    context = {"window": window_bounds(start, end)} if prefilter else None
+    events: list[Event] = []
+    sources = iter_codex_sources(root, start, end)
+    for chunk in map_sources(read_codex_source, sources, jobs, context=context):
+        events.extend(event for _offset, event in chunk.events)
+    if stats is not None:
+        stats.update(files=len(sources), events=len(events))
     return events
@@ -0,0 +1,54 @@
+"""Fan per-file source parsing out across a process pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+try:
+    from scripts.jsonl_stream import SourceChunk
+except ImportError:  # imported as a top-level module from scripts/
+    from jsonl_stream import SourceChunk
+
+
+SourceReader = Callable[..., SourceChunk]
+
+_worker_reader: SourceReader | None = None
+_worker_context: dict[str, Any] = {}
+
+
+def _install_worker(reader: SourceReader, context: dict[str, Any]) -> None:
+    # Shared context (e.g. the Claude display map) is sent once per worker,
+    # not once per file.
+    global _worker_reader, _worker_context
+    _worker_reader = reader
+    _worker_context = context
+
+
+def _run_task(task: tuple[Any, ...]) -> SourceChunk:
+    assert _worker_reader is not None
+    return _worker_reader(*task, **_worker_context)
+
+
+def map_sources(
+    reader: SourceReader,
+    tasks: list[tuple[Any, ...]],
+    jobs: int = 1,
+    context: dict[str, Any] | None = None,
+) -> list[SourceChunk]:
+    """Return `reader(*task, **context)` for every task, in task order.
+
+    `reader` must be a module-level function so worker processes can import
+    it. With `jobs <= 1` everything runs in-process, which is the reference
+    behaviour the pooled path has to match.
+    """
+    context = context or {}
+    if jobs <= 1 or len(tasks) <= 1:
+        return [reader(*task, **context) for task in tasks]
+    workers = min(jobs, len(tasks))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_install_worker,
+        initargs=(reader, context),
+    ) as pool:
+        return list(pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
@@ -0,0 +1,24 @@
+"""Parse-once event timestamps shared by the loaders, event store and report."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+
+def timestamp_epoch(value: Any) -> float | None:
+    """Epoch seconds for an ISO-8601 event timestamp, or None.
+
+    Loaders stamp this on every event as `ts_epoch` so later stages never
+    re-parse the string. Naive timestamps are read as local time, matching
+    `parse_timestamp` in the report builder.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.now().astimezone().tzinfo)
+    return parsed.timestamp()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from benchmarks.run_benchmarks import SCALES, run_benchmarks  # noqa: E402
+from benchmarks.synthetic_history import HistorySpec, generate_history  # noqa: E402
+from scripts.source_claude import load_claude_events  # noqa: E402
+from scripts.source_codex import load_codex_events  # noqa: E402
+
+
+def _snapshot(root: Path) -> dict[str, bytes]:
+    return {str(path.relative_to(root)): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+class SyntheticHistoryTest(unittest.TestCase):
+    def test_same_spec_writes_identical_trees_the_loaders_read(self) -> None:
+        spec = HistorySpec(projects=2, sessions_per_project=2, events_per_session=12, subagent_every=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first = generate_history(root, spec, make_repos=False)
+            snapshot = _snapshot(root)
+            shutil.rmtree(first.claude_home)
+            shutil.rmtree(first.codex_home)
+            second = generate_history(root, spec, make_repos=False)
+
+            self.assertEqual(_snapshot(root), snapshot)
+
+            claude_events = load_claude_events(first.claude_home)
+            codex_events = load_codex_events(first.codex_home)
+
+            self.assertEqual(first.files, 12)
+            self.assertEqual(len(claude_events) + len(codex_events), first.events)
+            self.assertTrue(any(event.is_subagent for event in claude_events))
+            self.assertTrue(any(event.is_subagent for event in codex_events))
+            self.assertTrue(any(event.commit_commands for event in claude_events))
+            self.assertTrue(any(event.commit_commands for event in codex_events))
+            self.assertEqual({event.project_path for event in codex_events}, set(first.repo_paths))
+            self.assertEqual(second.events, first.events)
+
+    def test_benchmark_reports_each_target_and_git_commits(self) -> None:
+        results = run_benchmarks(["tiny"], repeat=1)
+
+        (result,) = results["results"]
+        spec = SCALES["tiny"]
+        self.assertEqual(results["schema_version"], 1)
+        self.assertEqual(result["commits"], spec.projects * spec.commits_per_repo)
+        self.assertEqual(set(result["targets"]), {"build_report", "generate_work_log"})
+        self.assertEqual(len(result["targets"]["build_report"]["runs"]), 1)
+        self.assertIn("analyze_sessions", [stage["name"] for stage in result["profile"]["stages"]])
+        skip_lines = result["microbenchmarks"]["skip_lines"]
+        self.assertGreater(skip_lines["lines"], skip_lines["skipped"])
+        self.assertGreater(skip_lines["skipped"], 0)
+        self.assertEqual(set(skip_lines), {"lines", "skipped", "per_pattern", "combined"})
+
+
+if __name__ == "__main__":
+    unittest.main()
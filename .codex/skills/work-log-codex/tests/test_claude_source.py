@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -174,6 +176,48 @@ class ClaudeSourceTest(unittest.TestCase):
             self.assertEqual(events[1]["confidence"], "high")
             self.assertIn("ls -la", events[1]["text"])
 
+    def test_window_skips_project_files_modified_before_start(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            project_dir = root / "projects/-Users-arlen"
+            project_dir.mkdir(parents=True)
+            for name in ("old", "new"):
+                (project_dir / f"{name}.jsonl").write_text(
+                    f'{{"sessionId":"{name}","cwd":"/repo/a","timestamp":"2026-03-11T12:00:00Z","type":"user","message":{{"content":"{name}"}}}}\n',
+                    encoding="utf-8",
+                )
+            old_mtime = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+            os.utime(project_dir / "old.jsonl", (old_mtime, old_mtime))
+
+            events = load_claude_events(root, start=datetime(2026, 3, 11, tzinfo=timezone.utc))
+
+            self.assertEqual([event["session_id"] for event in events], ["new"])
+
+    def test_process_pool_matches_serial_order_and_dedupe(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "history.jsonl").write_text(
+                '{"display":"match me","timestamp":2000,"project":"/repo/matched"}\n',
+                encoding="utf-8",
+            )
+            (root / "transcripts").mkdir(parents=True)
+            project_dir = root / "projects/-Users-arlen"
+            project_dir.mkdir(parents=True)
+            for index in range(4):
+                (root / f"transcripts/session-{index}.jsonl").write_text(
+                    f'{{"type":"user","timestamp":"2026-02-06T08:0{index}:00.000Z","content":"match me"}}\n',
+                    encoding="utf-8",
+                )
+                (project_dir / f"session-{index}.jsonl").write_text(
+                    f'{{"sessionId":"p{index}","timestamp":"2026-02-06T09:00:00Z","type":"user","message":{{"content":"no cwd"}}}}\n',
+                    encoding="utf-8",
+                )
+
+            serial = load_claude_events(root)
+
+            self.assertEqual(load_claude_events(root, jobs=3), serial)
+            self.assertEqual(serial[-1]["project_path"], "/repo/matched")
+
 
 if __name__ == "__main__":
     unittest.main()
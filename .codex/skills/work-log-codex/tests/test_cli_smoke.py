@@ -12,7 +12,7 @@ import unittest
 ROOT = Path(__file__).resolve().parents[4]
 SKILL_ROOT = ROOT / ".codex/skills/work-log-codex"
 FIXTURES = SKILL_ROOT / "tests/fixtures"
-PARSER_MODULE = "wl_parser.work_log_parser"
+PARSER_MODULE = "wl_parser.cli"
 WRAPPER_SCRIPT = SKILL_ROOT / "scripts/generate_work_log.py"
 
 
@@ -83,6 +83,72 @@ class CliSmokeTest(unittest.TestCase):
         self.assertIn("git_commits", repo_a)
         self.assertIn("duration_minutes", repo_a)
 
+    def test_parser_profile_goes_to_stderr_without_touching_stdout(self) -> None:
+        result = self._run_parser(
+            "2026-03-11",
+            "--codex-home",
+            str(FIXTURES / "codex_sample"),
+            "--claude-home",
+            str(FIXTURES / "claude_sample"),
+            "--profile",
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        json.loads(result.stdout)
+        profile = json.loads(result.stderr)
+        self.assertEqual(profile["schema_version"], 1)
+        self.assertEqual(
+            [stage["name"] for stage in profile["stages"]],
+            [
+                "load_claude",
+                "load_codex",
+                "group_sessions",
+                "analyze_sessions",
+                "aggregate_projects",
+                "collect_git",
+                "summarize",
+                "output",
+            ],
+        )
+        load_codex = profile["stages"][1]
+        self.assertEqual(load_codex["counts"]["files"], 1)
+        self.assertGreater(load_codex["counts"]["events"], 0)
+        for stage in profile["stages"]:
+            self.assertGreaterEqual(stage["wall_seconds"], 0)
+            self.assertIsInstance(stage["peak_memory_bytes"], int)
+        self.assertIn("git_subprocesses", profile["total"])
+
+    def test_parser_ndjson_records_rebuild_the_json_report(self) -> None:
+        sources = (
+            "2026-03-11",
+            "--codex-home",
+            str(FIXTURES / "codex_sample"),
+            "--claude-home",
+            str(FIXTURES / "claude_sample"),
+        )
+        document = self._run_parser(*sources)
+        stream = self._run_parser(*sources, "--output-format", "ndjson")
+        self.assertEqual(stream.returncode, 0, msg=stream.stderr)
+
+        records = [json.loads(line) for line in stream.stdout.splitlines()]
+        types = [record["type"] for record in records]
+        self.assertEqual(types[0], "period")
+        self.assertEqual(types[-1], "summary")
+        self.assertLess(types.index("session"), types.index("project"))
+
+        report = json.loads(document.stdout)
+        lists = {"session": "sessions", "daily_summary": "daily_summary"}
+        rebuilt: dict = {"projects": {}, "sessions": [], "daily_summary": []}
+        for record in records:
+            if record["type"] == "project":
+                rebuilt["projects"][record["path"]] = record["data"]
+            elif record["type"] in lists:
+                rebuilt[lists[record["type"]]].append(record["data"])
+            else:
+                rebuilt[record["type"]] = record["data"]
+        for key in ("period", "summary", "projects", "sessions", "daily_summary", "tool_summary", "token_summary"):
+            self.assertEqual(rebuilt[key], report[key], key)
+
     def test_wrapper_emits_human_readable_report(self) -> None:
         result = self._run_wrapper(
             "--range",
@@ -99,6 +165,27 @@ class CliSmokeTest(unittest.TestCase):
         self.assertIn("### 逐專案摘要", result.stdout)
         self.assertIn("### 工時統計", result.stdout)
 
+    def test_wrapper_writes_profile_sidecar(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profile_path = Path(tmpdir) / "profile.json"
+            result = self._run_wrapper(
+                "--range",
+                "2026-03-11",
+                "--codex-home",
+                str(FIXTURES / "codex_sample"),
+                "--claude-home",
+                str(FIXTURES / "claude_sample"),
+                "--output-mode",
+                "report-only",
+                "--profile",
+                str(profile_path),
+            )
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stderr, "")
+
+            profile = json.loads(profile_path.read_text(encoding="utf-8"))
+            self.assertEqual(profile["stages"][-1]["name"], "output")
+
     def test_wrapper_writes_report_and_appendix_files(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             output_root = Path(tmpdir)
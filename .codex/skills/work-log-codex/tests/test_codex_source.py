@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+import gzip
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -103,6 +106,97 @@ class CodexSourceTest(unittest.TestCase):
             self.assertEqual(events[1]["text"], "completed report")
             self.assertEqual(events[1]["confidence"], "low")
 
+    def test_window_prunes_future_dated_dirs_and_stale_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            line = '{"timestamp":"2026-03-11T10:00:00Z","type":"session_meta","payload":{"id":"%s","cwd":"/repo/a"}}\n'
+            resumed = root / "sessions/2026/03/01/rollout-resumed.jsonl"
+            stale = root / "sessions/2026/03/02/rollout-stale.jsonl"
+            future = root / "sessions/2026/03/20/rollout-future.jsonl"
+            for file_path in (resumed, stale, future):
+                file_path.parent.mkdir(parents=True)
+                file_path.write_text(line % file_path.stem, encoding="utf-8")
+            old_mtime = datetime(2026, 3, 2, tzinfo=timezone.utc).timestamp()
+            os.utime(stale, (old_mtime, old_mtime))
+
+            events = load_codex_events(
+                root,
+                start=datetime(2026, 3, 11, tzinfo=timezone.utc),
+                end=datetime(2026, 3, 11, 23, 59, tzinfo=timezone.utc),
+            )
+
+            self.assertEqual([event["session_id"] for event in events], ["rollout-resumed"])
+            self.assertEqual(len(load_codex_events(root)), 3)
+
+    def test_prefilter_skips_rows_outside_window_but_keeps_session_context(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            session_dir = root / "sessions/2026/03/10"
+            session_dir.mkdir(parents=True)
+            big_output = "y" * 200_000
+            (session_dir / "rollout-long.jsonl").write_text(
+                "\n".join(
+                    [
+                        '{"timestamp":"2026-03-10T22:00:00Z","type":"session_meta","payload":{"id":"s1","cwd":"/repo/a"}}',
+                        f'{{"timestamp":"2026-03-10T23:00:00Z","type":"response_item","payload":{{"type":"function_call_output","output":"{big_output}"}}}}',
+                        '{"timestamp":"2026-03-11T10:05:00Z","type":"response_item","payload":{"type":"message","role":"user","content":[{"type":"input_text","text":"in window"}]}}',
+                    ]
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            start = datetime(2026, 3, 11, tzinfo=timezone.utc)
+            end = datetime(2026, 3, 11, 23, 59, tzinfo=timezone.utc)
+
+            events = load_codex_events(root, start=start, end=end, prefilter=True)
+            unfiltered = load_codex_events(root, start=start, end=end)
+
+            self.assertEqual([event["event_type"] for event in events], ["session_meta", "response_item"])
+            self.assertEqual(events[1]["session_id"], "s1")
+            self.assertEqual(events[1]["project_path"], "/repo/a")
+            self.assertEqual(events, [unfiltered[0], unfiltered[2]])
+
+    def test_reads_rotated_gzip_sessions_unless_live_file_remains(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            session_dir = root / "sessions/2026/03/11"
+            session_dir.mkdir(parents=True)
+            lines = [
+                '{"timestamp":"2026-03-11T10:00:00Z","type":"session_meta","payload":{"id":"s1","cwd":"/repo/a"}}',
+                '{"timestamp":"2026-03-11T10:05:00Z","type":"response_item","payload":{"type":"message","role":"user","content":[{"type":"input_text","text":"archived task"}]}}',
+            ]
+            archived = session_dir / "rollout-archived.jsonl.gz"
+            archived.write_bytes(gzip.compress(("\n".join(lines) + "\n").encode("utf-8")))
+            live = session_dir / "rollout-live.jsonl"
+            live.write_text(lines[0].replace('"s1"', '"s2"') + "\n", encoding="utf-8")
+            (session_dir / "rollout-live.jsonl.gz").write_bytes(gzip.compress(live.read_bytes()))
+
+            events = load_codex_events(root)
+
+            self.assertEqual([event["session_id"] for event in events], ["s1", "s1", "s2"])
+            self.assertEqual(events[1]["text"], "archived task")
+            self.assertEqual(events[1]["evidence_path"], str(archived))
+            self.assertEqual(events[1]["raw"]["payload"]["role"], "user")
+
+    def test_process_pool_matches_serial_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for day in range(1, 6):
+                session_dir = root / f"sessions/2026/03/{day:02d}"
+                session_dir.mkdir(parents=True)
+                (session_dir / f"rollout-{day}.jsonl").write_text(
+                    "\n".join(
+                        [
+                            f'{{"timestamp":"2026-03-{day:02d}T10:00:00Z","type":"session_meta","payload":{{"id":"s{day}","cwd":"/repo/{day}"}}}}',
+                            f'{{"timestamp":"2026-03-{day:02d}T10:05:00Z","type":"response_item","payload":{{"type":"message","role":"user","content":[{{"type":"input_text","text":"task {day}"}}]}}}}',
+                        ]
+                    )
+                    + "\n",
+                    encoding="utf-8",
+                )
+
+            self.assertEqual(load_codex_events(root, jobs=3), load_codex_events(root))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
+from datetime import datetime
+import io
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from benchmarks.synthetic_history import HistorySpec, generate_history  # noqa: E402
+from wl_parser import cli  # noqa: E402
+from wl_parser.cli import _daemon_connection, parse_args  # noqa: E402
+from wl_parser.daemon import WorkLogDaemon, connect_daemon, report_request, send_request, serve  # noqa: E402
+from wl_parser.report_records import ReportRecord, add_report_record, empty_report  # noqa: E402
+from wl_parser.work_log_parser import build_report  # noqa: E402
+
+
+TZ = ZoneInfo("Asia/Taipei")
+START = datetime(2026, 3, 11, tzinfo=TZ)
+END = datetime(2026, 3, 14, 23, 59, 59, tzinfo=TZ)
+
+
+@contextmanager
+def _without(module, name: str):
+    value = getattr(module, name)
+    delattr(module, name)
+    try:
+        yield
+    finally:
+        setattr(module, name, value)
+
+
+class DaemonPlatformTest(unittest.TestCase):
+    def test_platforms_without_unix_sockets_or_user_ids_stay_in_process(self) -> None:
+        args = parse_args(["today"])
+        present = [(module, name) for module, name in ((socket, "AF_UNIX"), (os, "getuid")) if hasattr(module, name)]
+        for removed in [[attribute] for attribute in present] + [present]:
+            with self.subTest(missing=[name for _module, name in removed]), ExitStack() as stack:
+                for module, name in removed:
+                    stack.enter_context(_without(module, name))
+                self.assertIsNone(_daemon_connection(args))
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+@patch("wl_parser.work_log_parser.collect_git_data", return_value=[])
+class WorkLogDaemonTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.history = generate_history(
+            root / "history",
+            HistorySpec(projects=2, sessions_per_project=3, events_per_session=40, days=3),
+            make_repos=False,
+        )
+        self.socket_path = root / "daemon.sock"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _start_daemon(self) -> threading.Thread:
+        thread = threading.Thread(target=serve, args=(self.socket_path,), kwargs={"tail_interval": 0.05})
+        thread.start()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            connection = connect_daemon(self.socket_path)
+            if connection is not None:
+                with connection:
+                    list(send_request(connection, {"command": "ping"}))
+                return thread
+            time.sleep(0.01)
+        self.fail("daemon did not start")
+
+    def _stop_daemon(self, thread: threading.Thread) -> None:
+        with connect_daemon(self.socket_path) as connection:
+            list(send_request(connection, {"command": "shutdown"}))
+        thread.join(timeout=5)
+
+    def _daemon_report(self) -> dict:
+        request = report_request(START, END, "Asia/Taipei", self.history.claude_home, self.history.codex_home)
+        report = empty_report()
+        with connect_daemon(self.socket_path) as connection:
+            for record in send_request(connection, request):
+                add_report_record(report, ReportRecord(**record))
+        return report
+
+    def test_daemon_reports_match_in_process_reports(self, _git) -> None:
+        expected = build_report(START, END, "Asia/Taipei", self.history.claude_home, self.history.codex_home)
+        thread = self._start_daemon()
+        try:
+            first = self._daemon_report()
+            time.sleep(0.2)  # let the idle tail sync run
+            second = self._daemon_report()
+        finally:
+            self._stop_daemon(thread)
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.socket_path.exists())
+
+    def test_errors_are_reported_to_the_client(self, _git) -> None:
+        thread = self._start_daemon()
+        try:
+            with connect_daemon(self.socket_path) as connection:
+                with self.assertRaisesRegex(RuntimeError, "unknown command"):
+                    list(send_request(connection, {"command": "nope"}))
+        finally:
+            self._stop_daemon(thread)
+
+    def _cli_args(self, *options: str) -> list[str]:
+        return [
+            "2026-03-11",
+            "2026-03-14",
+            "--claude-home",
+            str(self.history.claude_home),
+            "--codex-home",
+            str(self.history.codex_home),
+            "--daemon-socket",
+            str(self.socket_path),
+            *options,
+        ]
+
+    def test_cli_builds_the_report_itself_when_the_daemon_fails_before_answering(self, _git) -> None:
+        expected = build_report(START, END, "Asia/Taipei", self.history.claude_home, self.history.codex_home)
+        thread = self._start_daemon()
+        try:
+            with patch.object(WorkLogDaemon, "report_records", side_effect=RuntimeError("boom")):
+                for output_format in ("json", "ndjson"):
+                    with self.subTest(output_format=output_format):
+                        with redirect_stdout(io.StringIO()) as output, redirect_stderr(io.StringIO()) as warnings:
+                            cli.main(self._cli_args("--output-format", output_format))
+                        self.assertIn("RuntimeError: boom", warnings.getvalue())
+                        if output_format == "json":
+                            self.assertEqual(json.loads(output.getvalue()), expected)
+                        else:
+                            report = empty_report()
+                            for line in output.getvalue().splitlines():
+                                add_report_record(report, ReportRecord(**json.loads(line)))
+                            self.assertEqual(report, expected)
+        finally:
+            self._stop_daemon(thread)
+
+    def test_cli_answered_by_the_daemon_does_not_import_the_pipeline(self, _git) -> None:
+        expected = build_report(START, END, "Asia/Taipei", self.history.claude_home, self.history.codex_home)
+        thread = self._start_daemon()
+        try:
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-m", "wl_parser.cli", *self._cli_args()],
+                cwd=SKILL_ROOT,
+                env={**os.environ, "PYTHONPATH": str(SKILL_ROOT)},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        finally:
+            self._stop_daemon(thread)
+
+        self.assertEqual(json.loads(result.stdout), expected)
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+        self.assertIn("wl_parser.daemon", imported)
+        self.assertFalse({"wl_parser.event_store", "scripts.source_claude"} & imported)
+
+    def test_no_daemon_means_no_connection(self, _git) -> None:
+        self.assertIsNone(connect_daemon(self.socket_path))
+
+    def test_paths_that_are_not_a_private_socket_are_refused(self, _git) -> None:
+        shared = self.socket_path.parent / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+        planted = self.socket_path.parent / "planted.sock"
+        planted.write_text("not a socket", encoding="utf-8")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(str(shared / "daemon.sock"))
+
+        cases = {planted: "not a socket owned by this user", shared / "daemon.sock": "writable by other users"}
+        for socket_path, reason in cases.items():
+            with self.subTest(socket_path=socket_path.name):
+                with redirect_stderr(io.StringIO()) as warnings:
+                    self.assertIsNone(connect_daemon(socket_path))
+                self.assertIn(reason, warnings.getvalue())
+                with self.assertRaisesRegex(SystemExit, reason):
+                    serve(socket_path)
+        self.assertEqual(planted.read_text(encoding="utf-8"), "not a socket")
+        self.assertTrue((shared / "daemon.sock").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from benchmarks.synthetic_history import HistorySpec, generate_history  # noqa: E402
+from wl_parser import work_log_parser  # noqa: E402
+from wl_parser.day_cache import DayRollupCache  # noqa: E402
+from wl_parser.work_log_parser import (  # noqa: E402
+    analyze_session,
+    build_report,
+    merge_session_rollups,
+    open_report_caches,
+    parse_time_shortcut,
+    session_record,
+    session_rollup,
+)
+
+
+TZ = ZoneInfo("Asia/Taipei")
+START = datetime(2026, 3, 11, tzinfo=TZ)
+END = datetime(2026, 3, 14, 23, 59, 59, tzinfo=TZ)
+# One commit every three hours across the window, per repo.
+COMMIT_TIMES = [START + timedelta(hours=3 * step) for step in range(32)]
+
+
+def _fake_git(
+    project_path: str, start: datetime, end: datetime, max_commits: int = 50, stats_cache=None
+) -> list[dict]:
+    inside = [moment for moment in COMMIT_TIMES if start <= moment <= end]
+    return [
+        {"hash": f"{Path(project_path).name}-{moment:%d%H}", "files": [f"{moment:%d}.py"]}
+        for moment in reversed(inside)
+    ][:max_commits]
+
+
+def _local_day(timestamp: str) -> str:
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).astimezone(TZ).date().isoformat()
+
+
+@patch("wl_parser.work_log_parser.collect_git_data", side_effect=_fake_git)
+class DayRollupCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        # Sessions start 09:00-19:00 Taipei time and run for hours, so many
+        # of them cross local midnight.
+        self.history = generate_history(
+            root / "history",
+            HistorySpec(projects=2, sessions_per_project=4, events_per_session=150, days=3),
+            make_repos=False,
+        )
+        self.cache = DayRollupCache.in_cache_dir(root / "cache")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _report(self, **kwargs) -> dict:
+        return build_report(
+            START, END, "Asia/Taipei", self.history.claude_home, self.history.codex_home, **kwargs
+        )
+
+    def test_finished_days_are_reused_and_match_a_fresh_report(self, git) -> None:
+        uncached = self._report()
+        now = datetime(2026, 3, 14, 18, 0, tzinfo=TZ).timestamp()
+        with patch.object(work_log_parser.time, "time", return_value=now):
+            first = self._report(day_cache=self.cache)
+        git.reset_mock()
+
+        # The window's last day is still in progress, so it stays live.
+        now = datetime(2026, 3, 14, 18, 0, tzinfo=TZ).timestamp()
+        with patch.object(work_log_parser.time, "time", return_value=now), patch.object(
+            work_log_parser, "load_claude_events", wraps=work_log_parser.load_claude_events
+        ) as claude:
+            second = self._report(day_cache=self.cache)
+
+        crossing = [
+            session for session in uncached["sessions"] if _local_day(session["start"]) != _local_day(session["end"])
+        ]
+        self.assertTrue(crossing)
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+        # Three finished days of sessions; git commits are never cached per day.
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(claude.call_args.kwargs["start"], datetime(2026, 3, 14, tzinfo=TZ))
+        self.assertEqual({call.args[1:3] for call in git.call_args_list}, {(START, END)})
+
+    def test_yesterday_is_served_from_the_day_cache(self, _git) -> None:
+        yesterday = datetime.now(TZ).date() - timedelta(days=1)
+        history = generate_history(
+            Path(self._tmp.name) / "yesterday",
+            HistorySpec(
+                projects=2,
+                sessions_per_project=2,
+                events_per_session=30,
+                start=datetime(yesterday.year, yesterday.month, yesterday.day, 1, 0, tzinfo=timezone.utc),
+            ),
+            make_repos=False,
+        )
+        start, end = parse_time_shortcut("yesterday", "Asia/Taipei")
+
+        def report() -> dict:
+            return build_report(
+                start, end, "Asia/Taipei", history.claude_home, history.codex_home, day_cache=self.cache
+            )
+
+        first = report()
+        with patch.object(work_log_parser, "load_claude_events") as claude, patch.object(
+            work_log_parser, "load_codex_events"
+        ) as codex:
+            second = report()
+
+        self.assertTrue(first["sessions"])
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.cache), 1)
+        claude.assert_not_called()
+        codex.assert_not_called()
+
+    def test_commits_rewritten_on_a_finished_day_are_reported(self, git) -> None:
+        self._report(day_cache=self.cache)
+        git.side_effect = lambda path, start, end, max_commits=50, stats_cache=None: [{"hash": "rebased", "files": []}]
+
+        report = self._report(day_cache=self.cache)
+
+        for project in report["projects"].values():
+            self.assertEqual([commit["hash"] for commit in project["git_commits"]], ["rebased"])
+
+    def test_clear_day_cache_empties_the_rollups(self, _git) -> None:
+        cache_dir = Path(self._tmp.name) / "cache"
+        with open_report_caches(cache_dir) as caches:
+            self._report(**caches)
+            self.assertEqual(len(caches["day_cache"]), 4)
+        with open_report_caches(cache_dir, clear_day_cache=True) as caches:
+            self.assertEqual(len(caches["day_cache"]), 0)
+
+    def test_days_that_have_not_ended_are_not_cached(self, _git) -> None:
+        now = datetime(2026, 3, 12, 18, 0, tzinfo=TZ).timestamp()
+        with patch.object(work_log_parser.time, "time", return_value=now):
+            report = self._report(day_cache=self.cache)
+
+        self.assertEqual(report, self._report())
+        self.assertEqual(len(self.cache), 1)
+
+    def test_rollups_split_at_midnight_merge_into_the_whole_session(self, _git) -> None:
+        def event(moment: datetime, role: str, text: str, project: str) -> dict:
+            return {
+                "tool": "codex",
+                "session_id": "s1",
+                "project_path": project,
+                "timestamp": moment.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "event_type": role,
+                "text": text,
+                "evidence_path": "/logs/s1.jsonl",
+            }
+
+        midnight = datetime(2026, 3, 12, tzinfo=TZ)
+        events = [
+            event(midnight - timedelta(minutes=20), "user", "start the parser", "/repo/a"),
+            event(midnight - timedelta(minutes=5), "assistant", "halfway", "/repo/a"),
+            event(midnight + timedelta(minutes=10), "assistant", "done with the parser", "/repo/b"),
+            event(midnight + timedelta(minutes=35), "user", "one more thing", "/repo/b"),
+        ]
+
+        merged = merge_session_rollups([session_rollup(events[:2]), session_rollup(events[2:])])
+
+        self.assertEqual(merged, session_rollup(events))
+        self.assertEqual(session_record("codex::s1", merged), analyze_session("codex::s1", events))
+        self.assertEqual(session_record("codex::s1", merged)["duration_minutes"], 55)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from event_record import Event
+from source_claude import load_claude_events
+
+
+class EventRecordTest(unittest.TestCase):
+    def test_extracts_row_fields_and_rereads_raw_lazily(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            project_dir = root / "projects/-Users-arlen"
+            project_dir.mkdir(parents=True)
+            row = {
+                "sessionId": "s1",
+                "cwd": "/repo/a",
+                "timestamp": "2026-03-11T12:00:00Z",
+                "type": "assistant",
+                "message": {
+                    "role": "assistant",
+                    "usage": {"input_tokens": 10, "output_tokens": 4, "cache_read_input_tokens": 2},
+                    "content": [
+                        {"type": "text", "text": "committing"},
+                        {"type": "tool_use", "name": "Bash", "input": {"command": 'git commit -m "ship it"'}},
+                    ],
+                },
+            }
+            (project_dir / "s1.jsonl").write_text(
+                '{"sessionId":"s1","type":"user","message":{"content":"hi"},"timestamp":"2026-03-11T11:59:00Z","cwd":"/repo/a"}\n'
+                + json.dumps(row)
+                + "\n",
+                encoding="utf-8",
+            )
+
+            event = load_claude_events(root)[1]
+
+            self.assertEqual(event.role, "assistant")
+            self.assertEqual(event.tool_names, ("Bash",))
+            self.assertEqual(event.commit_commands, ('git commit -m "ship it"',))
+            self.assertEqual(event.usage, {"input": 10, "output": 4, "cache_creation": 0, "cache_read": 2})
+            self.assertNotIn("message", json.dumps(event.to_dict()))
+            self.assertEqual(event["raw"], row)
+            self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_commit_commands_come_from_tool_call_inputs_only(self) -> None:
+        codex = Event.coerce(
+            {
+                "tool": "codex",
+                "event_type": "response_item",
+                "raw": {
+                    "payload": {
+                        "type": "function_call",
+                        "name": "shell",
+                        "arguments": json.dumps({"command": ["bash", "-lc", 'git commit -m "codex fix"']}),
+                    }
+                },
+            }
+        )
+        claude = Event.coerce(
+            {
+                "tool": "claude",
+                "event_type": "tool_use",
+                "raw": {"tool_name": "bash", "tool_input": {"command": "git commit -m 'claude fix'"}},
+            }
+        )
+        echoed = Event.coerce(
+            {
+                "tool": "claude",
+                "event_type": "tool_result",
+                "raw": {"tool_output": {"stdout": 'ran git commit -m "old"'}},
+            }
+        )
+
+        self.assertEqual(codex.commit_commands, ('bash -lc git commit -m "codex fix"',))
+        self.assertEqual(claude.commit_commands, ("git commit -m 'claude fix'",))
+        self.assertEqual(echoed.commit_commands, ())
+
+    def test_round_trips_through_dict_and_pickle(self) -> None:
+        event = Event.coerce(
+            {
+                "tool": "codex",
+                "session_id": "s1",
+                "timestamp": "2026-03-11T10:00:00Z",
+                "event_type": "response_item",
+                "title": "user",
+                "raw": {"payload": {"type": "function_call", "name": "shell"}},
+            }
+        )
+
+        self.assertEqual(event.tool_names, ("shell",))
+        self.assertEqual(event.role, "user")
+        self.assertEqual(Event.from_dict(json.loads(json.dumps(event.to_dict()))), event)
+        self.assertEqual(pickle.loads(pickle.dumps(event)), event)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from scripts.source_claude import load_claude_events  # noqa: E402
+from scripts.source_codex import load_codex_events  # noqa: E402
+from wl_parser.event_store import EventStore  # noqa: E402
+
+
+FIXTURES = SKILL_ROOT / "tests/fixtures"
+START = datetime(2026, 3, 10, 16, 0, tzinfo=timezone.utc)
+END = datetime(2026, 3, 11, 15, 59, 59, tzinfo=timezone.utc)
+
+
+def _in_window(events: list[dict]) -> list[dict]:
+    return [
+        event
+        for event in events
+        if isinstance(event.get("timestamp"), str)
+        and START <= datetime.fromisoformat(event["timestamp"].replace("Z", "+00:00")) <= END
+    ]
+
+
+class EventStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.claude_home = root / "claude"
+        self.codex_home = root / "codex"
+        shutil.copytree(FIXTURES / "claude_sample", self.claude_home)
+        shutil.copytree(FIXTURES / "codex_sample", self.codex_home)
+        self.session_file = self.codex_home / "sessions/2026/03/11/rollout-sample.jsonl"
+        self.store = EventStore.in_cache_dir(root / "cache")
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_window_query_matches_direct_loaders(self) -> None:
+        claude_events, codex_events = self.store.load_events(self.claude_home, self.codex_home, START, END)
+
+        self.assertEqual(claude_events, _in_window(load_claude_events(self.claude_home)))
+        self.assertEqual(codex_events, _in_window(load_codex_events(self.codex_home)))
+        self.assertEqual(len(codex_events), 3)
+
+    def test_transcript_rows_match_history_entries_written_after_ingest(self) -> None:
+        claude_events, _codex_events = self.store.load_events(self.claude_home, self.codex_home, START, END)
+        self.assertEqual({event["confidence"] for event in claude_events}, {"low"})
+
+        with (self.claude_home / "history.jsonl").open("a", encoding="utf-8") as handle:
+            handle.write('{"display":"規劃明天的週報匯總","timestamp":1741650000000,"project":"/repo/planning"}\n')
+        stats: dict[str, int] = {}
+        claude_events, _codex_events = self.store.load_events(
+            self.claude_home, self.codex_home, START, END, stats=stats
+        )
+
+        self.assertEqual(stats["events_added"], 0)
+        self.assertEqual({event["project_path"] for event in claude_events}, {"/repo/planning"})
+        self.assertEqual({event["confidence"] for event in claude_events}, {"high"})
+        self.assertEqual(claude_events, _in_window(load_claude_events(self.claude_home)))
+
+    def test_resync_reads_only_appended_lines(self) -> None:
+        self.store.sync(self.claude_home, self.codex_home)
+        self.assertEqual(
+            self.store.sync(self.claude_home, self.codex_home),
+            {"files_seen": 2, "files_read": 0, "events_added": 0},
+        )
+
+        with self.session_file.open("a", encoding="utf-8") as handle:
+            handle.write(
+                '{"timestamp":"2026-03-11T10:00:00+08:00","type":"response_item",'
+                '"payload":{"type":"message","role":"assistant","content":[{"type":"output_text","text":"appended"}]}}\n'
+                '{"timestamp":"2026-03-11T10:05:00+08:00","type":"response_it'
+            )
+
+        stats = self.store.sync(self.claude_home, self.codex_home)
+        self.assertEqual(stats["files_read"], 1)
+        self.assertEqual(stats["events_added"], 1)
+
+        _claude_events, codex_events = self.store.load_events(self.claude_home, self.codex_home, START, END)
+        appended = codex_events[-1]
+        self.assertEqual(appended["text"], "appended")
+        self.assertEqual(appended["session_id"], "codex-session-1")
+        self.assertEqual(appended["project_path"], "/Users/arlen/projects/repo-a")
+
+    def test_truncated_source_is_reingested_from_start(self) -> None:
+        self.store.sync(self.claude_home, self.codex_home)
+        first_line = self.session_file.read_text(encoding="utf-8").splitlines()[0]
+        self.session_file.write_text(first_line + "\n", encoding="utf-8")
+
+        _claude_events, codex_events = self.store.load_events(self.claude_home, self.codex_home, START, END)
+
+        self.assertEqual([event["event_type"] for event in codex_events], ["session_meta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,37 +1,116 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+import os
 from pathlib import Path
+import shutil
+import subprocess
 import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 
 
 SKILL_ROOT = Path(__file__).resolve().parents[1]
 if str(SKILL_ROOT) not in sys.path:
     sys.path.insert(0, str(SKILL_ROOT))
 
-from wl_parser.git_collector import _parse_show_output  # noqa: E402
+from wl_parser import git_collector  # noqa: E402
+from wl_parser.git_cache import CommitStatsCache  # noqa: E402
+from wl_parser.git_collector import _parse_log_numstat, collect_git_data  # noqa: E402
+
+
+def _make_repo(repo: Path) -> None:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test User",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test User",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, env=env)
+
+    git("init", "-q")
+    (repo / "parser.py").write_text("a\nb\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-q", "-m", "feat: add parser")
+    (repo / "parser.py").write_text("a\nc\nd\n", encoding="utf-8")
+    git("commit", "-q", "-am", "fix: adjust parser")
 
 
 class GitCollectorTest(unittest.TestCase):
-    def test_parse_show_output_ignores_commit_metadata_lines(self) -> None:
-        raw = """commit abcdef1234567890
-Author: Test User <test@example.com>
-AuthorDate: Wed Mar 11 10:00:00 2026 +0800
-Commit: Test User <test@example.com>
-CommitDate: Wed Mar 11 10:05:00 2026 +0800
-
- parser.py | 10 ++++++++++
- tests/test_parser.py | 2 ++
- 2 files changed, 12 insertions(+)
-
-parser.py
-tests/test_parser.py
-"""
-        files, files_changed, insertions, deletions = _parse_show_output(raw)
-        self.assertEqual(files, ["parser.py", "tests/test_parser.py"])
-        self.assertEqual(files_changed, 2)
-        self.assertEqual(insertions, 12)
-        self.assertEqual(deletions, 0)
+    def test_parse_log_numstat_reads_stats_renames_and_binary_files(self) -> None:
+        raw = (
+            "\x1eabcdef1234567890\x00abcdef1\x00feat: add parser\x002026-03-11 10:00:00 +0800\x00"
+            "\n10\t0\tparser.py\x002\t0\ttests/test_parser.py\x00"
+            "\x1e1234567890abcdef\x001234567\x00chore: move assets\x002026-03-11 11:00:00 +0800\x00"
+            "\n-\t-\t\x00old name.png\x00assets/new name.png\x003\t1\tREADME.md\x00"
+            "\x1efedcba0987654321\x00fedcba0\x00Merge branch 'topic'\x002026-03-11 12:00:00 +0800\x00"
+        )
+        commits = _parse_log_numstat(raw)
+
+        self.assertEqual([commit["hash"] for commit in commits], ["abcdef1", "1234567", "fedcba0"])
+        first, second, merge = commits
+        self.assertEqual(first["full_hash"], "abcdef1234567890")
+        self.assertEqual(first["message"], "feat: add parser")
+        self.assertEqual(first["date"], "2026-03-11 10:00:00 +0800")
+        self.assertEqual(first["files"], ["parser.py", "tests/test_parser.py"])
+        self.assertEqual((first["files_changed"], first["insertions"], first["deletions"]), (2, 12, 0))
+        self.assertEqual(second["files"], ["assets/new name.png", "README.md"])
+        self.assertEqual((second["files_changed"], second["insertions"], second["deletions"]), (2, 3, 1))
+        self.assertEqual((merge["files"], merge["files_changed"]), ([], 0))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_collect_git_data_uses_single_log_call(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            _make_repo(repo)
+
+            now = datetime.now(timezone.utc)
+            commits = collect_git_data(str(repo), now - timedelta(hours=1), now + timedelta(hours=1))
+
+        self.assertEqual([commit["message"] for commit in commits], ["fix: adjust parser", "feat: add parser"])
+        self.assertEqual(commits[0]["files"], ["parser.py"])
+        self.assertEqual((commits[0]["files_changed"], commits[0]["insertions"], commits[0]["deletions"]), (1, 2, 1))
+        self.assertEqual((commits[1]["insertions"], commits[1]["deletions"]), (2, 0))
+        self.assertEqual(set(commits[0]), {"full_hash", "hash", "message", "date", "files_changed", "insertions", "deletions", "files"})
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_stats_cache_skips_diffing_known_commits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp) / "repo"
+            repo.mkdir()
+            _make_repo(repo)
+            now = datetime.now(timezone.utc)
+            window = (now - timedelta(hours=1), now + timedelta(hours=1))
+
+            with CommitStatsCache.in_cache_dir(Path(tmp) / "cache") as cache:
+                uncached = collect_git_data(str(repo), *window)
+                first = collect_git_data(str(repo), *window, stats_cache=cache)
+                self.assertEqual(len(cache), 2)
+
+                with patch.object(git_collector, "_run_git", wraps=git_collector._run_git) as run_git:
+                    second = collect_git_data(str(repo), *window, stats_cache=cache)
+
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+        self.assertEqual(run_git.call_count, 1)
+        self.assertNotIn("--numstat", run_git.call_args.args[1])
+
+    def test_stats_cache_evicts_least_recently_used(self) -> None:
+        stats = {"files": ["a.py"], "files_changed": 1, "insertions": 1, "deletions": 0}
+        with tempfile.TemporaryDirectory() as tmp:
+            with CommitStatsCache(Path(tmp) / "stats.sqlite3", max_entries=2) as cache:
+                cache.put_many({"old": stats})
+                cache.put_many({"kept": stats})
+                cache.get_many(["old"])
+                cache.put_many({"new": stats})
+
+                self.assertEqual(set(cache.get_many(["old", "kept", "new"])), {"old", "new"})
+                cache.clear()
+                self.assertEqual(len(cache), 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from scripts import intervals  # noqa: E402
+from scripts.intervals import (  # noqa: E402
+    WindowIndex,
+    active_minutes,
+    activity_windows,
+    epoch_array,
+    merge_windows,
+    whole_minutes,
+)
+from scripts.normalize import build_activity_windows, build_overall_stats  # noqa: E402
+
+
+def _reference_minutes(epochs: list[float], gap: float = 1800) -> int:
+    """Idle-gap minutes by walking every sorted point, as the report used to."""
+    if len(epochs) < 2:
+        return 0
+    epochs = sorted(epochs)
+    total = 0
+    segment_start = prev = epochs[0]
+    for current in epochs[1:]:
+        if current - prev > gap:
+            total += whole_minutes(prev - segment_start)
+            segment_start = current
+        prev = current
+    return total + whole_minutes(prev - segment_start)
+
+
+class IntervalEngineTest(unittest.TestCase):
+    def test_merged_windows_of_streams_equal_windows_of_their_combined_points(self) -> None:
+        rng = random.Random(7)
+        for _ in range(300):
+            streams = [
+                [1_773_000_000 + rng.randrange(0, 20_000) + rng.random() for _ in range(rng.randrange(0, 15))]
+                for _ in range(rng.randrange(1, 5))
+            ]
+            combined = [point for stream in streams for point in stream]
+            windows = [window for stream in streams for window in activity_windows(stream)]
+
+            self.assertEqual(merge_windows(windows), activity_windows(combined))
+            self.assertEqual(active_minutes(combined), _reference_minutes(combined))
+
+    def test_window_index_answers_per_label_and_total_unions(self) -> None:
+        entries = [
+            (("2026-03-11", "/repo/a"), [0.0, 600.0]),
+            (("2026-03-11", "/repo/b"), [900.0, 1500.0]),
+            (("2026-03-12", "/repo/a"), [86_400.0, 87_000.0]),
+            (("2026-03-11", "/repo/a"), [1200.0, 2400.0]),
+        ]
+
+        index = WindowIndex(entries)
+
+        self.assertEqual(index.minutes_by(0), {"2026-03-11": 40, "2026-03-12": 10})
+        self.assertEqual(index.minutes_by(1), {"/repo/a": 50, "/repo/b": 10})
+        self.assertEqual(index.minutes(), 50)
+
+    @unittest.skipUnless(intervals.np is not None, "numpy is not installed")
+    def test_vectorized_path_matches_the_pure_python_path(self) -> None:
+        rng = random.Random(11)
+        points = sorted(1_773_000_000 + rng.random() * 200_000 for _ in range(600))
+        entries = [
+            ((rng.choice("ab"), rng.choice("xyz")), [begin, begin + rng.random() * rng.choice([30, 3000])])
+            for begin in points
+        ]
+
+        def answers() -> tuple:
+            index = WindowIndex(entries)
+            return (
+                activity_windows(epoch_array(points), presorted=True),
+                activity_windows(list(reversed(points))),
+                index.minutes(),
+                index.minutes_by(0),
+                index.minutes_by(1),
+            )
+
+        with patch.object(intervals, "VECTORIZE_MIN_SIZE", 1):
+            vectorized = answers()
+        with patch.object(intervals, "np", None):
+            pure = answers()
+
+        self.assertEqual(vectorized, pure)
+        self.assertEqual(list(vectorized[3]), list(pure[3]))
+
+    def test_datetime_windows_keep_normalize_rounding(self) -> None:
+        start = datetime(2026, 3, 11, 9, 0, tzinfo=timezone.utc)
+        stamps = [start, start + timedelta(seconds=61), start + timedelta(hours=2)]
+
+        windows = build_activity_windows([stamp.isoformat() for stamp in stamps])
+
+        self.assertEqual([minutes for _start, _end, minutes in windows], [2, 0])
+        projects = [
+            {"activity_windows": [(start, start + timedelta(minutes=10))]},
+            {"activity_windows": [(start + timedelta(minutes=10), start + timedelta(minutes=20, seconds=1))]},
+        ]
+        self.assertEqual(build_overall_stats(projects)["active_minutes"], 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import jsonl_stream
+from jsonl_stream import (
+    SEEK_MIN_BYTES,
+    iter_jsonl_files,
+    iter_jsonl_lines,
+    iter_jsonl_rows,
+    iter_window_lines,
+    jsonl_stem,
+    outside_window,
+    read_jsonl_row,
+)
+
+
+def _write_session(file_path: Path, minutes: list[int]) -> None:
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    lines = [json.dumps({"timestamp": base.isoformat(), "type": "session_meta", "payload": {"id": "s1"}})]
+    for minute in minutes:
+        stamp = (base + timedelta(minutes=minute)).isoformat().replace("+00:00", "Z")
+        lines.append(json.dumps({"timestamp": stamp, "type": "response_item", "payload": {"n": minute, "pad": "x" * 200}}))
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class JsonlStreamTest(unittest.TestCase):
+    def test_yields_objects_and_reports_malformed_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "rows.jsonl"
+            file_path.write_bytes(
+                b'{"a":1}\n'
+                b"\n"
+                b"{not json}\n"
+                b"[1, 2]\n"
+                b"\xff\xfe\n"
+                b'{"b":"\xe5\xae\x8c\xe6\x88\x90"}'
+            )
+            errors: list[tuple[Path, int, str]] = []
+
+            rows = list(iter_jsonl_rows(file_path, on_error=lambda *args: errors.append(args)))
+
+            self.assertEqual(rows, [{"a": 1}, {"b": "完成"}])
+            self.assertEqual([line_number for _path, line_number, _reason in errors], [3, 4, 5])
+            self.assertTrue(all(path == file_path for path, _line, _reason in errors))
+
+    def test_gzip_rows_resume_and_reread_at_decompressed_offsets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "rows.jsonl.gz"
+            file_path.write_bytes(gzip.compress(b'{"a":1}\n{"b":2}\n{"c":3}\n'))
+
+            lines = list(iter_jsonl_lines(file_path))
+            resumed = list(iter_jsonl_lines(file_path, lines[0][1]))
+
+            self.assertEqual([row for _start, _end, row in lines], [{"a": 1}, {"b": 2}, {"c": 3}])
+            self.assertEqual(lines[-1][1], 24)
+            self.assertEqual(resumed, lines[1:])
+            self.assertEqual(read_jsonl_row(file_path, lines[2][0]), {"c": 3})
+            self.assertEqual(jsonl_stem(file_path), "rows")
+
+    def test_truncated_gzip_reports_error_after_readable_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "rows.jsonl.gz"
+            payload = gzip.compress(b"".join(b'{"n":%d}\n' % n for n in range(2000)))
+            file_path.write_bytes(payload[: len(payload) // 2])
+            errors: list[tuple[Path, int, str]] = []
+
+            rows = list(iter_jsonl_rows(file_path, on_error=lambda *args: errors.append(args)))
+
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(rows, [{"n": n} for n in range(len(rows))])
+
+    def test_jsonl_files_include_rotated_copies_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "nested").mkdir()
+            for name in ("a.jsonl", "a.jsonl.gz", "b.jsonl.gz", "nested/c.jsonl.gz", "notes.txt", "d.jsonl.bak"):
+                (root / name).write_bytes(b"")
+
+            self.assertEqual([path.name for path in iter_jsonl_files(root)], ["a.jsonl", "b.jsonl.gz"])
+            self.assertEqual(
+                [path.relative_to(root).as_posix() for path in iter_jsonl_files(root, recursive=True)],
+                ["a.jsonl", "b.jsonl.gz", "nested/c.jsonl.gz"],
+            )
+
+    def test_outside_window_only_skips_rows_it_can_prove_are_out(self) -> None:
+        window = (1773223200.0, 1773226800.0)  # 2026-03-11T10:00Z .. 11:00Z
+
+        def row(timestamp: str, output: str = "x" * 64) -> bytes:
+            return f'{{"timestamp":"{timestamp}","type":"response_item","payload":{{"output":{output!r}}}}}'.encode()
+
+        self.assertTrue(outside_window(row("2026-03-11T09:00:00Z"), window))
+        self.assertFalse(outside_window(row("2026-03-11T10:30:00Z"), window))
+        self.assertFalse(outside_window(row("2026-03-11T10:30:00+00:00"), window))
+        nested = b'{"timestamp":"2026-03-11T09:00:00Z","payload":{"timestamp": "2026-03-11T10:30:00Z"}}'
+        self.assertFalse(outside_window(nested, window))
+        self.assertFalse(outside_window(b'{"type":"response_item","payload":{}}', window))
+        self.assertFalse(outside_window(row("not a time"), window))
+        meta = b'{"timestamp":"2026-03-11T09:00:00Z","type":"session_meta","payload":{}}'
+        self.assertTrue(outside_window(meta, window))
+        self.assertFalse(outside_window(meta, window, keep=(b'"session_meta"',)))
+
+    def test_window_seek_matches_linear_scan_on_ordered_files(self) -> None:
+        base = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+        window = (base + 3000 * 60, base + 3100 * 60)
+        keep = (b'"session_meta"',)
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "session.jsonl"
+            _write_session(file_path, list(range(6000)))
+            self.assertGreater(file_path.stat().st_size, SEEK_MIN_BYTES)
+            linear = list(iter_jsonl_lines(file_path, skip_line=lambda line: outside_window(line, window, keep)))
+
+            with patch.object(jsonl_stream, "outside_window", wraps=jsonl_stream.outside_window) as checked:
+                seeked = list(iter_window_lines(file_path, window, keep))
+
+            self.assertEqual(seeked, linear)
+            self.assertEqual(seeked[0][2]["type"], "session_meta")
+            self.assertEqual([row["payload"]["n"] for _start, _end, row in seeked[1:]], list(range(3000, 3101)))
+            self.assertLess(checked.call_count, 500)
+
+    def test_window_seek_falls_back_to_linear_scan_on_unordered_files(self) -> None:
+        base = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+        window = (base + 3000 * 60, base + 3100 * 60)
+        minutes = list(range(6000))
+        random.Random(7).shuffle(minutes)
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "session.jsonl"
+            _write_session(file_path, minutes)
+            linear = list(iter_jsonl_lines(file_path, skip_line=lambda line: outside_window(line, window)))
+
+            seeked = list(iter_window_lines(file_path, window))
+
+            self.assertEqual(seeked, linear)
+            self.assertEqual(len(seeked), 101)
+
+    def test_missing_file_yields_nothing(self) -> None:
+        self.assertEqual(list(iter_jsonl_rows(Path("/nonexistent/rows.jsonl"))), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
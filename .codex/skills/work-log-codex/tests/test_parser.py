@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 import sys
 import tempfile
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -13,8 +14,15 @@ SKILL_ROOT = Path(__file__).resolve().parents[1]
 if str(SKILL_ROOT) not in sys.path:
     sys.path.insert(0, str(SKILL_ROOT))
 
-from wl_parser.work_log_parser import _emit_project_bundles  # type: ignore  # noqa: E402
-from wl_parser.work_log_parser import build_report, parse_time_shortcut  # type: ignore  # noqa: E402
+from wl_parser.project_bundles import emit_project_bundles  # type: ignore  # noqa: E402
+from wl_parser.work_log_parser import _collect_projects_git_data  # type: ignore  # noqa: E402
+from wl_parser.work_log_parser import analyze_session, build_report, parse_time_shortcut  # type: ignore  # noqa: E402
+from wl_parser.work_log_parser import (  # type: ignore  # noqa: E402
+    NOISE_HINT_PATTERNS,
+    SYSTEM_TAG_PATTERNS,
+    _SKIP_LINE_ANYWHERE,
+    _SKIP_LINE_PREFIX,
+)
 
 
 class ParserTest(unittest.TestCase):
@@ -84,7 +92,7 @@ class ParserTest(unittest.TestCase):
             },
         ]
 
-        def _git_data(project_path: str, start: datetime, end: datetime, max_commits: int = 50):
+        def _git_data(project_path: str, start: datetime, end: datetime, max_commits: int = 50, stats_cache=None):
             if project_path == "/tmp/repo-a":
                 return [
                     {
@@ -255,7 +263,7 @@ class ParserTest(unittest.TestCase):
         }
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            _emit_project_bundles(report, Path(tmpdir))
+            emit_project_bundles(report, Path(tmpdir))
             manifest = json.loads((Path(tmpdir) / "manifest.json").read_text(encoding="utf-8"))
             bundle_path = Path(manifest["projects"][0]["path"])
             bundle = json.loads(bundle_path.read_text(encoding="utf-8"))
@@ -265,6 +273,69 @@ class ParserTest(unittest.TestCase):
         self.assertEqual(bundle["session_summaries"][0]["first_prompt"], "完成 parser")
         self.assertEqual(bundle["session_summaries"][0]["tools_used"], {"Read": 2})
 
+    def test_emit_project_bundles_skips_bundles_whose_content_is_unchanged(self) -> None:
+        def project(name: str, minutes: int) -> dict:
+            return {"short_name": name, "display_name": name, "duration_minutes": minutes}
+
+        report = {
+            "summary": {"project_count": 2},
+            "period": {},
+            "projects": {"/tmp/repo-a": project("repo-a", 30), "/tmp/repo-b": project("repo-b", 20)},
+            "sessions": [
+                {"session_id": "codex-1", "project": "/tmp/repo-a", "first_prompt": "完成 parser"},
+                {"session_id": "codex-2", "project": "/tmp/repo-b", "first_prompt": "整理 tests"},
+                {"session_id": "codex-3", "project": "/tmp/repo-a", "first_prompt": "補 docs"},
+            ],
+        }
+
+        def emit(output_dir: Path) -> dict[str, dict]:
+            emit_project_bundles(report, output_dir)
+            manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+            return {entry["short_name"]: entry for entry in manifest["projects"]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = emit(Path(tmpdir))
+            bundle = json.loads(Path(first["repo-a"]["path"]).read_text(encoding="utf-8"))
+            second = emit(Path(tmpdir))
+            report["projects"]["/tmp/repo-b"]["duration_minutes"] = 25
+            third = emit(Path(tmpdir))
+
+        self.assertEqual([item["session_id"] for item in bundle["session_summaries"]], ["codex-1", "codex-3"])
+        self.assertEqual({name: entry["changed"] for name, entry in first.items()}, {"repo-a": True, "repo-b": True})
+        self.assertEqual({name: entry["changed"] for name, entry in second.items()}, {"repo-a": False, "repo-b": False})
+        self.assertEqual({name: entry["changed"] for name, entry in third.items()}, {"repo-a": False, "repo-b": True})
+        self.assertEqual(third["repo-a"]["sha256"], first["repo-a"]["sha256"])
+        self.assertNotEqual(third["repo-b"]["sha256"], first["repo-b"]["sha256"])
+
+    def test_emit_project_bundles_gives_non_ascii_project_names_their_own_files(self) -> None:
+        report = {
+            "summary": {"project_count": 3},
+            "period": {},
+            "projects": {
+                "/tmp/工作日誌": {"short_name": "工作日誌", "display_name": "工作日誌", "duration_minutes": 30},
+                "/tmp/週報": {"short_name": "週報", "display_name": "週報", "duration_minutes": 20},
+                "/tmp/repo-a": {"short_name": "repo-a", "display_name": "repo-a", "duration_minutes": 10},
+            },
+            "sessions": [],
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            emit_project_bundles(report, Path(tmpdir), jobs=4)
+            manifest = json.loads((Path(tmpdir) / "manifest.json").read_text(encoding="utf-8"))
+            entries = {entry["short_name"]: entry for entry in manifest["projects"]}
+            bundles = {
+                name: json.loads(Path(entry["path"]).read_text(encoding="utf-8")) for name, entry in entries.items()
+            }
+
+        self.assertEqual(len({entry["path"] for entry in entries.values()}), 3)
+        self.assertEqual(Path(entries["repo-a"]["path"]).name, "repo-a.json")
+        self.assertTrue(Path(entries["週報"]["path"]).name.startswith("project-"))
+        self.assertEqual(
+            {name: bundle["project_path"] for name, bundle in bundles.items()},
+            {"工作日誌": "/tmp/工作日誌", "週報": "/tmp/週報", "repo-a": "/tmp/repo-a"},
+        )
+        self.assertEqual({entry["changed"] for entry in entries.values()}, {True})
+
     @patch("wl_parser.work_log_parser.collect_git_data")
     @patch("wl_parser.work_log_parser.load_claude_events")
     @patch("wl_parser.work_log_parser.load_codex_events")
@@ -433,6 +504,177 @@ class ParserTest(unittest.TestCase):
             ],
         )
 
+    @patch("wl_parser.work_log_parser.parse_timestamp", side_effect=AssertionError("re-parsed"))
+    @patch("scripts.event_record.timestamp_epoch", side_effect=AssertionError("re-parsed"))
+    @patch("wl_parser.work_log_parser.collect_git_data")
+    @patch("wl_parser.work_log_parser.load_claude_events")
+    @patch("wl_parser.work_log_parser.load_codex_events")
+    def test_build_report_uses_loader_epochs_without_reparsing(
+        self,
+        mock_load_codex_events,
+        mock_load_claude_events,
+        mock_collect_git_data,
+        _mock_timestamp_epoch,
+        _mock_parse_timestamp,
+    ) -> None:
+        mock_collect_git_data.return_value = []
+        mock_load_claude_events.return_value = []
+        rows = [
+            ("late", "2026-03-11T02:00:00.250Z", "user", "late session"),
+            ("late", "2026-03-11T10:20:00.250+08:00", "assistant", "late session working"),
+            ("early", "2026-03-11T09:00:00+08:00", "user", "early session"),
+            ("early", "2026-03-11T01:15:00Z", "assistant", "early session working"),
+        ]
+        mock_load_codex_events.return_value = [
+            {
+                "tool": "codex",
+                "session_id": session_id,
+                "project_path": "/tmp/repo-a",
+                "cwd": "/tmp/repo-a",
+                "timestamp": timestamp,
+                "ts_epoch": datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp(),
+                "event_type": "response_item",
+                "title": role,
+                "text": text,
+                "evidence_path": f"/tmp/{session_id}.jsonl",
+                "confidence": "high",
+                "is_subagent": False,
+                "raw": {"payload": {"role": role}},
+            }
+            for session_id, timestamp, role, text in rows
+        ]
+
+        report = build_report(
+            start=datetime(2026, 3, 11, 0, 0, tzinfo=timezone.utc),
+            end=datetime(2026, 3, 11, 23, 59, tzinfo=timezone.utc),
+            timezone_name="Asia/Taipei",
+            claude_home=Path("/tmp/claude"),
+            codex_home=Path("/tmp/codex"),
+        )
+
+        self.assertEqual([session["session_id"] for session in report["sessions"]], ["early", "late"])
+        self.assertEqual([session["duration_minutes"] for session in report["sessions"]], [15, 20])
+        self.assertEqual(report["daily_summary"][0]["date"], "2026-03-11")
+        self.assertEqual(report["daily_summary"][0]["total_duration_minutes"], 35)
+
+    def test_analyze_session_collects_every_field_in_one_pass(self) -> None:
+        def event(minute: int, role: str, text: str | None, **extra) -> dict:
+            return {
+                "tool": "claude",
+                "session_id": "s1",
+                "project_path": extra.pop("project_path", "/repo/a"),
+                "timestamp": f"2026-03-11T10:{minute:02d}:00Z",
+                "event_type": role,
+                "text": text,
+                "evidence_path": extra.pop("evidence_path", "/logs/s1.jsonl"),
+                "is_subagent": False,
+                "raw": extra.pop("raw", {}),
+            }
+
+        commit = {"type": "tool_use", "name": "Bash", "input": {"command": 'git commit -m "ship parser"'}}
+        events = [
+            event(9, "assistant", "Perfect!\nwrapped up the parser", project_path="/repo/b"),
+            event(0, "user", "<command-name>\n# AGENTS.md instructions"),
+            event(1, "user", "Step 1: read\nrefactor the parser"),
+            event(2, "assistant", "working", raw={"message": {"content": [commit]}}),
+            event(3, "assistant", None, raw={"message": {"content": [commit], "usage": {"input_tokens": 5}}}),
+            event(4, "user", "later prompt", evidence_path="/logs/s1-b.jsonl"),
+        ]
+
+        session = analyze_session("claude::s1", events)
+
+        self.assertEqual(session["start"], "2026-03-11T10:00:00Z")
+        self.assertEqual(session["end"], "2026-03-11T10:09:00Z")
+        self.assertEqual(session["duration_minutes"], 9)
+        self.assertEqual(session["first_prompt"], "refactor the parser")
+        self.assertEqual(session["closing_note"], "wrapped up the parser")
+        self.assertEqual(session["commits"], ["ship parser"])
+        self.assertEqual(session["tools_used"], {"Bash": 2})
+        self.assertEqual(session["tokens"], {"input": 5, "output": 0, "cache_creation": 0, "cache_read": 0})
+        self.assertEqual(session["project"], "/repo/a")
+        self.assertEqual(session["status"], "completed")
+        self.assertEqual(session["evidence_paths"], ["/logs/s1.jsonl", "/logs/s1-b.jsonl"])
+
+    def test_analyze_session_deep_commit_scan_is_opt_in(self) -> None:
+        events = [
+            {
+                "tool": "codex",
+                "session_id": "s1",
+                "timestamp": "2026-03-11T10:00:00Z",
+                "event_type": "response_item",
+                "raw": {"payload": {"type": "function_call_output", "output": 'git commit -m "from output"'}},
+            }
+        ]
+
+        self.assertEqual(analyze_session("codex::s1", events)["commits"], [])
+        self.assertEqual(
+            analyze_session("codex::s1", events, deep_commit_scan=True)["commits"], ["from output"]
+        )
+
+    def test_combined_noise_matcher_agrees_with_individual_patterns(self) -> None:
+        lines = [
+            "<system-reminder>",
+            "x <tag>",
+            "OK, I'm using the brainstorming skill",
+            "im using thesaurus",
+            "我已讀取設定",
+            "# agents.md INSTRUCTIONS for repo",
+            "## Workflow",
+            "#### Workflow",
+            "### 使用方式 說明",
+            "Step 2：驗證",
+            "Step two: verify",
+            "Perfect! Done",
+            "perfect",
+            "被 AI 找到",
+            "被 AI 找到了",
+            "-----",
+            "--- a/file",
+            "```python",
+            "⏺ Update(file)",
+            "\x1b[31mred",
+            "TOTAL 12",
+            "total 12 files",
+            "/Users/arlen/repo",
+            "see /Users/arlen",
+            "[Inferred] guess",
+            "[inferred] guess",
+            "使用 **brainstorming** 技能",
+            "完成 parser 與報告輸出",
+            "Implemented the parser refactor",
+            "",
+        ]
+        for fixture in (SKILL_ROOT / "tests/fixtures").rglob("*.jsonl"):
+            lines.extend(fixture.read_text(encoding="utf-8").splitlines())
+
+        for line in lines:
+            expected = any(pattern.search(line) for pattern in SYSTEM_TAG_PATTERNS + NOISE_HINT_PATTERNS)
+            combined = bool(_SKIP_LINE_PREFIX.match(line) or _SKIP_LINE_ANYWHERE.search(line))
+            self.assertEqual(combined, expected, line)
+
+    @patch("wl_parser.work_log_parser.collect_git_data")
+    def test_collect_projects_git_data_runs_concurrently_and_isolates_failures(
+        self, mock_collect_git_data
+    ) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _git_data(project_path: str, start: datetime, end: datetime, max_commits: int = 50, stats_cache=None):
+            if project_path == "/tmp/broken":
+                raise RuntimeError("network mount went away")
+            barrier.wait()
+            return [{"hash": project_path[-1]}]
+
+        mock_collect_git_data.side_effect = _git_data
+        start = datetime(2026, 3, 11, 0, 0, tzinfo=timezone.utc)
+        end = datetime(2026, 3, 11, 23, 59, tzinfo=timezone.utc)
+
+        results = _collect_projects_git_data(["/tmp/repo-b", "/tmp/broken", "/tmp/repo-a"], start, end, jobs=3)
+
+        self.assertEqual(list(results), ["/tmp/repo-b", "/tmp/broken", "/tmp/repo-a"])
+        self.assertEqual(results["/tmp/repo-a"], [{"hash": "a"}])
+        self.assertEqual(results["/tmp/repo-b"], [{"hash": "b"}])
+        self.assertEqual(results["/tmp/broken"], [])
+
 
 if __name__ == "__main__":
     unittest.main()
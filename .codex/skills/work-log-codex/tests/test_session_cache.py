@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from wl_parser import work_log_parser  # noqa: E402
+from wl_parser.session_cache import SessionRecordCache  # noqa: E402
+from wl_parser.work_log_parser import build_report  # noqa: E402
+
+
+FIXTURES = SKILL_ROOT / "tests/fixtures"
+START = datetime(2026, 3, 10, 16, 0, tzinfo=timezone.utc)
+END = datetime(2026, 3, 11, 15, 59, 59, tzinfo=timezone.utc)
+
+
+@patch("wl_parser.work_log_parser.collect_git_data", return_value=[])
+class SessionRecordCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.claude_home = root / "claude"
+        self.codex_home = root / "codex"
+        shutil.copytree(FIXTURES / "claude_sample", self.claude_home)
+        shutil.copytree(FIXTURES / "codex_sample", self.codex_home)
+        self.session_file = self.codex_home / "sessions/2026/03/11/rollout-sample.jsonl"
+        self.cache = SessionRecordCache.in_cache_dir(root / "cache")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _report(self, **kwargs) -> dict:
+        return build_report(
+            START, END, "UTC", self.claude_home, self.codex_home, session_cache=self.cache, **kwargs
+        )
+
+    def test_unchanged_sessions_are_not_reanalyzed(self, _git) -> None:
+        uncached = build_report(START, END, "UTC", self.claude_home, self.codex_home)
+        first = self._report()
+        cached_sessions = len(self.cache)
+
+        with patch.object(work_log_parser, "session_rollup", side_effect=AssertionError("re-analyzed")):
+            second = self._report()
+
+        self.assertGreater(cached_sessions, 0)
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+
+    def test_changed_file_or_clip_recomputes_and_evicts_stale_records(self, _git) -> None:
+        self._report()
+        entries = len(self.cache)
+
+        with self.session_file.open("a", encoding="utf-8") as handle:
+            handle.write(
+                '{"timestamp":"2026-03-11T10:00:00+08:00","type":"response_item",'
+                '"payload":{"type":"message","role":"assistant","content":[{"type":"output_text","text":"appended"}]}}\n'
+            )
+        with patch.object(work_log_parser, "session_rollup", wraps=work_log_parser.session_rollup) as analyzed:
+            self._report()
+        self.assertEqual(
+            [{event.session_id for event in call.args[0]} for call in analyzed.call_args_list],
+            [{"codex-session-1"}],
+        )
+        self.assertEqual(len(self.cache), entries)
+
+        with patch.object(work_log_parser, "session_rollup", wraps=work_log_parser.session_rollup) as analyzed:
+            self._report(deep_commit_scan=True)
+        self.assertEqual(analyzed.call_count, entries)
+        self.assertEqual(len(self.cache), entries * 2)
+
+    def test_lru_cap_evicts_oldest_records(self, _git) -> None:
+        with SessionRecordCache(Path(self._tmp.name) / "capped.sqlite3", max_entries=2) as cache:
+            for key in ("a", "b", "c"):
+                cache.put(key, "clip", "sources", {"group_key": key})
+            self.assertIsNone(cache.get("a", "clip", "sources"))
+            self.assertEqual(cache.get("c", "clip", "sources"), {"group_key": "c"})
+            self.assertIsNone(cache.get("c", "clip", "other sources"))
+            self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
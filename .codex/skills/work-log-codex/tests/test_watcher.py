@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+SKILL_ROOT = Path(__file__).resolve().parents[1]
+if str(SKILL_ROOT) not in sys.path:
+    sys.path.insert(0, str(SKILL_ROOT))
+
+from scripts.source_claude import claude_source_kind  # noqa: E402
+from scripts.source_codex import codex_source_kind  # noqa: E402
+from wl_parser import event_store as event_store_module  # noqa: E402
+from wl_parser.event_store import EventStore  # noqa: E402
+from wl_parser.watcher import InotifyWatcher, PollingWatcher, watch_specs  # noqa: E402
+
+
+FIXTURES = SKILL_ROOT / "tests/fixtures"
+START = datetime(2026, 3, 10, 16, 0, tzinfo=timezone.utc)
+END = datetime(2026, 3, 11, 15, 59, 59, tzinfo=timezone.utc)
+APPENDED_ROW = (
+    '{"timestamp":"2026-03-11T10:00:00+08:00","type":"response_item",'
+    '"payload":{"type":"message","role":"assistant","content":[{"type":"output_text","text":"appended"}]}}\n'
+)
+
+
+def _watcher_classes() -> list[type]:
+    classes: list[type] = [PollingWatcher]
+    try:
+        InotifyWatcher([]).close()
+    except OSError:
+        pass
+    else:
+        classes.append(InotifyWatcher)
+    return classes
+
+
+class _LossyWatcher:
+    def drain(self) -> None:
+        return None
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.claude_home = root / "claude"
+        self.codex_home = root / "codex"
+        shutil.copytree(FIXTURES / "claude_sample", self.claude_home)
+        shutil.copytree(FIXTURES / "codex_sample", self.codex_home)
+        self.session_file = self.codex_home / "sessions/2026/03/11/rollout-sample.jsonl"
+        self.store = EventStore.in_cache_dir(root / "cache")
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_watchers_report_appended_created_and_deleted_files(self) -> None:
+        for watcher_class in _watcher_classes():
+            with self.subTest(watcher=watcher_class.__name__):
+                with watcher_class(watch_specs(self.claude_home, self.codex_home)) as watcher:
+                    new_day = self.codex_home / "sessions/2026/03/12"
+                    new_session = new_day / f"rollout-{watcher_class.__name__}.jsonl"
+                    with self.session_file.open("a", encoding="utf-8") as handle:
+                        handle.write(APPENDED_ROW)
+                    new_day.mkdir(parents=True, exist_ok=True)
+                    new_session.write_text(APPENDED_ROW, encoding="utf-8")
+                    (self.claude_home / "settings.json").write_text("{}", encoding="utf-8")
+
+                    changed = watcher.drain()
+                    self.assertTrue({self.session_file, new_session} <= changed)
+                    self.assertEqual(watcher.drain(), set())
+
+                    new_session.unlink()
+                    self.assertEqual(watcher.drain(), {new_session})
+
+    def test_source_kinds_follow_the_source_listings(self) -> None:
+        self.assertEqual(codex_source_kind(self.codex_home, self.session_file), "session")
+        self.assertEqual(codex_source_kind(self.codex_home, self.codex_home / "history.jsonl"), "history")
+        self.assertIsNone(codex_source_kind(self.codex_home, self.codex_home / "config.toml"))
+        self.assertEqual(
+            claude_source_kind(self.claude_home, self.claude_home / "projects/-repo/s.jsonl"), "project"
+        )
+        self.assertEqual(
+            claude_source_kind(self.claude_home, self.claude_home / "sessions/a-session.tmp"), "session_note"
+        )
+        self.assertIsNone(claude_source_kind(self.claude_home, self.claude_home / "settings.json"))
+
+    def test_followed_homes_are_synced_from_watcher_changes_without_a_walk(self) -> None:
+        expected = EventStore(Path(":memory:"))
+        self.addCleanup(expected.close)
+        watcher = PollingWatcher(watch_specs(self.claude_home, self.codex_home))
+        self.store.follow(self.claude_home, self.codex_home, watcher)
+
+        first = self.store.load_events(self.claude_home, self.codex_home, START, END)
+        self.assertEqual(first, expected.load_events(self.claude_home, self.codex_home, START, END))
+
+        with self.session_file.open("a", encoding="utf-8") as handle:
+            handle.write(APPENDED_ROW)
+        walk = AssertionError("followed homes should not be walked")
+        with patch.object(event_store_module, "iter_claude_sources", side_effect=walk), patch.object(
+            event_store_module, "iter_codex_sources", side_effect=walk
+        ):
+            stats: dict[str, int] = {}
+            claude_events, codex_events = self.store.load_events(
+                self.claude_home, self.codex_home, START, END, stats=stats
+            )
+
+        self.assertEqual(stats, {"files_seen": 1, "files_read": 1, "events_added": 1})
+        self.assertEqual(codex_events[-1]["text"], "appended")
+        self.assertEqual(
+            (claude_events, codex_events), expected.load_events(self.claude_home, self.codex_home, START, END)
+        )
+
+    def test_lost_changes_and_earlier_windows_walk_again(self) -> None:
+        self.store.follow(self.claude_home, self.codex_home, _LossyWatcher())
+        self.store.load_events(self.claude_home, self.codex_home, START, END)
+        earlier = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+        with patch.object(
+            event_store_module, "iter_codex_sources", wraps=event_store_module.iter_codex_sources
+        ) as walk:
+            self.store.sync_changes(self.claude_home, self.codex_home)
+            self.store.load_events(self.claude_home, self.codex_home, earlier, END)
+
+        self.assertEqual([call.args[1:] for call in walk.call_args_list], [(START, None), (earlier, None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,276 @@
+"""Command line for the work-log parser: ask the daemon first, else run the pipeline here.
+
+Only the daemon client and the report record types are imported up front;
+the parsing pipeline (`wl_parser.work_log_parser`) is imported once no
+daemon answers, so a run served by the daemon skips its import cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from datetime import date as date_type
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterator
+
+from wl_parser.daemon import (
+    connect_daemon,
+    daemon_supported,
+    default_socket_path,
+    report_request,
+    send_request,
+)
+from wl_parser.report_records import ReportRecord, add_report_record, empty_report
+
+
+DEFAULT_GIT_JOBS = 8
+
+
+def _get_tz(timezone_name: str):
+    from zoneinfo import ZoneInfo
+
+    try:
+        return ZoneInfo(timezone_name)
+    except (KeyError, Exception):
+        return timezone.utc
+
+
+def parse_time_shortcut(
+    shortcut: str,
+    timezone_name: str,
+    end_str: str | None = None,
+) -> tuple[datetime, datetime]:
+    """Convert shortcut or YYYY-MM-DD date range into local datetimes."""
+    tz = _get_tz(timezone_name)
+    today = datetime.now(tz).date()
+
+    if shortcut == "today":
+        start = datetime(today.year, today.month, today.day, 0, 0, 0, tzinfo=tz)
+        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
+    elif shortcut == "yesterday":
+        date = today - timedelta(days=1)
+        start = datetime(date.year, date.month, date.day, 0, 0, 0, tzinfo=tz)
+        end = datetime(date.year, date.month, date.day, 23, 59, 59, tzinfo=tz)
+    elif shortcut == "this-week":
+        monday = today - timedelta(days=today.weekday())
+        start = datetime(monday.year, monday.month, monday.day, 0, 0, 0, tzinfo=tz)
+        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
+    elif shortcut == "this-month":
+        start = datetime(today.year, today.month, 1, 0, 0, 0, tzinfo=tz)
+        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
+    else:
+        date = date_type.fromisoformat(shortcut)
+        start = datetime(date.year, date.month, date.day, 0, 0, 0, tzinfo=tz)
+        if end_str:
+            end_date = date_type.fromisoformat(end_str)
+            end = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=tz)
+        else:
+            end = datetime(date.year, date.month, date.day, 23, 59, 59, tzinfo=tz)
+
+    return start, end
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate work log data from Claude and Codex sessions"
+    )
+    parser.add_argument(
+        "time_range",
+        help="Time range: today|yesterday|this-week|this-month|YYYY-MM-DD",
+    )
+    parser.add_argument(
+        "end_date",
+        nargs="?",
+        default=None,
+        help="End date for custom range (YYYY-MM-DD)",
+    )
+    parser.add_argument("--timezone", default="Asia/Taipei")
+    parser.add_argument("--project", default=None)
+    parser.add_argument("--claude-home", default=str(Path.home() / ".claude"))
+    parser.add_argument("--codex-home", default=str(Path.home() / ".codex"))
+    parser.add_argument("--emit-project-dir", default=None)
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Keep the incremental event store, git stats, session and day rollup caches here",
+    )
+    parser.add_argument(
+        "--clear-git-cache",
+        action="store_true",
+        help="Empty the git stats cache in --cache-dir before collecting",
+    )
+    parser.add_argument(
+        "--clear-day-cache",
+        action="store_true",
+        help="Empty the finished-day rollup cache in --cache-dir before building the report",
+    )
+    parser.add_argument(
+        "--git-jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help="Number of repositories to collect git data from in parallel",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes parsing session files",
+    )
+    parser.add_argument(
+        "--deep-commit-scan",
+        action="store_true",
+        help="Search every string in each event row for git commit commands (slow)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="Write per-stage timing, memory and counts as JSON to PATH (stderr if omitted)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=("json", "ndjson"),
+        default="json",
+        help="json: one indented document; ndjson: one typed record per line as each is finalized",
+    )
+    parser.add_argument(
+        "--daemon-socket",
+        default=None,
+        help="Ask the work-log daemon on this socket first (default: the per-user daemon socket)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always build the report in this process, even if a daemon is running",
+    )
+    return parser.parse_args(argv)
+
+
+def _emit_project_bundles(report: dict[str, Any], emit_project_dir: str) -> None:
+    from wl_parser.project_bundles import emit_project_bundles  # noqa: PLC0415
+
+    emit_project_bundles(report, Path(emit_project_dir))
+
+
+def _write_ndjson(records: Iterator[ReportRecord], emit_project_dir: str | None = None) -> None:
+    """Write each record to stdout as soon as it is yielded.
+
+    The full report is only assembled when project bundles are requested.
+    """
+    report = empty_report() if emit_project_dir else None
+    for record in records:
+        sys.stdout.write(json.dumps(record.to_json(), ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+        if report is not None:
+            add_report_record(report, record)
+    if report is not None:
+        _emit_project_bundles(report, emit_project_dir)
+
+
+def _write_json(report: dict[str, Any], emit_project_dir: str | None = None) -> None:
+    if emit_project_dir:
+        _emit_project_bundles(report, emit_project_dir)
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+def _daemon_connection(args: argparse.Namespace):
+    """Connection to a running daemon, unless this run must stay in-process.
+
+    Profiling and clearing caches concern this process's own pipeline and
+    caches, so they never go through the daemon.
+    """
+    stays_local = args.no_daemon or args.profile or args.clear_git_cache or args.clear_day_cache
+    if stays_local or not daemon_supported():
+        return None
+    socket_path = Path(args.daemon_socket).expanduser() if args.daemon_socket else default_socket_path()
+    return connect_daemon(socket_path)
+
+
+def _report_from_daemon(args: argparse.Namespace, start: datetime, end: datetime) -> bool:
+    """Write the report as the daemon streams it; False if this process must build it.
+
+    A daemon that reports an error or hangs up before its first record leaves
+    nothing written, so the caller can still build the report in-process.
+    Once ndjson records are on stdout, a failure is raised instead.
+    """
+    connection = _daemon_connection(args)
+    if connection is None:
+        return False
+    request = report_request(
+        start,
+        end,
+        args.timezone,
+        Path(args.claude_home),
+        Path(args.codex_home),
+        project_filter=args.project,
+        git_jobs=args.git_jobs,
+        jobs=args.jobs,
+        deep_commit_scan=args.deep_commit_scan,
+    )
+    with connection:
+        records = (ReportRecord(**record) for record in send_request(connection, request))
+        try:
+            if args.output_format == "ndjson":
+                first = next(records, None)
+            else:
+                report = empty_report()
+                for record in records:
+                    add_report_record(report, record)
+        except (OSError, RuntimeError, ValueError) as exc:
+            print(f"Warning: {exc}; building the report in this process", file=sys.stderr)
+            return False
+        if args.output_format == "ndjson":
+            _write_ndjson(chain([first] if first is not None else [], records), args.emit_project_dir)
+            return True
+    _write_json(report, args.emit_project_dir)
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    start, end = parse_time_shortcut(args.time_range, args.timezone, args.end_date)
+    if _report_from_daemon(args, start, end):
+        return
+
+    from wl_parser.profiling import StageProfiler, profile_stage  # noqa: PLC0415
+    from wl_parser.work_log_parser import build_report, iter_report_records, open_report_caches  # noqa: PLC0415
+
+    cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else None
+    profiler = StageProfiler() if args.profile else None
+    with profiler if profiler is not None else nullcontext():
+        with open_report_caches(
+            cache_dir, clear_git_cache=args.clear_git_cache, clear_day_cache=args.clear_day_cache
+        ) as caches:
+            report_args = {
+                "start": start,
+                "end": end,
+                "timezone_name": args.timezone,
+                "claude_home": Path(args.claude_home),
+                "codex_home": Path(args.codex_home),
+                "project_filter": args.project,
+                "git_jobs": args.git_jobs,
+                "jobs": args.jobs,
+                "deep_commit_scan": args.deep_commit_scan,
+                "profiler": profiler,
+                **caches,
+            }
+            if args.output_format == "ndjson":
+                _write_ndjson(iter_report_records(**report_args), args.emit_project_dir)
+            else:
+                report = build_report(**report_args)
+        if args.output_format == "json":
+            with profile_stage(profiler, "output"):
+                _write_json(report, args.emit_project_dir)
+    if profiler is not None:
+        profiler.write(args.profile)
+
+
+if __name__ == "__main__":
+    main()
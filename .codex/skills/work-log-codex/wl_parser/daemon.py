@@ -0,0 +1,339 @@
+"""Long-running work-log daemon answering report queries over a Unix socket.
+
+The daemon keeps the event store, git, session and day caches open between
+queries, so a report only pays for lines appended since the last one. The
+history homes it has been asked about are watched (see `wl_parser.watcher`),
+so reports skip the directory walk and idle time ingests the changed files.
+
+Protocol: the client sends one JSON request line and reads JSON lines back.
+A `report` request carries the `build_report` arguments; the daemon answers
+with one `{"record": ...}` line per `ReportRecord` (see `to_json`) and a final
+`{"ok": true}`, or an `{"error": "..."}` line. `ping` and `shutdown` answer
+`{"ok": true}`.
+
+The client half of this module has no parser imports, so the CLI can use it
+without loading the pipeline twice.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+
+DEFAULT_TAIL_INTERVAL = 5.0
+# SQLite path for caches that live only as long as the daemon.
+_IN_MEMORY = Path(":memory:")
+
+
+def daemon_supported() -> bool:
+    """Whether this platform has Unix sockets and user ids (not Windows)."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def default_socket_path() -> Path:
+    """Per-user socket path in a private directory under `$XDG_RUNTIME_DIR` or the temp dir."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"work-log-{os.getuid()}" / "daemon.sock"
+
+
+def _directory_problem(directory: Path) -> str | None:
+    """Why other users could swap files in `directory`, or None if they cannot."""
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid not in (os.getuid(), 0):
+        return f"{directory} is not a directory owned by this user"
+    if info.st_mode & 0o022:
+        return f"{directory} is writable by other users"
+    return None
+
+
+def _socket_problem(socket_path: Path) -> str | None:
+    """Why `socket_path` cannot be trusted as this user's daemon socket, or None.
+
+    Raises `FileNotFoundError` when there is nothing at `socket_path`.
+    """
+    info = os.lstat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        return f"{socket_path} is not a socket owned by this user"
+    return _directory_problem(socket_path.parent)
+
+
+def connect_daemon(socket_path: Path) -> socket.socket | None:
+    """Connect to a running daemon, or return None when there is none.
+
+    A path that is not this user's socket in a private directory is refused,
+    so another local user cannot answer in the daemon's place.
+    """
+    if not daemon_supported():
+        return None
+    try:
+        problem = _socket_problem(socket_path)
+    except OSError:
+        return None
+    if problem is not None:
+        print(f"Warning: not using the work-log daemon: {problem}", file=sys.stderr)
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path))
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def report_request(
+    start: datetime,
+    end: datetime,
+    timezone_name: str,
+    claude_home: Path,
+    codex_home: Path,
+    project_filter: str | None = None,
+    git_jobs: int | None = None,
+    jobs: int = 1,
+    deep_commit_scan: bool = False,
+) -> dict[str, Any]:
+    """`report` request for the same arguments as `build_report`.
+
+    Homes are sent as absolute paths, since the daemon runs elsewhere.
+    """
+    request = {
+        "command": "report",
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "timezone_name": timezone_name,
+        "claude_home": str(claude_home.expanduser().absolute()),
+        "codex_home": str(codex_home.expanduser().absolute()),
+        "project_filter": project_filter,
+        "jobs": jobs,
+        "deep_commit_scan": deep_commit_scan,
+    }
+    if git_jobs is not None:
+        request["git_jobs"] = git_jobs
+    return request
+
+
+def send_request(connection: socket.socket, request: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Send `request` and yield each record the daemon streams back.
+
+    Raises `RuntimeError` when the daemon reports an error or hangs up early.
+    """
+    connection.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+    with connection.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            message = json.loads(line)
+            if "record" in message:
+                yield message["record"]
+            elif "error" in message:
+                raise RuntimeError(f"work-log daemon: {message['error']}")
+            else:
+                return
+    raise RuntimeError("work-log daemon closed the connection before answering")
+
+
+@contextmanager
+def open_daemon_caches(cache_dir: Path | None) -> Iterator[dict[str, Any]]:
+    """Caches under `cache_dir`, or in-memory ones that last as long as the daemon."""
+    from wl_parser.work_log_parser import open_report_caches  # noqa: PLC0415
+
+    if cache_dir is not None:
+        with open_report_caches(cache_dir) as caches:
+            yield caches
+        return
+
+    from wl_parser.day_cache import DayRollupCache  # noqa: PLC0415
+    from wl_parser.event_store import EventStore  # noqa: PLC0415
+    from wl_parser.git_cache import CommitStatsCache  # noqa: PLC0415
+    from wl_parser.session_cache import SessionRecordCache  # noqa: PLC0415
+
+    with EventStore(_IN_MEMORY) as event_store:
+        with CommitStatsCache(_IN_MEMORY) as git_stats_cache:
+            with SessionRecordCache(_IN_MEMORY) as session_cache:
+                with DayRollupCache(_IN_MEMORY) as day_cache:
+                    yield {
+                        "event_store": event_store,
+                        "git_stats_cache": git_stats_cache,
+                        "session_cache": session_cache,
+                        "day_cache": day_cache,
+                    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: WorkLogDaemon
+
+    def _send(self, message: dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get("command")
+            if command == "report":
+                for record in self.server.report_records(request):
+                    self._send({"record": record.to_json()})
+            elif command == "shutdown":
+                self.server.running = False
+            elif command != "ping":
+                raise ValueError(f"unknown command: {command!r}")
+            self._send({"ok": True})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client went away; nothing left to answer
+        except Exception as exc:
+            self._send({"error": f"{type(exc).__name__}: {exc}"})
+
+
+class WorkLogDaemon(socketserver.UnixStreamServer):
+    """Serve report requests one at a time from a single thread.
+
+    Requests are handled on the thread that calls `serve`, which also owns
+    the event store connection. Each pair of homes seen in a request gets a
+    watcher the event store follows, so reports read only changed files
+    instead of walking the homes. When no request arrives for
+    `tail_interval` seconds, those changes are ingested ahead of the next
+    report.
+    """
+
+    def __init__(
+        self, socket_path: Path, caches: dict[str, Any], tail_interval: float = DEFAULT_TAIL_INTERVAL
+    ) -> None:
+        super().__init__(str(socket_path), _RequestHandler)
+        self.socket_path = socket_path
+        self.caches = caches
+        self.timeout = tail_interval
+        self.running = True
+        self.watchers: dict[tuple[str, str], Any] = {}
+
+    def _follow(self, claude_home: Path, codex_home: Path) -> None:
+        from wl_parser.watcher import open_watcher, watch_specs  # noqa: PLC0415
+
+        homes = (str(claude_home), str(codex_home))
+        if homes not in self.watchers:
+            watcher = open_watcher(watch_specs(claude_home, codex_home))
+            self.watchers[homes] = watcher
+            self.caches["event_store"].follow(claude_home, codex_home, watcher)
+
+    def report_records(self, request: dict[str, Any]) -> Iterator[Any]:
+        from wl_parser.work_log_parser import iter_report_records  # noqa: PLC0415
+
+        claude_home, codex_home = Path(request["claude_home"]), Path(request["codex_home"])
+        self._follow(claude_home, codex_home)
+        options = {
+            key: request[key]
+            for key in ("project_filter", "git_jobs", "jobs", "deep_commit_scan")
+            if key in request
+        }
+        return iter_report_records(
+            datetime.fromisoformat(request["start"]),
+            datetime.fromisoformat(request["end"]),
+            request["timezone_name"],
+            claude_home,
+            codex_home,
+            **options,
+            **self.caches,
+        )
+
+    def handle_timeout(self) -> None:
+        event_store = self.caches["event_store"]
+        for claude_home, codex_home in self.watchers:
+            try:
+                event_store.sync_changes(Path(claude_home), Path(codex_home))
+            except Exception:  # pragma: no cover - the next report syncs again
+                continue
+
+    def server_close(self) -> None:
+        super().server_close()
+        for watcher in self.watchers.values():
+            watcher.close()
+
+    def serve(self) -> None:
+        while self.running:
+            self.handle_request()
+
+
+def _claim_socket(socket_path: Path) -> None:
+    """Create the private socket directory and remove a stale socket of ours.
+
+    Refuses to run when the directory is not private, when the path holds
+    anything but this user's socket, or when a daemon already answers on it.
+    """
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    problem = _directory_problem(socket_path.parent)
+    if problem is None:
+        try:
+            problem = _socket_problem(socket_path)
+        except FileNotFoundError:
+            return
+    if problem is not None:
+        raise SystemExit(f"work-log daemon: refusing {socket_path}: {problem}")
+    connection = connect_daemon(socket_path)
+    if connection is not None:
+        connection.close()
+        raise SystemExit(f"work-log daemon already listening on {socket_path}")
+    socket_path.unlink()
+
+
+def serve(
+    socket_path: Path, cache_dir: Path | None = None, tail_interval: float = DEFAULT_TAIL_INTERVAL
+) -> None:
+    """Run the daemon on `socket_path` until a `shutdown` request or SIGTERM."""
+    _claim_socket(socket_path)
+    with open_daemon_caches(cache_dir) as caches:
+        daemon = WorkLogDaemon(socket_path, caches, tail_interval)
+        try:
+            os.chmod(socket_path, 0o600)
+            daemon.serve()
+        finally:
+            daemon.server_close()
+            socket_path.unlink(missing_ok=True)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Keep work-log caches warm and answer report queries over a Unix socket"
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Socket path in a directory only this user can write (default: a private per-user directory)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Keep the caches here across daemon restarts (default: in memory)",
+    )
+    parser.add_argument(
+        "--tail-interval",
+        type=float,
+        default=DEFAULT_TAIL_INTERVAL,
+        help="Seconds without a request before appended history lines are ingested",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if not daemon_supported():
+        raise SystemExit("work-log daemon needs Unix sockets")
+    socket_path = Path(args.socket).expanduser() if args.socket else default_socket_path()
+    cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else None
+    # Let SIGTERM unwind through `serve` so the socket file is removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        serve(socket_path, cache_dir, args.tail_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
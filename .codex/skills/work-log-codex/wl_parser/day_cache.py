@@ -0,0 +1,109 @@
+"""Persistent per-day rollups of finished local days, keyed by date and timezone."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+
+DAY_CACHE_FILENAME = "days.sqlite3"
+DEFAULT_MAX_ENTRIES = 50_000
+# Bump when the shape of a rollup changes so old days are recomputed.
+ROLLUP_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_rollups (
+    day TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    rollup TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (day, timezone, scope)
+);
+CREATE INDEX IF NOT EXISTS day_rollups_by_use ON day_rollups (last_used);
+"""
+
+
+def rollup_scope(*parts: Any) -> str:
+    """Scope key for rollups computed from `parts` (homes, options)."""
+    return json.dumps([ROLLUP_VERSION, *parts], ensure_ascii=False)
+
+
+class DayRollupCache:
+    """LRU-capped store of rollups for local days that have already ended.
+
+    A rollup is keyed by local date (`YYYY-MM-DD`), timezone name and `scope`,
+    which names what was rolled up: the session slices of one pair of history
+    homes. Only days that ended before the run are written, so entries are
+    never updated; histories appended to a finished day afterwards are not
+    seen until the entry is evicted or the cache is cleared with
+    `--clear-day-cache`. `last_used` is a logical clock, as in
+    `CommitStatsCache`.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM day_rollups"
+        ).fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> DayRollupCache:
+        return cls(cache_dir / DAY_CACHE_FILENAME, max_entries)
+
+    def __enter__(self) -> DayRollupCache:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get(self, day: str, timezone_name: str, scope: str) -> Any | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT rollup FROM day_rollups WHERE day = ? AND timezone = ? AND scope = ?",
+                (day, timezone_name, scope),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE day_rollups SET last_used = ? WHERE day = ? AND timezone = ? AND scope = ?",
+                (self._tick(), day, timezone_name, scope),
+            )
+        return json.loads(row[0])
+
+    def put(self, day: str, timezone_name: str, scope: str, rollup: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO day_rollups (day, timezone, scope, rollup, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (day, timezone_name, scope, json.dumps(rollup, ensure_ascii=False), self._tick()),
+            )
+            self._connection.execute(
+                "DELETE FROM day_rollups WHERE rowid IN ("
+                " SELECT rowid FROM day_rollups ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM day_rollups")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM day_rollups").fetchone()[0]
@@ -0,0 +1,366 @@
+"""Persistent SQLite event store for incremental work-log ingestion."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+from scripts.event_record import Event
+from scripts.jsonl_stream import is_compressed
+from scripts.source_claude import APPEND_ONLY_KINDS as CLAUDE_APPEND_ONLY_KINDS
+from scripts.source_claude import SOURCE_KINDS as CLAUDE_SOURCE_KINDS
+from scripts.source_claude import (
+    claude_source_kind,
+    dedupe_claude_events,
+    iter_claude_sources,
+    load_claude_context,
+    read_claude_source,
+    resolve_claude_projects,
+)
+from scripts.source_codex import SOURCE_KINDS as CODEX_SOURCE_KINDS
+from scripts.source_codex import codex_source_kind, iter_codex_sources, read_codex_source
+from scripts.source_pool import SourceReader, map_sources
+from wl_parser.watcher import InotifyWatcher, PollingWatcher
+
+
+EVENT_STORE_FILENAME = "events.sqlite3"
+SCHEMA_VERSION = 5
+
+_SCHEMA = """
+CREATE TABLE sources (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    read_offset INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE events (
+    source_path TEXT NOT NULL,
+    line_offset INTEGER NOT NULL,
+    ts_epoch REAL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX events_by_time ON events (ts_epoch);
+CREATE INDEX events_by_source ON events (source_path);
+"""
+
+class EventStore:
+    """Single-file cache of parsed Claude and Codex events.
+
+    Each source file is tracked by size, mtime, inode and the byte offset of its
+    last ingested line. Append-only JSONL is resumed from that offset; anything
+    that shrank, was replaced, or is rewritten in place is re-read from zero.
+
+    Homes passed to `follow` are walked once per widened window; after that
+    only the files their watcher reports as changed are stat'ed and read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(str(path))
+        self._ensure_schema()
+        self._watchers: dict[tuple[str, str], InotifyWatcher | PollingWatcher] = {}
+        # Earliest window start each followed pair of homes was walked from.
+        self._walked_since: dict[tuple[str, str], datetime] = {}
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path) -> EventStore:
+        return cls(cache_dir / EVENT_STORE_FILENAME)
+
+    def __enter__(self) -> EventStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _ensure_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        with self._connection:
+            self._connection.executescript(
+                "DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS sources;" + _SCHEMA
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def sync(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        jobs: int = 1,
+    ) -> dict[str, int]:
+        """Ingest new lines from every source that can overlap `[start, end]`."""
+        return self._sync(claude_home, codex_home, start, end, jobs)
+
+    def _sync(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        start: datetime | None,
+        end: datetime | None,
+        jobs: int = 1,
+    ) -> dict[str, int]:
+        return self._ingest(
+            claude_home,
+            codex_home,
+            iter_claude_sources(claude_home, start),
+            iter_codex_sources(codex_home, start, end),
+            jobs,
+        )
+
+    def _ingest(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        claude_sources: list[tuple[str, Path]],
+        codex_sources: list[tuple[str, Path]],
+        jobs: int = 1,
+        only_listed: bool = False,
+    ) -> dict[str, int]:
+        stats = {"files_seen": 0, "files_read": 0, "events_added": 0}
+        with self._connection:
+            self._sync_sources(
+                "claude",
+                claude_home,
+                claude_sources,
+                read_claude_source,
+                CLAUDE_APPEND_ONLY_KINDS,
+                stats,
+                jobs,
+                only_listed=only_listed,
+            )
+            self._sync_sources(
+                "codex",
+                codex_home,
+                codex_sources,
+                read_codex_source,
+                frozenset(CODEX_SOURCE_KINDS),
+                stats,
+                jobs,
+                only_listed=only_listed,
+            )
+        return stats
+
+    def follow(
+        self, claude_home: Path, codex_home: Path, watcher: InotifyWatcher | PollingWatcher
+    ) -> None:
+        """Take changed files for these homes from `watcher` instead of walking them.
+
+        The first `load_events` for the homes still walks them from its window
+        start, as does any window starting earlier or a drain that lost
+        changes. The caller keeps ownership of `watcher`.
+        """
+        self._watchers[(str(claude_home), str(codex_home))] = watcher
+
+    def sync_changes(self, claude_home: Path, codex_home: Path, jobs: int = 1) -> dict[str, int]:
+        """Ingest the files the watcher of followed homes reported since the last sync."""
+        return self._sync_followed(claude_home, codex_home, None, jobs)
+
+    def _sync_followed(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        start: datetime | None,
+        jobs: int = 1,
+    ) -> dict[str, int]:
+        homes = (str(claude_home), str(codex_home))
+        changed = self._watchers[homes].drain()
+        walked = self._walked_since.get(homes)
+        if start is not None and (walked is None or start < walked):
+            since = start
+        elif changed is None:
+            since = walked
+        else:
+            since = None
+        if since is not None:
+            # Sessions in dated directories after the window are read too, so
+            # later windows find them without another walk.
+            self._walked_since[homes] = since
+            return self._sync(claude_home, codex_home, since, None, jobs)
+        if walked is None:
+            return {"files_seen": 0, "files_read": 0, "events_added": 0}
+
+        claude_sources: list[tuple[str, Path]] = []
+        codex_sources: list[tuple[str, Path]] = []
+        for file_path in sorted(changed or ()):
+            kind = claude_source_kind(claude_home, file_path)
+            if kind is not None:
+                claude_sources.append((kind, file_path))
+                continue
+            kind = codex_source_kind(codex_home, file_path)
+            if kind is not None:
+                codex_sources.append((kind, file_path))
+        return self._ingest(claude_home, codex_home, claude_sources, codex_sources, jobs, only_listed=True)
+
+    def _sync_sources(
+        self,
+        tool: str,
+        root: Path,
+        sources: list[tuple[str, Path]],
+        reader: SourceReader,
+        append_only_kinds: frozenset[str],
+        stats: dict[str, int],
+        jobs: int = 1,
+        only_listed: bool = False,
+    ) -> None:
+        known = {
+            row[0]: row[1:]
+            for row in self._connection.execute(
+                "SELECT path, size, mtime_ns, inode, read_offset, state FROM sources"
+                " WHERE tool = ? AND root = ?",
+                (tool, str(root)),
+            )
+        }
+        tasks: list[tuple[str, Path, int, dict[str, Any]]] = []
+        stats_by_task: list[os.stat_result] = []
+        for kind, file_path in sources:
+            stats["files_seen"] += 1
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            key = str(file_path)
+            record = known.pop(key, None)
+            if record and record[:3] == (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                continue
+
+            # Compressed offsets count decompressed bytes, so they cannot be
+            # checked against the file size; rotated files are re-read whole.
+            resume = (
+                record is not None
+                and kind in append_only_kinds
+                and not is_compressed(file_path)
+                and record[2] == stat.st_ino
+                and stat.st_size >= record[3]
+            )
+            if resume:
+                offset, state = record[3], json.loads(record[4])
+            else:
+                self._connection.execute("DELETE FROM events WHERE source_path = ?", (key,))
+                offset, state = 0, {}
+            tasks.append((kind, file_path, offset, state))
+            stats_by_task.append(stat)
+
+        # Parsing is the expensive part and is independent per file; SQLite
+        # writes stay on this connection.
+        chunks = map_sources(reader, tasks, jobs)
+        for (kind, file_path, _offset, _state), stat, chunk in zip(tasks, stats_by_task, chunks):
+            key = str(file_path)
+            self._connection.executemany(
+                "INSERT INTO events (source_path, line_offset, ts_epoch, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (key, line_offset, event.ts_epoch, json.dumps(event.to_dict(), ensure_ascii=False))
+                    for line_offset, event in chunk.events
+                ],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sources"
+                " (path, root, tool, kind, size, mtime_ns, inode, read_offset, state)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(root),
+                    tool,
+                    kind,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    stat.st_ino,
+                    chunk.offset,
+                    json.dumps(chunk.state, ensure_ascii=False),
+                ),
+            )
+            stats["files_read"] += 1
+            stats["events_added"] += len(chunk.events)
+
+        # Sources outside this window were not listed; only drop the deleted ones.
+        # With `only_listed`, unlisted sources are not even checked.
+        listed = {str(file_path) for _kind, file_path in sources} if only_listed else None
+        for key in known:
+            if listed is not None and key not in listed:
+                continue
+            if not Path(key).exists():
+                self._connection.execute("DELETE FROM events WHERE source_path = ?", (key,))
+                self._connection.execute("DELETE FROM sources WHERE path = ?", (key,))
+
+    def query(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        start: datetime,
+        end: datetime,
+        latest_project: str | None,
+        display_to_project: dict[str, str] | None = None,
+    ) -> tuple[list[Event], list[Event]]:
+        """Return `(claude_events, codex_events)` stamped within `[start, end]`.
+
+        Events come back in the same order and with the same project resolution
+        and Claude dedupe as `load_claude_events` / `load_codex_events`. Claude
+        projects are resolved here, against the current `history.jsonl` context,
+        so rows stored before their history entry was written still match it.
+        """
+        rows = self._connection.execute(
+            "SELECT sources.tool, sources.kind, sources.path, sources.state,"
+            " events.line_offset, events.payload"
+            " FROM events JOIN sources ON events.source_path = sources.path"
+            " WHERE events.ts_epoch BETWEEN ? AND ?"
+            " AND ((sources.tool = 'claude' AND sources.root = ?)"
+            " OR (sources.tool = 'codex' AND sources.root = ?))",
+            (start.timestamp(), end.timestamp(), str(claude_home), str(codex_home)),
+        ).fetchall()
+
+        kind_rank = {
+            **{("claude", kind): rank for rank, kind in enumerate(CLAUDE_SOURCE_KINDS)},
+            **{("codex", kind): rank for rank, kind in enumerate(CODEX_SOURCE_KINDS)},
+        }
+        rows.sort(key=lambda row: (row[0], kind_rank[(row[0], row[1])], Path(row[2]), row[4]))
+
+        claude_events: list[Event] = []
+        codex_events: list[Event] = []
+        # Rows are sorted by source, so each source's events are resolved together.
+        for (tool, kind, _path, state), source_rows in groupby(rows, key=lambda row: row[:4]):
+            events = [Event.from_dict(json.loads(row[5])) for row in source_rows]
+            if tool == "claude":
+                resolve_claude_projects(kind, events, json.loads(state), latest_project, display_to_project)
+                claude_events.extend(events)
+            else:
+                codex_events.extend(events)
+        return dedupe_claude_events(claude_events), codex_events
+
+    def load_events(
+        self,
+        claude_home: Path,
+        codex_home: Path,
+        start: datetime,
+        end: datetime,
+        jobs: int = 1,
+        stats: dict[str, int] | None = None,
+    ) -> tuple[list[Event], list[Event]]:
+        """Sync sources that can overlap the window, then query it.
+
+        For followed homes only the files changed since the last sync are read.
+
+        `stats`, when given, receives the sync counts returned by `sync`.
+        """
+        display_to_project, latest_project = load_claude_context(claude_home)
+        if (str(claude_home), str(codex_home)) in self._watchers:
+            sync_stats = self._sync_followed(claude_home, codex_home, start, jobs)
+        else:
+            sync_stats = self._sync(claude_home, codex_home, start, end, jobs)
+        if stats is not None:
+            stats.update(sync_stats)
+        return self.query(claude_home, codex_home, start, end, latest_project, display_to_project)
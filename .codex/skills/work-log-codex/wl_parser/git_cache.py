@@ -0,0 +1,125 @@
+"""Persistent per-commit git stats cache keyed by full commit hash."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+
+GIT_CACHE_FILENAME = "git_stats.sqlite3"
+DEFAULT_MAX_ENTRIES = 20_000
+
+STAT_FIELDS = ("files", "files_changed", "insertions", "deletions")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commit_stats (
+    full_hash TEXT PRIMARY KEY,
+    files TEXT NOT NULL,
+    files_changed INTEGER NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commit_stats_by_use ON commit_stats (last_used);
+"""
+
+
+class CommitStatsCache:
+    """LRU-capped store of `files`, `files_changed`, `insertions`, `deletions`.
+
+    A commit's stats never change once it exists, so entries are shared across
+    runs and time ranges. Lookups refresh `last_used`; writes evict the least
+    recently used entries beyond `max_entries`. `last_used` is a logical clock
+    rather than wall time so the LRU order is exact. Safe to share between the
+    git collection worker threads.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM commit_stats"
+        ).fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> CommitStatsCache:
+        return cls(cache_dir / GIT_CACHE_FILENAME, max_entries)
+
+    def __enter__(self) -> CommitStatsCache:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get_many(self, full_hashes: list[str]) -> dict[str, dict]:
+        if not full_hashes:
+            return {}
+        placeholders = ", ".join("?" for _ in full_hashes)
+        with self._lock, self._connection:
+            rows = self._connection.execute(
+                f"SELECT full_hash, files, files_changed, insertions, deletions"
+                f" FROM commit_stats WHERE full_hash IN ({placeholders})",
+                full_hashes,
+            ).fetchall()
+            self._connection.execute(
+                f"UPDATE commit_stats SET last_used = ? WHERE full_hash IN ({placeholders})",
+                [self._tick(), *full_hashes],
+            )
+        return {
+            full_hash: {
+                "files": json.loads(files),
+                "files_changed": files_changed,
+                "insertions": insertions,
+                "deletions": deletions,
+            }
+            for full_hash, files, files_changed, insertions, deletions in rows
+        }
+
+    def put_many(self, stats_by_hash: dict[str, dict]) -> None:
+        if not stats_by_hash:
+            return
+        with self._lock, self._connection:
+            now = self._tick()
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO commit_stats"
+                " (full_hash, files, files_changed, insertions, deletions, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        full_hash,
+                        json.dumps(stats["files"], ensure_ascii=False),
+                        stats["files_changed"],
+                        stats["insertions"],
+                        stats["deletions"],
+                        now,
+                    )
+                    for full_hash, stats in stats_by_hash.items()
+                ],
+            )
+            self._connection.execute(
+                "DELETE FROM commit_stats WHERE full_hash IN ("
+                " SELECT full_hash FROM commit_stats ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM commit_stats")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM commit_stats").fetchone()[0]
@@ -3,21 +3,39 @@
 from __future__ import annotations
 
 import os
-import re
 import subprocess
 import sys
+import threading
 from datetime import datetime
 
+from wl_parser.git_cache import STAT_FIELDS, CommitStatsCache
 
-_STAT_SUMMARY_RE = re.compile(
-    r"(\d+) files? changed"
-    r"(?:,\s*(\d+) insertions?\(\+\))?"
-    r"(?:,\s*(\d+) deletions?\(-\))?"
-)
+
+# One `git log` call per repo: a record separator, then NUL-separated header
+# fields, then `-z` numstat entries (`added\tdeleted\tpath\0`, or
+# `added\tdeleted\t\0old\0new\0` for renames).
+_RECORD_SEPARATOR = "\x1e"
+_LOG_FORMAT = "--format=%x1e%H%x00%h%x00%s%x00%ai"
+DEFAULT_MAX_COMMITS = 50
+
+_git_calls_lock = threading.Lock()
+_git_calls = 0
+
+
+def git_subprocess_count() -> int:
+    """Number of git subprocesses this process has started (for `--profile`)."""
+    return _git_calls
+
+
+def _count_git_call() -> None:
+    global _git_calls
+    with _git_calls_lock:
+        _git_calls += 1
 
 
 def _get_git_author(project_path: str) -> str | None:
     """Return local git user.name when available."""
+    _count_git_call()
     try:
         result = subprocess.run(
             ["git", "-C", project_path, "config", "--local", "user.name"],
@@ -34,62 +52,62 @@ def _get_git_author(project_path: str) -> str | None:
     return author or None
 
 
-def _parse_commit_list(raw: str) -> list[dict[str, str]]:
-    commits: list[dict[str, str]] = []
-    if not raw.strip():
-        return commits
-    for line in raw.splitlines():
-        if not line.strip():
-            continue
-        parts = line.split("\x00")
-        if len(parts) != 4:
-            continue
-        commits.append(
-            {
-                "full_hash": parts[0].strip(),
-                "hash": parts[1].strip(),
-                "message": parts[2].strip(),
-                "date": parts[3].strip(),
-            }
-        )
-    return commits
-
-
-def _parse_show_output(raw: str) -> tuple[list[str], int, int, int]:
+def _parse_numstat_entries(fields: list[str]) -> tuple[list[str], int, int, int]:
     files: list[str] = []
     files_changed = 0
     insertions = 0
     deletions = 0
-
-    for line in raw.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-        match = _STAT_SUMMARY_RE.search(stripped)
-        if match:
-            files_changed = int(match.group(1))
-            insertions = int(match.group(2) or 0)
-            deletions = int(match.group(3) or 0)
-            continue
-        if stripped.startswith(
-            ("commit ", "Author:", "AuthorDate:", "Date:", "Commit:", "CommitDate:")
-        ):
-            continue
-        if stripped.startswith("@@"):
+    index = 0
+    while index < len(fields):
+        entry = fields[index].lstrip("\n")
+        index += 1
+        if not entry:
             continue
-        if "|" in stripped:
+        parts = entry.split("\t")
+        if len(parts) != 3:
             continue
-        if stripped.startswith(("diff --git", "---", "+++")):
-            continue
-        if stripped not in files:
-            files.append(stripped)
-
+        added, deleted, path = parts
+        if not path:
+            if index + 1 >= len(fields):
+                break
+            path = fields[index + 1]
+            index += 2
+        files_changed += 1
+        # Binary files report "-" for both counts.
+        insertions += int(added) if added.isdigit() else 0
+        deletions += int(deleted) if deleted.isdigit() else 0
+        if path not in files:
+            files.append(path)
     return files, files_changed, insertions, deletions
 
 
+def _parse_log_numstat(raw: str) -> list[dict]:
+    """Parse `git log -z --numstat` output produced with `_LOG_FORMAT`."""
+    commits: list[dict] = []
+    for record in raw.split(_RECORD_SEPARATOR):
+        fields = record.split("\x00")
+        if len(fields) < 4 or not fields[0].strip():
+            continue
+        files, files_changed, insertions, deletions = _parse_numstat_entries(fields[4:])
+        commits.append(
+            {
+                "full_hash": fields[0].strip(),
+                "hash": fields[1].strip(),
+                "message": fields[2].strip(),
+                "date": fields[3].strip(),
+                "files_changed": files_changed,
+                "insertions": insertions,
+                "deletions": deletions,
+                "files": files,
+            }
+        )
+    return commits
+
+
 def _run_git(
     project_path: str, args: list[str], timeout: int = 10
 ) -> subprocess.CompletedProcess[str] | None:
+    _count_git_call()
     try:
         return subprocess.run(
             ["git", "-C", project_path, *args],
@@ -102,13 +120,41 @@ def _run_git(
         return None
 
 
+def _fill_stats_from_cache(
+    project_path: str, commits: list[dict], stats_cache: CommitStatsCache
+) -> list[dict] | None:
+    """Attach cached stats; run one `git log --no-walk` for the unseen hashes."""
+    cached = stats_cache.get_many([commit["full_hash"] for commit in commits])
+    missing = [commit["full_hash"] for commit in commits if commit["full_hash"] not in cached]
+    if missing:
+        result = _run_git(
+            project_path,
+            ["log", "--no-walk=unsorted", _LOG_FORMAT, "--numstat", "-z", *missing],
+            timeout=15,
+        )
+        if result is None or result.returncode != 0:
+            return None
+        fresh = {
+            commit["full_hash"]: {field: commit[field] for field in STAT_FIELDS}
+            for commit in _parse_log_numstat(result.stdout)
+        }
+        stats_cache.put_many(fresh)
+        cached.update(fresh)
+    return [{**commit, **cached.get(commit["full_hash"], {})} for commit in commits]
+
+
 def collect_git_data(
     project_path: str,
     start: datetime,
     end: datetime,
-    max_commits: int = 50,
+    max_commits: int = DEFAULT_MAX_COMMITS,
+    stats_cache: CommitStatsCache | None = None,
 ) -> list[dict]:
-    """Collect commit messages, stats, and touched files for a git repo."""
+    """Collect commit messages, stats, and touched files for a git repo.
+
+    With a `stats_cache`, the window's commits are listed without diffs and
+    only hashes missing from the cache are diffed.
+    """
     if not project_path:
         return []
     git_dir = os.path.join(project_path, ".git")
@@ -118,15 +164,18 @@ def collect_git_data(
     args = [
         "log",
         f"-{max_commits}",
-        "--format=%H%x00%h%x00%s%x00%ai",
+        _LOG_FORMAT,
+        "-z",
         f"--after={start.isoformat()}",
         f"--before={end.isoformat()}",
     ]
+    if stats_cache is None:
+        args.append("--numstat")
     author = _get_git_author(project_path)
     if author:
         args.append(f"--author={author}")
 
-    result = _run_git(project_path, args)
+    result = _run_git(project_path, args, timeout=15)
     if result is None:
         return []
     if result.returncode != 0:
@@ -136,27 +185,11 @@ def collect_git_data(
         )
         return []
 
-    commits = _parse_commit_list(result.stdout)
-    enriched: list[dict] = []
-    for commit in commits:
-        show = _run_git(
-            project_path,
-            ["show", "--stat", "--name-only", "--format=fuller", commit["full_hash"]],
-            timeout=15,
-        )
-        files: list[str] = []
-        files_changed = 0
-        insertions = 0
-        deletions = 0
-        if show and show.returncode == 0:
-            files, files_changed, insertions, deletions = _parse_show_output(show.stdout)
-        enriched.append(
-            {
-                **commit,
-                "files_changed": files_changed,
-                "insertions": insertions,
-                "deletions": deletions,
-                "files": files,
-            }
-        )
+    commits = _parse_log_numstat(result.stdout)
+    if stats_cache is None or not commits:
+        return commits
+    enriched = _fill_stats_from_cache(project_path, commits, stats_cache)
+    if enriched is None:
+        print(f"Warning: git stats lookup failed in {project_path}", file=sys.stderr)
+        return commits
     return enriched
@@ -0,0 +1,113 @@
+"""Per-stage wall time, CPU time, memory and count instrumentation for `--profile`."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator
+
+from wl_parser.git_collector import git_subprocess_count
+
+
+# Bump when a field is renamed or removed; adding fields keeps the version.
+PROFILE_SCHEMA_VERSION = 1
+
+
+class StageProfiler:
+    """Collect one record per pipeline stage, in the order the stages ran.
+
+    Each record carries `wall_seconds`, `cpu_seconds` (this process),
+    `child_cpu_seconds` (reaped worker and git processes), `peak_memory_bytes`
+    (tracemalloc peak while the stage ran, Python allocations only) and the
+    `counts` the stage filled in, plus `git_subprocesses` when it ran git.
+    Tracing memory slows the run down, so profile numbers are for comparing
+    stages and releases, not for absolute timings.
+    """
+
+    def __init__(self) -> None:
+        self.stages: list[dict[str, Any]] = []
+        self._started_tracing = False
+        self._wall_start = time.perf_counter()
+
+    def __enter__(self) -> StageProfiler:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, int]]:
+        """Time the body as stage `name`; the yielded dict collects its counts."""
+        counts: dict[str, int] = {}
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        git_before = git_subprocess_count()
+        times_before = os.times()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            wall = time.perf_counter() - wall_before
+            cpu = time.process_time() - cpu_before
+            times_after = os.times()
+            peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+            git_calls = git_subprocess_count() - git_before
+            if git_calls:
+                counts["git_subprocesses"] = git_calls
+            self.stages.append(
+                {
+                    "name": name,
+                    "wall_seconds": round(wall, 6),
+                    "cpu_seconds": round(cpu, 6),
+                    "child_cpu_seconds": round(
+                        (times_after.children_user - times_before.children_user)
+                        + (times_after.children_system - times_before.children_system),
+                        6,
+                    ),
+                    "peak_memory_bytes": peak,
+                    "counts": counts,
+                }
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        peaks = [stage["peak_memory_bytes"] for stage in self.stages if stage["peak_memory_bytes"] is not None]
+        return {
+            "schema_version": PROFILE_SCHEMA_VERSION,
+            "stages": self.stages,
+            "total": {
+                "wall_seconds": round(time.perf_counter() - self._wall_start, 6),
+                "cpu_seconds": round(sum(stage["cpu_seconds"] for stage in self.stages), 6),
+                "child_cpu_seconds": round(sum(stage["child_cpu_seconds"] for stage in self.stages), 6),
+                "peak_memory_bytes": max(peaks, default=None),
+                "git_subprocesses": sum(stage["counts"].get("git_subprocesses", 0) for stage in self.stages),
+            },
+        }
+
+    def write(self, destination: str) -> None:
+        """Write the profile as JSON to `destination`, or to stderr for `-`."""
+        text = json.dumps(self.to_dict(), indent=2) + "\n"
+        if destination == "-":
+            sys.stderr.write(text)
+            return
+        path = Path(destination).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def profile_stage(profiler: StageProfiler | None, name: str) -> AbstractContextManager[dict[str, int]]:
+    """`profiler.stage(name)`, or a no-op context yielding a scratch dict."""
+    if profiler is None:
+        return nullcontext({})
+    return profiler.stage(name)
@@ -0,0 +1,133 @@
+"""Per-project JSON bundles and their manifest for project-level summaries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_BUNDLE_JOBS = 4
+
+_BUNDLE_SESSION_FIELDS = {
+    "session_id": None,
+    "source": None,
+    "start": None,
+    "end": None,
+    "duration_minutes": None,
+    "status": None,
+    "first_prompt": None,
+    "closing_note": None,
+    "session_hints": [],
+    "commits": [],
+    "tools_used": {},
+    "evidence_paths": [],
+}
+
+
+def _bundle_slug(project: dict[str, Any]) -> str:
+    slug_source = project.get("display_name") or project.get("short_name") or "project"
+    return re.sub(r"[^a-zA-Z0-9._-]+", "-", slug_source).strip("-") or "project"
+
+
+def _bundle_slugs(projects: dict[str, dict[str, Any]]) -> dict[str, str]:
+    """One distinct file slug per project path.
+
+    Names that slug to the same string (e.g. non-ASCII names all becoming
+    `project`) get a short hash of their project path appended, so each
+    bundle keeps its own file from run to run whatever the project order.
+    """
+    slugs = {project_path: _bundle_slug(project) for project_path, project in projects.items()}
+    counts = Counter(slugs.values())
+    counts["manifest"] += 1
+    return {
+        project_path: slug
+        if counts[slug] == 1
+        else f"{slug}-{hashlib.sha256(project_path.encode('utf-8')).hexdigest()[:8]}"
+        for project_path, slug in slugs.items()
+    }
+
+
+def _write_bundle(file_path: Path, bundle: dict[str, Any]) -> tuple[str, bool]:
+    """Serialize `bundle` and write it unless the file already holds the same bytes.
+
+    Returns the SHA-256 of the content and whether the file changed.
+    """
+    content = (json.dumps(bundle, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()
+    try:
+        previous = hashlib.sha256(file_path.read_bytes()).hexdigest()
+    except OSError:
+        previous = None
+    if previous == digest:
+        return digest, False
+    file_path.write_bytes(content)
+    return digest, True
+
+
+def emit_project_bundles(
+    report: dict[str, Any], output_dir: Path, jobs: int = DEFAULT_BUNDLE_JOBS
+) -> None:
+    """Write one JSON bundle per project plus `manifest.json` into `output_dir`.
+
+    Sessions are grouped by project in one pass and bundles are serialized and
+    written on a thread pool. A bundle whose content hash matches the file
+    already on disk is left untouched; the manifest records each bundle's
+    `sha256` and whether it `changed`, so per-project summaries can be redone
+    only for projects whose bundle changed since the last emission.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sessions_by_project: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for session in report.get("sessions", []):
+        sessions_by_project[session.get("project")].append(
+            {field: session.get(field, default) for field, default in _BUNDLE_SESSION_FIELDS.items()}
+        )
+
+    projects = report.get("projects", {})
+    slugs = _bundle_slugs(projects)
+    bundles = []
+    for project_path, project in projects.items():
+        bundle = {
+            "project_path": project_path,
+            "short_name": project.get("short_name"),
+            "display_name": project.get("display_name") or project.get("short_name"),
+            "duration_minutes": project.get("duration_minutes"),
+            "session_count": project.get("session_count"),
+            "sources": project.get("sources", []),
+            "time_span": project.get("time_span", {}),
+            "status_counts": project.get("status_counts", {}),
+            "session_hints": project.get("session_hints", []),
+            "session_summaries": sessions_by_project.get(project_path, []),
+            "files_touched": project.get("files_touched", []),
+            "git_commits": project.get("git_commits", []),
+        }
+        bundles.append((output_dir / f"{slugs[project_path]}.json", bundle))
+
+    if len(bundles) > 1 and jobs > 1:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(bundles))) as pool:
+            written = list(pool.map(lambda item: _write_bundle(*item), bundles))
+    else:
+        written = [_write_bundle(file_path, bundle) for file_path, bundle in bundles]
+
+    manifest = {
+        "summary": report.get("summary", {}),
+        "period": report.get("period", {}),
+        "projects": [
+            {
+                "short_name": bundle["short_name"],
+                "display_name": bundle["display_name"],
+                "path": str(file_path),
+                "sha256": digest,
+                "changed": changed,
+            }
+            for (file_path, bundle), (digest, changed) in zip(bundles, written)
+        ],
+    }
+    (output_dir / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
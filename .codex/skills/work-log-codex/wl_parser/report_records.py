@@ -0,0 +1,61 @@
+"""Typed report records streamed by the parser and reassembled into a report."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+
+class ReportRecord(NamedTuple):
+    """One piece of the report, yielded by `iter_report_records` once final.
+
+    `path` is set for `project` records only, whose `data` is keyed by it in
+    the report's `projects` map.
+    """
+
+    type: str
+    data: Any
+    path: str | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        if self.path is None:
+            return {"type": self.type, "data": self.data}
+        return {"type": self.type, "path": self.path, "data": self.data}
+
+
+# Report key each record type is collected under, and how.
+_RECORD_KEYS: dict[str, tuple[str, str]] = {
+    "period": ("period", "value"),
+    "session": ("sessions", "list"),
+    "subagent_session": ("subagent_sessions", "list"),
+    "project": ("projects", "map"),
+    "daily_summary": ("daily_summary", "list"),
+    "codex_session": ("codex_sessions", "list"),
+    "tool_summary": ("tool_summary", "value"),
+    "token_summary": ("token_summary", "value"),
+    "summary": ("summary", "value"),
+}
+
+
+def empty_report() -> dict[str, Any]:
+    """Report skeleton in output key order, for `add_report_record` to fill."""
+    return {
+        "period": None,
+        "summary": None,
+        "projects": {},
+        "sessions": [],
+        "subagent_sessions": [],
+        "daily_summary": [],
+        "codex_sessions": [],
+        "tool_summary": None,
+        "token_summary": None,
+    }
+
+
+def add_report_record(report: dict[str, Any], record: ReportRecord) -> None:
+    key, kind = _RECORD_KEYS[record.type]
+    if kind == "list":
+        report[key].append(record.data)
+    elif kind == "map":
+        report[key][record.path] = record.data
+    else:
+        report[key] = record.data
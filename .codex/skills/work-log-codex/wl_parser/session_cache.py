@@ -0,0 +1,128 @@
+"""Persistent cache of session rollups keyed by source file fingerprint."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+
+SESSION_CACHE_FILENAME = "sessions.sqlite3"
+DEFAULT_MAX_ENTRIES = 20_000
+# Bump when `session_rollup` output changes so old records are not reused.
+RECORD_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_records (
+    group_key TEXT NOT NULL,
+    clip TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    record TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (group_key, clip)
+);
+CREATE INDEX IF NOT EXISTS session_records_by_use ON session_records (last_used);
+"""
+
+
+def source_fingerprint(evidence_paths: list[str], project_paths: list[str]) -> str | None:
+    """`(path, size, mtime)` of every evidence file plus the resolved projects.
+
+    Project paths are included because Claude sessions are matched to a
+    project through `history.jsonl`, not their own file. None when any
+    evidence file cannot be stat'ed (or there is none), since such a session
+    cannot be checked for changes.
+    """
+    if not evidence_paths:
+        return None
+    files = []
+    for path in sorted(set(evidence_paths)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        files.append([path, stat.st_size, stat.st_mtime_ns])
+    return json.dumps([RECORD_VERSION, files, sorted(set(project_paths))], ensure_ascii=False)
+
+
+class SessionRecordCache:
+    """LRU-capped store of `session_rollup` records.
+
+    A record is keyed by its session group and `clip`, the slice of the
+    session the report window and its local day kept (first and last event time, event count, analysis
+    options), and is valid only while the `sources` fingerprint still matches.
+    Writing a record drops the group's entries for an older fingerprint, and
+    the least recently used entries beyond `max_entries` are evicted.
+    `last_used` is a logical clock, as in `CommitStatsCache`.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM session_records"
+        ).fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    @classmethod
+    def in_cache_dir(cls, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> SessionRecordCache:
+        return cls(cache_dir / SESSION_CACHE_FILENAME, max_entries)
+
+    def __enter__(self) -> SessionRecordCache:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get(self, group_key: str, clip: str, sources: str) -> dict[str, Any] | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT sources, record FROM session_records WHERE group_key = ? AND clip = ?",
+                (group_key, clip),
+            ).fetchone()
+            if row is None or row[0] != sources:
+                return None
+            self._connection.execute(
+                "UPDATE session_records SET last_used = ? WHERE group_key = ? AND clip = ?",
+                (self._tick(), group_key, clip),
+            )
+        return json.loads(row[1])
+
+    def put(self, group_key: str, clip: str, sources: str, record: dict[str, Any]) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM session_records WHERE group_key = ? AND sources != ?",
+                (group_key, sources),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO session_records (group_key, clip, sources, record, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (group_key, clip, sources, json.dumps(record, ensure_ascii=False), self._tick()),
+            )
+            self._connection.execute(
+                "DELETE FROM session_records WHERE rowid IN ("
+                " SELECT rowid FROM session_records ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM session_records")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM session_records").fetchone()[0]
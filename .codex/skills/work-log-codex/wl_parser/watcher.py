@@ -0,0 +1,218 @@
+"""Watch the Claude and Codex history directories for changed files.
+
+A watcher keeps the set of files created, written, moved or deleted under
+its directories since the last `drain()`. On Linux it uses inotify, so no
+directory is walked after the watches are set up; elsewhere, or when inotify
+cannot be used (no symbol, watch limit reached), `PollingWatcher` compares
+stat snapshots instead. `drain()` returns None when changes may have been
+lost (an inotify queue overflow, a watched directory removed); the caller
+should then walk the directories again.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable
+
+
+# (directory, recursive) pairs to watch.
+WatchSpec = tuple[Path, bool]
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len].
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def watch_specs(claude_home: Path, codex_home: Path) -> list[WatchSpec]:
+    """Directories holding the sources `iter_claude_sources` / `iter_codex_sources` list.
+
+    The homes themselves are watched without recursion, for top-level
+    histories and for source directories created after the watcher.
+    """
+    return [
+        (claude_home, False),
+        (claude_home / "transcripts", False),
+        (claude_home / "sessions", False),
+        (claude_home / "projects", True),
+        (codex_home, False),
+        (codex_home / "sessions", True),
+    ]
+
+
+class PollingWatcher:
+    """Portable watcher comparing (size, mtime, inode) snapshots on every drain."""
+
+    def __init__(self, specs: Iterable[WatchSpec]) -> None:
+        self._specs = list(specs)
+        self._snapshot = self._scan()
+
+    def __enter__(self) -> PollingWatcher:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+    def _scan(self) -> dict[Path, tuple[int, int, int]]:
+        snapshot: dict[Path, tuple[int, int, int]] = {}
+        pending = list(self._specs)
+        while pending:
+            directory, recursive = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append((Path(entry.path), True))
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        return snapshot
+
+    def drain(self) -> set[Path] | None:
+        current = self._scan()
+        changed = {path for path, signature in current.items() if self._snapshot.get(path) != signature}
+        changed.update(self._snapshot.keys() - current.keys())
+        self._snapshot = current
+        return changed
+
+
+def _inotify_libc() -> ctypes.CDLL:
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+    libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "libc has no inotify")
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    return libc
+
+
+class InotifyWatcher:
+    """Linux watcher fed by inotify events, read without blocking on each drain.
+
+    Subdirectories of recursive directories, and watched directories created
+    after the watcher, are added as they appear; files already in them are
+    reported as changed.
+    """
+
+    def __init__(self, specs: Iterable[WatchSpec]) -> None:
+        self._libc = _inotify_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._specs = dict(specs)
+        self._watches: dict[int, tuple[Path, bool]] = {}
+        self._changed: set[Path] = set()
+        self._lost = False
+        try:
+            for directory, recursive in self._specs.items():
+                self._watch(directory, recursive, scan=False)
+        except OSError:
+            self.close()
+            raise
+
+    def __enter__(self) -> InotifyWatcher:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch(self, directory: Path, recursive: bool, scan: bool) -> None:
+        descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if descriptor < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                return  # gone already, or not created yet
+            raise OSError(code, f"cannot watch {directory}: {os.strerror(code)}")
+        self._watches[descriptor] = (directory, recursive)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                if recursive or path in self._specs:
+                    self._watch(path, recursive or self._specs[path], scan)
+            elif scan:
+                # Files written before the watch existed.
+                self._changed.add(path)
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                self._handle(descriptor, mask, os.fsdecode(name))
+
+    def _handle(self, descriptor: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self._lost = True
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(descriptor, None)
+            return
+        watched = self._watches.get(descriptor)
+        if watched is None or not name:
+            return
+        directory, recursive = watched
+        path = directory / name
+        if not mask & IN_ISDIR:
+            self._changed.add(path)
+        elif recursive or path in self._specs:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch(path, recursive or self._specs[path], scan=True)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                # The files that were under it are unknown here.
+                self._lost = True
+
+    def drain(self) -> set[Path] | None:
+        self._read_events()
+        changed, self._changed = self._changed, set()
+        if self._lost:
+            self._lost = False
+            return None
+        return changed
+
+
+def open_watcher(specs: Iterable[WatchSpec]) -> InotifyWatcher | PollingWatcher:
+    """An inotify watcher where it can be set up, else a polling one."""
+    specs = list(specs)
+    try:
+        return InotifyWatcher(specs)
+    except OSError:
+        return PollingWatcher(specs)
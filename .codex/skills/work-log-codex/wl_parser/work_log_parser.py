@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
-import argparse
 import json
 import re
 import sys
+import time
+from array import array
+from bisect import bisect_right
 from collections import Counter, defaultdict
-from datetime import date as date_type
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
-
+from typing import Any, Iterator, NamedTuple
+
+from scripts.intervals import (
+    WindowIndex,
+    active_minutes,
+    activity_windows,
+    epoch_array,
+    merge_windows,
+    window_minutes,
+)
+from scripts.jsonl_stream import iter_jsonl_rows
 from scripts.source_claude import load_claude_events
 from scripts.source_codex import load_codex_events
+from scripts.event_record import Event, extract_command_strings
+from wl_parser.cli import DEFAULT_GIT_JOBS, _get_tz, parse_time_shortcut
+from wl_parser.day_cache import DayRollupCache, rollup_scope
+from wl_parser.event_store import EventStore
+from wl_parser.git_cache import CommitStatsCache
+from wl_parser.profiling import StageProfiler, profile_stage
+from wl_parser.report_records import ReportRecord, add_report_record, empty_report
+from wl_parser.session_cache import SessionRecordCache, source_fingerprint
 from wl_parser.git_collector import collect_git_data
 
 
@@ -21,6 +41,11 @@ COMPLETION_KEYWORDS = re.compile(
     r"完成|已完成|已提交|done|completed|committed|finished|shipped",
     re.IGNORECASE,
 )
+COMMIT_MESSAGE_PATTERN = re.compile(r'git commit\s+-m\s+["\']([^"\']+)["\']')
+COMMIT_HEREDOC_PATTERN = re.compile(
+    r"cat\s*<<['\"]?EOF['\"]?\s*(?:\\n|\n)(.+?)(?:\\n|\n).*?EOF",
+    re.DOTALL,
+)
 SYSTEM_TAG_PATTERNS = (
     re.compile(r"^<"),
     re.compile(r"\bI'?m using the\b", re.IGNORECASE),
@@ -63,56 +88,35 @@ NOISE_HINT_PATTERNS = (
 )
 
 
-def parse_timestamp(ts_str: str) -> datetime:
-    """Parse ISO-8601 timestamp to aware datetime."""
-    parsed = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-    if parsed.tzinfo is None:
-        return parsed.replace(tzinfo=datetime.now().astimezone().tzinfo)
-    return parsed
+def _combine_line_patterns(
+    patterns: tuple[re.Pattern[str], ...],
+) -> tuple[re.Pattern[str], re.Pattern[str]]:
+    """Fold `patterns` into one alternation for `.match` and one for `.search`.
 
+    `^`-anchored patterns lose the anchor and are tried only at the start of
+    the line; the rest keep `search` semantics. Each branch keeps its own
+    IGNORECASE flag, so a line matches iff some original pattern matches it.
+    """
 
-def _get_tz(timezone_name: str):
-    from zoneinfo import ZoneInfo
+    def branch(pattern: re.Pattern[str], source: str) -> str:
+        return f"(?{'i' if pattern.flags & re.IGNORECASE else ''}:{source})"
 
-    try:
-        return ZoneInfo(timezone_name)
-    except (KeyError, Exception):
-        return timezone.utc
+    anchored = [branch(p, p.pattern[1:]) for p in patterns if p.pattern.startswith("^")]
+    floating = [branch(p, p.pattern) for p in patterns if not p.pattern.startswith("^")]
+    return re.compile("|".join(anchored) or "(?!)"), re.compile("|".join(floating) or "(?!)")
 
 
-def parse_time_shortcut(
-    shortcut: str,
-    timezone_name: str,
-    end_str: str | None = None,
-) -> tuple[datetime, datetime]:
-    """Convert shortcut or YYYY-MM-DD date range into local datetimes."""
-    tz = _get_tz(timezone_name)
-    today = datetime.now(tz).date()
-
-    if shortcut == "today":
-        start = datetime(today.year, today.month, today.day, 0, 0, 0, tzinfo=tz)
-        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
-    elif shortcut == "yesterday":
-        date = today - timedelta(days=1)
-        start = datetime(date.year, date.month, date.day, 0, 0, 0, tzinfo=tz)
-        end = datetime(date.year, date.month, date.day, 23, 59, 59, tzinfo=tz)
-    elif shortcut == "this-week":
-        monday = today - timedelta(days=today.weekday())
-        start = datetime(monday.year, monday.month, monday.day, 0, 0, 0, tzinfo=tz)
-        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
-    elif shortcut == "this-month":
-        start = datetime(today.year, today.month, 1, 0, 0, 0, tzinfo=tz)
-        end = datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz)
-    else:
-        date = date_type.fromisoformat(shortcut)
-        start = datetime(date.year, date.month, date.day, 0, 0, 0, tzinfo=tz)
-        if end_str:
-            end_date = date_type.fromisoformat(end_str)
-            end = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=tz)
-        else:
-            end = datetime(date.year, date.month, date.day, 23, 59, 59, tzinfo=tz)
+_SKIP_LINE_PREFIX, _SKIP_LINE_ANYWHERE = _combine_line_patterns(
+    SYSTEM_TAG_PATTERNS + NOISE_HINT_PATTERNS
+)
 
-    return start, end
+
+def parse_timestamp(ts_str: str) -> datetime:
+    """Parse ISO-8601 timestamp to aware datetime."""
+    parsed = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=datetime.now().astimezone().tzinfo)
+    return parsed
 
 
 def _compact_text(value: str | None, limit: int = 200) -> str | None:
@@ -133,9 +137,7 @@ def _first_meaningful_line(text: str | None, limit: int = 200) -> str | None:
         line = raw_line.strip()
         if not line:
             continue
-        if any(pattern.search(line) for pattern in SYSTEM_TAG_PATTERNS):
-            continue
-        if any(pattern.search(line) for pattern in NOISE_HINT_PATTERNS):
+        if _SKIP_LINE_PREFIX.match(line) or _SKIP_LINE_ANYWHERE.search(line):
             continue
         if len(line) > limit:
             return line[: limit - 1] + "…"
@@ -143,233 +145,63 @@ def _first_meaningful_line(text: str | None, limit: int = 200) -> str | None:
     return None
 
 
-def _event_role(event: dict[str, Any]) -> str | None:
-    event_type = event.get("event_type")
-    if event_type in {"user", "assistant"}:
-        return event_type
-
-    raw = event.get("raw", {})
-    if not isinstance(raw, dict):
-        return None
-
-    if event.get("tool") == "codex":
-        payload = raw.get("payload", {})
-        if isinstance(payload, dict):
-            if payload.get("type") == "message":
-                role = payload.get("role")
-                if isinstance(role, str) and role:
-                    return role
-        title = event.get("title")
-        if isinstance(title, str) and title in {"user", "assistant"}:
-            return title
+def _commit_message(command: str) -> str | None:
+    # Substring checks keep the regexes (the heredoc one is DOTALL) off
+    # commands that cannot match them.
+    if "git commit" not in command:
         return None
-
-    message = raw.get("message")
-    if isinstance(message, dict):
-        role = message.get("role")
-        if isinstance(role, str) and role:
-            return role
+    simple = COMMIT_MESSAGE_PATTERN.search(command) if "-m" in command else None
+    if simple:
+        return simple.group(1).splitlines()[0].strip() or None
+    heredoc = COMMIT_HEREDOC_PATTERN.search(command) if "EOF" in command else None
+    if heredoc:
+        return heredoc.group(1).splitlines()[0].strip() or None
     return None
 
 
-def _extract_tool_usage(events: list[dict[str, Any]]) -> dict[str, int]:
-    counts: Counter[str] = Counter()
-    for event in events:
-        raw = event.get("raw", {})
-        if not isinstance(raw, dict):
-            continue
-
-        if event.get("tool") == "claude":
-            if event.get("event_type") == "tool_use":
-                name = raw.get("tool_name") or raw.get("name")
-                if isinstance(name, str) and name:
-                    counts[name] += 1
-                    continue
-            message = raw.get("message")
-            content = message.get("content", []) if isinstance(message, dict) else []
-            if isinstance(content, list):
-                for block in content:
-                    if not isinstance(block, dict):
-                        continue
-                    if block.get("type") == "tool_use":
-                        name = block.get("name")
-                        if isinstance(name, str) and name:
-                            counts[name] += 1
-        else:
-            payload = raw.get("payload", {})
-            if isinstance(payload, dict):
-                payload_type = payload.get("type")
-                if payload_type in {"function_call", "tool_call"}:
-                    name = payload.get("name")
-                    if isinstance(name, str) and name:
-                        counts[name] += 1
-                if payload_type == "message":
-                    content = payload.get("content", [])
-                    if isinstance(content, list):
-                        for item in content:
-                            if not isinstance(item, dict):
-                                continue
-                            item_type = item.get("type")
-                            if item_type in {"tool_call", "function_call"}:
-                                name = item.get("name")
-                                if isinstance(name, str) and name:
-                                    counts[name] += 1
-
-    return dict(counts)
-
-
-def _extract_tokens(events: list[dict[str, Any]]) -> dict[str, int]:
-    totals = {"input": 0, "output": 0, "cache_creation": 0, "cache_read": 0}
-    for event in events:
-        raw = event.get("raw", {})
-        if not isinstance(raw, dict):
-            continue
-
-        usage = raw.get("usage")
-        if event.get("tool") == "claude" and not isinstance(usage, dict):
-            message = raw.get("message")
-            if isinstance(message, dict):
-                usage = message.get("usage")
-        elif event.get("tool") == "codex" and not isinstance(usage, dict):
-            payload = raw.get("payload")
-            if isinstance(payload, dict):
-                usage = payload.get("usage")
-        if not isinstance(usage, dict):
-            continue
-
-        totals["input"] += int(usage.get("input_tokens", 0) or 0)
-        totals["output"] += int(usage.get("output_tokens", 0) or 0)
-        totals["cache_creation"] += int(usage.get("cache_creation_input_tokens", 0) or 0)
-        totals["cache_read"] += int(usage.get("cache_read_input_tokens", 0) or 0)
-
-    return totals
-
-
-def _extract_command_strings(value: Any) -> list[str]:
-    commands: list[str] = []
-    if isinstance(value, str):
-        if "git commit" in value:
-            commands.append(value)
-        return commands
-    if isinstance(value, dict):
-        for nested in value.values():
-            commands.extend(_extract_command_strings(nested))
-        return commands
-    if isinstance(value, list):
-        for nested in value:
-            commands.extend(_extract_command_strings(nested))
-    return commands
-
-
-def _extract_commit_messages(events: list[dict[str, Any]]) -> list[str]:
-    messages: list[str] = []
-    for event in events:
-        raw = event.get("raw", {})
-        if not isinstance(raw, dict):
-            continue
-        for command in _extract_command_strings(raw):
-            simple = re.search(r'git commit\s+-m\s+["\']([^"\']+)["\']', command)
-            if simple:
-                msg = simple.group(1).splitlines()[0].strip()
-                if msg and msg not in messages:
-                    messages.append(msg)
-                continue
-            heredoc = re.search(
-                r"cat\s*<<['\"]?EOF['\"]?\s*(?:\\n|\n)(.+?)(?:\\n|\n).*?EOF",
-                command,
-                re.DOTALL,
-            )
-            if heredoc:
-                msg = heredoc.group(1).splitlines()[0].strip()
-                if msg and msg not in messages:
-                    messages.append(msg)
-    return messages
-
-
-def _select_project_path(events: list[dict[str, Any]]) -> str | None:
-    candidates = [
-        event.get("project_path")
-        for event in events
-        if isinstance(event.get("project_path"), str) and event.get("project_path")
-    ]
-    if not candidates:
-        return None
-    counts = Counter(candidates)
-    return counts.most_common(1)[0][0]
-
-
 def calculate_active_duration(
     timestamps: list[str], idle_threshold_minutes: int = 30
 ) -> int:
     """Calculate active duration in minutes with idle-gap splitting."""
-    if len(timestamps) < 2:
-        return 0
-    datetimes = sorted(parse_timestamp(value) for value in timestamps)
-    threshold = timedelta(minutes=idle_threshold_minutes)
-
-    total_minutes = 0
-    segment_start = datetimes[0]
-    prev = datetimes[0]
-    for current in datetimes[1:]:
-        if current - prev > threshold:
-            total_minutes += int((prev - segment_start).total_seconds() / 60)
-            segment_start = current
-        prev = current
-    total_minutes += int((prev - segment_start).total_seconds() / 60)
-    return total_minutes
-
-
-def _calculate_duration_for_events(events: list[dict[str, Any]]) -> int:
-    timestamps = [event["timestamp"] for event in events if event.get("timestamp")]
-    return calculate_active_duration(timestamps)
-
-
-def _session_is_subagent(events: list[dict[str, Any]]) -> bool:
-    return any(bool(event.get("is_subagent")) for event in events)
+    return active_minutes(
+        [parse_timestamp(value).timestamp() for value in timestamps], idle_threshold_minutes * 60
+    )
 
 
-def _local_date_key(timestamp: str | None, tz) -> str | None:
-    if not timestamp:
-        return None
-    try:
-        return parse_timestamp(timestamp).astimezone(tz).strftime("%Y-%m-%d")
-    except ValueError:
+def _local_date_key(epoch: float | None, tz) -> str | None:
+    if epoch is None:
         return None
+    return datetime.fromtimestamp(epoch, tz).strftime("%Y-%m-%d")
 
 
 def _build_daily_summary(
-    sessions: list[dict[str, Any]], events: list[dict[str, Any]], tz
+    sessions: list[dict[str, Any]],
+    day_minutes: dict[str, int],
+    tz,
+    session_start_epochs: dict[str, float],
 ) -> list[dict[str, Any]]:
     session_groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    event_groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
 
     for session in sessions:
-        date_key = _local_date_key(session.get("start"), tz)
+        date_key = _local_date_key(session_start_epochs.get(session["group_key"]), tz)
         if date_key:
             session_groups[date_key].append(session)
 
-    for event in events:
-        date_key = _local_date_key(event.get("timestamp"), tz)
-        if date_key:
-            event_groups[date_key].append(event)
-
     daily_summary: list[dict[str, Any]] = []
-    for date_key in sorted(set(session_groups) | set(event_groups)):
-        day_sessions = session_groups.get(date_key, [])
-        if not day_sessions:
-            continue
+    for date_key in sorted(session_groups):
+        day_sessions = session_groups[date_key]
         daily_summary.append(
             {
                 "date": date_key,
                 "session_count": len(day_sessions),
-                "total_duration_minutes": _calculate_duration_for_events(event_groups.get(date_key, [])),
+                "total_duration_minutes": day_minutes.get(date_key, 0),
                 "total_commits": sum(len(session.get("commits", [])) for session in day_sessions),
             }
         )
     return daily_summary
 
 
-def _session_group_key(event: dict[str, Any]) -> str:
+def _session_group_key(event: Event) -> str:
     session_id = event.get("session_id")
     if isinstance(session_id, str) and session_id:
         return f"{event.get('tool', 'unknown')}::{session_id}"
@@ -377,18 +209,15 @@ def _session_group_key(event: dict[str, Any]) -> str:
 
 
 def _detect_session_status(
-    events: list[dict[str, Any]], commits: list[str], duration_minutes: int
+    commits: list[str],
+    last_reply_completes: bool | None,
+    tool_count: int,
+    duration_minutes: int,
 ) -> str:
     if commits:
         return "completed"
-    assistant_texts = [
-        event.get("text")
-        for event in reversed(events)
-        if _event_role(event) == "assistant" and isinstance(event.get("text"), str)
-    ]
-    if assistant_texts and COMPLETION_KEYWORDS.search(assistant_texts[0] or ""):
+    if last_reply_completes:
         return "completed"
-    tool_count = sum(_extract_tool_usage(events).values())
     if tool_count > 0 or duration_minutes > 2:
         return "in_progress"
     return "abandoned"
@@ -407,56 +236,221 @@ def _dedupe_strings(values: list[str], limit: int | None = None) -> list[str]:
     return result
 
 
-def analyze_session(session_key: str, events: list[dict[str, Any]]) -> dict[str, Any]:
-    """Analyze grouped session events into a compact session record."""
-    events = sorted(events, key=lambda item: item.get("timestamp") or "")
-    timestamps = [event["timestamp"] for event in events if event.get("timestamp")]
+def _event_sort_key(event: Event) -> float:
+    return float("-inf") if event.ts_epoch is None else event.ts_epoch
+
+
+def session_rollup(
+    events: list[Event | dict[str, Any]], deep_commit_scan: bool = False
+) -> dict[str, Any]:
+    """Roll one slice of a session's events up into a JSON-safe partial record.
+
+    Everything is gathered in one pass over the time-sorted events; only the
+    closing note walks back over assistant texts, stopping at the first
+    meaningful line. Commit messages come from the commands found in tool-call
+    inputs at load time; `deep_commit_scan` instead re-reads each event's row
+    and searches every nested string, which is much slower. Activity is kept
+    as idle-gap windows per project, so rollups of consecutive slices (one per
+    local day) combine with `merge_session_rollups` into the rollup of the
+    whole session.
+    """
+    events = sorted((Event.coerce(event) for event in events), key=_event_sort_key)
+    first_epoch = None
+    first_timestamp = None
+    last_timestamp = None
     first_prompt = None
-    closing_note = None
+    assistant_texts: list[str] = []
+    commits: dict[str, None] = {}
+    epochs_by_project: dict[str, array] = defaultdict(epoch_array)
+    project_counts: Counter[str] = Counter()
+    tool_usage: Counter[str] = Counter()
+    tokens = {"input": 0, "output": 0, "cache_creation": 0, "cache_read": 0}
+    is_subagent = False
+    evidence_paths: dict[str, None] = {}
 
     for event in events:
-        text = _first_meaningful_line(event.get("text"))
-        if not text:
-            continue
-        role = _event_role(event)
-        if role == "user":
+        if event.timestamp:
+            if first_timestamp is None:
+                first_timestamp = event.timestamp
+            last_timestamp = event.timestamp
+        if event.ts_epoch is not None:
+            if first_epoch is None:
+                first_epoch = event.ts_epoch
+            project_key = event.project_path if isinstance(event.project_path, str) and event.project_path else "unknown"
+            epochs_by_project[project_key].append(event.ts_epoch)
+        text = event.text
+        if event.role == "user":
             if first_prompt is None:
-                first_prompt = text
-        elif role == "assistant":
-            closing_note = text
+                first_prompt = _first_meaningful_line(text)
+        elif event.role == "assistant" and isinstance(text, str):
+            assistant_texts.append(text)
+        commands = extract_command_strings(event.raw) if deep_commit_scan else event.commit_commands
+        for command in commands:
+            message = _commit_message(command)
+            if message:
+                commits.setdefault(message, None)
+        if isinstance(event.project_path, str) and event.project_path:
+            project_counts[event.project_path] += 1
+        tool_usage.update(event.tool_names)
+        if event.usage is not None:
+            for key in tokens:
+                tokens[key] += event.usage[key]
+        is_subagent = is_subagent or bool(event.is_subagent)
+        if event.evidence_path:
+            evidence_paths.setdefault(str(event.evidence_path), None)
+
+    return {
+        "source": events[0].tool if events else None,
+        "first_epoch": first_epoch,
+        "start": first_timestamp,
+        "end": last_timestamp,
+        "first_prompt": first_prompt,
+        "closing_note": next(
+            (line for line in map(_first_meaningful_line, reversed(assistant_texts)) if line),
+            None,
+        ),
+        "last_reply_completes": (
+            bool(assistant_texts[-1] and COMPLETION_KEYWORDS.search(assistant_texts[-1]))
+            if assistant_texts
+            else None
+        ),
+        "commits": list(commits),
+        "projects": dict(project_counts),
+        "tools": dict(tool_usage),
+        "tokens": tokens,
+        "is_subagent": is_subagent,
+        "evidence_paths": list(evidence_paths),
+        "windows": {key: activity_windows(epochs, presorted=True) for key, epochs in epochs_by_project.items()},
+    }
+
+
+def merge_session_rollups(rollups: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine rollups of consecutive slices of one session, oldest first.
+
+    The result equals the rollup of all the slices' events taken together:
+    first values come from the earliest slice that has one, last values from
+    the latest, and counts, commits and windows are unioned in order.
+    """
+    if len(rollups) == 1:
+        return rollups[0]
+    merged: dict[str, Any] = {
+        "source": None,
+        "first_epoch": None,
+        "start": None,
+        "end": None,
+        "first_prompt": None,
+        "closing_note": None,
+        "last_reply_completes": None,
+        "commits": [],
+        "projects": {},
+        "tools": {},
+        "tokens": {"input": 0, "output": 0, "cache_creation": 0, "cache_read": 0},
+        "is_subagent": False,
+        "evidence_paths": [],
+        "windows": {},
+    }
+    for rollup in rollups:
+        for key in ("source", "first_epoch", "start", "first_prompt"):
+            if merged[key] is None:
+                merged[key] = rollup[key]
+        for key in ("end", "closing_note", "last_reply_completes"):
+            if rollup[key] is not None:
+                merged[key] = rollup[key]
+        for key in ("commits", "evidence_paths"):
+            merged[key].extend(value for value in rollup[key] if value not in merged[key])
+        for key in ("projects", "tools", "tokens"):
+            for name, count in rollup[key].items():
+                merged[key][name] = merged[key].get(name, 0) + count
+        merged["is_subagent"] = merged["is_subagent"] or rollup["is_subagent"]
+        for project_key, windows in rollup["windows"].items():
+            merged["windows"].setdefault(project_key, []).extend(windows)
+    # Days are merged oldest first, so each project's windows are in order.
+    merged["windows"] = {
+        key: merge_windows(windows, presorted=True) for key, windows in merged["windows"].items()
+    }
+    return merged
 
-    commits = _extract_commit_messages(events)
-    duration = calculate_active_duration(timestamps)
-    project_path = _select_project_path(events)
-    tool_usage = _extract_tool_usage(events)
-    status = _detect_session_status(events, commits, duration)
-    is_subagent = _session_is_subagent(events)
+
+def session_record(session_key: str, rollup: dict[str, Any]) -> dict[str, Any]:
+    """Turn a whole-session rollup into the compact record the report lists."""
+    first_prompt = rollup["first_prompt"]
+    closing_note = rollup["closing_note"]
+    duration = window_minutes(
+        merge_windows(window for windows in rollup["windows"].values() for window in windows)
+    )
+    project_counts = Counter(rollup["projects"])
+    project_path = project_counts.most_common(1)[0][0] if project_counts else None
+    status = _detect_session_status(
+        rollup["commits"],
+        rollup["last_reply_completes"],
+        sum(rollup["tools"].values()),
+        duration,
+    )
 
     return {
         "group_key": session_key,
         "session_id": session_key.split("::", 1)[1],
-        "source": events[0].get("tool"),
+        "source": rollup["source"],
         "project": project_path or "unknown",
-        "start": timestamps[0] if timestamps else None,
-        "end": timestamps[-1] if timestamps else None,
+        "start": rollup["start"],
+        "end": rollup["end"],
         "duration_minutes": duration,
-        "is_subagent": is_subagent,
+        "is_subagent": rollup["is_subagent"],
         "first_prompt": first_prompt,
         "closing_note": closing_note,
         "session_hints": _dedupe_strings(
             ([first_prompt] if first_prompt else []) + ([closing_note] if closing_note else []),
             limit=2,
         ),
-        "commits": commits,
-        "tools_used": tool_usage,
+        "commits": list(rollup["commits"]),
+        "tools_used": dict(rollup["tools"]),
         "status": status,
-        "tokens": _extract_tokens(events),
-        "evidence_paths": _dedupe_strings(
-            [str(event.get("evidence_path")) for event in events if event.get("evidence_path")]
-        ),
+        "tokens": dict(rollup["tokens"]),
+        "evidence_paths": list(rollup["evidence_paths"]),
     }
 
 
+def analyze_session(
+    session_key: str,
+    events: list[Event | dict[str, Any]],
+    deep_commit_scan: bool = False,
+) -> dict[str, Any]:
+    """Analyze grouped session events into a compact session record."""
+    return session_record(session_key, session_rollup(events, deep_commit_scan))
+
+
+def _roll_up_slices(
+    slices: dict[str, list[Event]],
+    deep_commit_scan: bool = False,
+    session_cache: SessionRecordCache | None = None,
+) -> dict[str, dict[str, Any]]:
+    """`session_rollup` for every session slice, reusing cached rollups when possible.
+
+    A cached rollup is reused only when the slice's evidence files are
+    unchanged and the window kept the same part of the session.
+    """
+    if session_cache is None:
+        return {
+            session_key: session_rollup(grouped, deep_commit_scan)
+            for session_key, grouped in slices.items()
+        }
+    rollups = {}
+    for session_key, grouped in slices.items():
+        epochs = [event.ts_epoch for event in grouped if event.ts_epoch is not None]
+        clip = json.dumps([min(epochs, default=None), max(epochs, default=None), len(grouped), deep_commit_scan])
+        sources = source_fingerprint(
+            [str(event.evidence_path) for event in grouped if event.evidence_path],
+            [event.project_path for event in grouped if isinstance(event.project_path, str) and event.project_path],
+        )
+        rollup = session_cache.get(session_key, clip, sources) if sources is not None else None
+        if rollup is None:
+            rollup = session_rollup(grouped, deep_commit_scan)
+            if sources is not None:
+                session_cache.put(session_key, clip, sources, rollup)
+        rollups[session_key] = rollup
+    return rollups
+
+
 def _project_short_name(path: str) -> str:
     if not path:
         return "unknown"
@@ -549,16 +543,10 @@ def _aggregate_by_project(sessions: list[dict[str, Any]]) -> dict[str, dict[str,
 
 
 def _apply_project_union_durations(
-    projects: dict[str, dict[str, Any]], events: list[dict[str, Any]]
+    projects: dict[str, dict[str, Any]], project_minutes: dict[str, int]
 ) -> None:
-    events_by_project: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for event in events:
-        path = event.get("project_path")
-        key = path if isinstance(path, str) and path else "unknown"
-        events_by_project[key].append(event)
-
     for path, project in projects.items():
-        project["duration_minutes"] = _calculate_duration_for_events(events_by_project.get(path, []))
+        project["duration_minutes"] = project_minutes.get(path, 0)
 
 
 def _filter_project_map(
@@ -578,16 +566,8 @@ def _parse_codex_index_sessions(
     codex_home: Path, start: datetime, end: datetime
 ) -> list[dict[str, str]]:
     index_file = codex_home / "session_index.jsonl"
-    if not index_file.exists():
-        return []
     sessions: list[dict[str, str]] = []
-    for line in index_file.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            row = json.loads(line)
-        except json.JSONDecodeError:
-            continue
+    for row in iter_jsonl_rows(index_file):
         updated_at = row.get("updated_at")
         if not isinstance(updated_at, str):
             continue
@@ -606,66 +586,100 @@ def _parse_codex_index_sessions(
     return sessions
 
 
-def _emit_project_bundles(report: dict[str, Any], output_dir: Path) -> None:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    manifest = {
-        "summary": report.get("summary", {}),
-        "period": report.get("period", {}),
-        "projects": [],
-    }
-    all_sessions = report.get("sessions", [])
+class _ReportDay(NamedTuple):
+    key: str
+    begin: datetime
+    next_begin: datetime
+    finished: bool
+
+
+def _report_days(start: datetime, end: datetime, tz, now: float) -> list[_ReportDay]:
+    """Local days overlapping `[start, end]`, oldest first.
+
+    A day is `finished` when all of it lies inside the window and it ended
+    before `now`; only finished days go through the day cache. Ranges end at
+    23:59:59 (see `parse_time_shortcut`), so a window ending in the day's
+    last second covers it.
+    """
+    days: list[_ReportDay] = []
+    day = start.astimezone(tz).date()
+    last = end.astimezone(tz).date()
+    while day <= last:
+        following = day + timedelta(days=1)
+        begin = datetime(day.year, day.month, day.day, tzinfo=tz)
+        next_begin = datetime(following.year, following.month, following.day, tzinfo=tz)
+        covered = start <= begin and end >= next_begin - timedelta(seconds=1)
+        finished = covered and next_begin.timestamp() <= now
+        days.append(_ReportDay(day.isoformat(), begin, next_begin, finished))
+        day = following
+    return days
+
+
+def _collect_git_data_safely(
+    project_path: str,
+    start: datetime,
+    end: datetime,
+    stats_cache: CommitStatsCache | None = None,
+) -> list[dict] | None:
+    """`collect_git_data`, or None (after a warning) when the repo fails."""
+    try:
+        return collect_git_data(project_path, start, end, stats_cache=stats_cache)
+    except Exception as error:  # one broken repo must not sink the report
+        print(f"Warning: git collection failed in {project_path}: {error}", file=sys.stderr)
+        return None
 
-    for project_path, project in report.get("projects", {}).items():
-        project_sessions = [
-            {
-                "session_id": session.get("session_id"),
-                "source": session.get("source"),
-                "start": session.get("start"),
-                "end": session.get("end"),
-                "duration_minutes": session.get("duration_minutes"),
-                "status": session.get("status"),
-                "first_prompt": session.get("first_prompt"),
-                "closing_note": session.get("closing_note"),
-                "session_hints": session.get("session_hints", []),
-                "commits": session.get("commits", []),
-                "tools_used": session.get("tools_used", {}),
-                "evidence_paths": session.get("evidence_paths", []),
-            }
-            for session in all_sessions
-            if session.get("project") == project_path
-        ]
-        bundle = {
-            "project_path": project_path,
-            "short_name": project.get("short_name"),
-            "display_name": project.get("display_name") or project.get("short_name"),
-            "duration_minutes": project.get("duration_minutes"),
-            "session_count": project.get("session_count"),
-            "sources": project.get("sources", []),
-            "time_span": project.get("time_span", {}),
-            "status_counts": project.get("status_counts", {}),
-            "session_hints": project.get("session_hints", []),
-            "session_summaries": project_sessions,
-            "files_touched": project.get("files_touched", []),
-            "git_commits": project.get("git_commits", []),
-        }
-        slug_source = project.get("display_name") or project.get("short_name") or "project"
-        slug = re.sub(r"[^a-zA-Z0-9._-]+", "-", slug_source).strip("-")
-        if not slug:
-            slug = "project"
-        file_path = output_dir / f"{slug}.json"
-        file_path.write_text(json.dumps(bundle, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-        manifest["projects"].append(
-            {
-                "short_name": bundle["short_name"],
-                "display_name": bundle["display_name"],
-                "path": str(file_path),
-            }
-        )
 
-    (output_dir / "manifest.json").write_text(
-        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+def _collect_projects_git_data(
+    project_paths: list[str],
+    start: datetime,
+    end: datetime,
+    jobs: int,
+    stats_cache: CommitStatsCache | None = None,
+) -> dict[str, list[dict]]:
+    """Collect git data for every project on a bounded thread pool.
+
+    Each repo's subprocess timeouts and failures stay local to that repo, and
+    results are keyed by path so callers keep their own project ordering.
+    Commits are not kept in the day cache: a finished day's commits still
+    change when branches are pulled, rebased or switched, so git is asked
+    every run and `stats_cache` keeps that cheap.
+    """
+
+    def collect(path: str) -> list[dict]:
+        return _collect_git_data_safely(path, start, end, stats_cache) or []
+
+    if jobs <= 1 or len(project_paths) <= 1:
+        return {path: collect(path) for path in project_paths}
+    with ThreadPoolExecutor(max_workers=min(jobs, len(project_paths))) as pool:
+        return dict(zip(project_paths, pool.map(collect, project_paths)))
+
+
+@contextmanager
+def open_report_caches(
+    cache_dir: Path | None, clear_git_cache: bool = False, clear_day_cache: bool = False
+) -> Iterator[dict[str, Any]]:
+    """Open the persistent caches under `cache_dir` as `build_report` keyword arguments.
+
+    `clear_git_cache` and `clear_day_cache` empty the commit stats and day
+    rollup caches first, e.g. after rewriting history for a finished day.
+    """
+    if cache_dir is None:
+        yield {}
+        return
+    with EventStore.in_cache_dir(cache_dir) as event_store:
+        with CommitStatsCache.in_cache_dir(cache_dir) as git_stats_cache:
+            with SessionRecordCache.in_cache_dir(cache_dir) as session_cache:
+                with DayRollupCache.in_cache_dir(cache_dir) as day_cache:
+                    if clear_git_cache:
+                        git_stats_cache.clear()
+                    if clear_day_cache:
+                        day_cache.clear()
+                    yield {
+                        "event_store": event_store,
+                        "git_stats_cache": git_stats_cache,
+                        "session_cache": session_cache,
+                        "day_cache": day_cache,
+                    }
 
 
 def build_report(
@@ -675,110 +689,260 @@ def build_report(
     claude_home: Path,
     codex_home: Path,
     project_filter: str | None = None,
+    event_store: EventStore | None = None,
+    git_jobs: int = DEFAULT_GIT_JOBS,
+    git_stats_cache: CommitStatsCache | None = None,
+    jobs: int = 1,
+    deep_commit_scan: bool = False,
+    session_cache: SessionRecordCache | None = None,
+    day_cache: DayRollupCache | None = None,
+    profiler: StageProfiler | None = None,
 ) -> dict[str, Any]:
-    """Build the structured report JSON."""
+    """Build the structured report JSON.
+
+    With an `event_store`, only lines appended since the previous run are parsed
+    and the window is read back from the store instead of the raw histories.
+    With a `session_cache`, session slices whose files did not change are not
+    re-analyzed. With a `day_cache`, local days that ended before the run are
+    rolled up once and reused by later multi-day reports, so only the days
+    still in progress (or cut by the window) are read from the histories;
+    sessions crossing midnight are merged from their per-day rollups.
+    A `profiler` records each stage of `iter_report_records`.
+    `jobs` worker processes parse session files; the result does not depend on it.
+    """
+    report = empty_report()
+    for record in iter_report_records(
+        start,
+        end,
+        timezone_name,
+        claude_home,
+        codex_home,
+        project_filter=project_filter,
+        event_store=event_store,
+        git_jobs=git_jobs,
+        git_stats_cache=git_stats_cache,
+        jobs=jobs,
+        deep_commit_scan=deep_commit_scan,
+        session_cache=session_cache,
+        day_cache=day_cache,
+        profiler=profiler,
+    ):
+        add_report_record(report, record)
+    return report
+
+
+def iter_report_records(
+    start: datetime,
+    end: datetime,
+    timezone_name: str,
+    claude_home: Path,
+    codex_home: Path,
+    project_filter: str | None = None,
+    event_store: EventStore | None = None,
+    git_jobs: int = DEFAULT_GIT_JOBS,
+    git_stats_cache: CommitStatsCache | None = None,
+    jobs: int = 1,
+    deep_commit_scan: bool = False,
+    session_cache: SessionRecordCache | None = None,
+    day_cache: DayRollupCache | None = None,
+    profiler: StageProfiler | None = None,
+) -> Iterator[ReportRecord]:
+    """Yield the report piece by piece as each part is finalized.
+
+    The period comes first, then every session once the project filter has
+    been applied, every project once its git data is in, and the daily,
+    Codex index, tool and token summaries before the overall `summary`. Takes
+    the same arguments as `build_report`. Records are yielded between
+    profiled stages, so time spent by the consumer is not charged to them.
+    """
     tz = _get_tz(timezone_name)
+    yield ReportRecord(
+        "period",
+        {
+            "start": start.astimezone(tz).isoformat(),
+            "end": end.astimezone(tz).isoformat(),
+            "timezone": timezone_name,
+        },
+    )
 
-    try:
-        claude_events = load_claude_events(claude_home)
-    except Exception:  # pragma: no cover - defensive loader isolation
-        claude_events = []
-    try:
-        codex_events_raw = load_codex_events(codex_home)
-    except Exception:  # pragma: no cover - defensive loader isolation
-        codex_events_raw = []
-    codex_events = [
-        event
-        for event in codex_events_raw
-        if isinstance(event.get("timestamp"), str)
-        and (
-            event.get("confidence") == "high"
-            or "/sessions/" in str(event.get("evidence_path", ""))
-        )
-    ]
-
-    all_events = claude_events + codex_events
-    filtered_events = []
-    for event in all_events:
-        timestamp = event.get("timestamp")
-        if not isinstance(timestamp, str):
-            continue
-        try:
-            parsed = parse_timestamp(timestamp)
-        except ValueError:
-            continue
-        if start <= parsed <= end:
-            filtered_events.append(event)
+    days = _report_days(start, end, tz, time.time())
+    day_boundaries = [day.begin.timestamp() for day in days[1:]]
+    session_scope = rollup_scope("sessions", str(claude_home), str(codex_home), deep_commit_scan)
+    cached_days: dict[int, dict[str, dict[str, Any]]] = {}
+    if day_cache is not None:
+        for index, day in enumerate(days):
+            rollups = day_cache.get(day.key, timezone_name, session_scope) if day.finished else None
+            if rollups is not None:
+                cached_days[index] = rollups
+    live_days = [day for index, day in enumerate(days) if index not in cached_days]
+    if live_days:
+        load_start = max(start, live_days[0].begin)
+        load_end = min(end, live_days[-1].next_begin)
+
+    if not live_days:
+        claude_events, codex_events_raw = [], []
+    elif event_store is not None:
+        with profile_stage(profiler, "load_event_store") as counts:
+            try:
+                claude_events, codex_events_raw = event_store.load_events(
+                    claude_home, codex_home, load_start, load_end, jobs=jobs, stats=counts
+                )
+            except Exception:  # pragma: no cover - defensive loader isolation
+                claude_events, codex_events_raw = [], []
+            counts.update(claude_events=len(claude_events), codex_events=len(codex_events_raw))
+    else:
+        with profile_stage(profiler, "load_claude") as counts:
+            try:
+                claude_events = load_claude_events(
+                    claude_home, start=load_start, end=load_end, jobs=jobs, prefilter=True, stats=counts
+                )
+            except Exception:  # pragma: no cover - defensive loader isolation
+                claude_events = []
+        with profile_stage(profiler, "load_codex") as counts:
+            try:
+                codex_events_raw = load_codex_events(
+                    codex_home, start=load_start, end=load_end, jobs=jobs, prefilter=True, stats=counts
+                )
+            except Exception:  # pragma: no cover - defensive loader isolation
+                codex_events_raw = []
+
+    with profile_stage(profiler, "group_sessions") as counts:
+        codex_events = [
+            event
+            for event in codex_events_raw
+            if isinstance(event.get("timestamp"), str)
+            and (
+                event.get("confidence") == "high"
+                or "/sessions/" in str(event.get("evidence_path", ""))
+            )
+        ]
 
-    session_groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for event in filtered_events:
-        session_groups[_session_group_key(event)].append(event)
-
-    sessions = [
-        analyze_session(session_key, grouped)
-        for session_key, grouped in session_groups.items()
-    ]
-    sessions = [session for session in sessions if session["status"] != "abandoned"]
-    sessions.sort(key=lambda session: session.get("start") or "")
-
-    active_session_keys = {session["group_key"] for session in sessions}
-    active_events = [
-        event for event in filtered_events if _session_group_key(event) in active_session_keys
-    ]
-    main_sessions = [session for session in sessions if not session.get("is_subagent")]
-    subagent_sessions = [session for session in sessions if session.get("is_subagent")]
-
-    projects = _aggregate_by_project(main_sessions)
-    _apply_project_union_durations(projects, active_events)
-    projects = _filter_project_map(projects, project_filter)
-    projects = _assign_display_names(projects)
-
-    if project_filter:
-        allowed_paths = set(projects.keys())
-        main_sessions = [session for session in main_sessions if session.get("project") in allowed_paths]
-        subagent_sessions = [
-            session for session in subagent_sessions if session.get("project") in allowed_paths
+        # Live events are sliced per local day and session, so a session that
+        # crosses midnight is rolled up once per day and merged afterwards.
+        start_epoch = start.timestamp()
+        end_epoch = end.timestamp()
+        slices: dict[int, dict[str, list[Event]]] = defaultdict(lambda: defaultdict(list))
+        live_events = 0
+        for event in claude_events + codex_events:
+            event = Event.coerce(event)
+            if event.ts_epoch is None or not start_epoch <= event.ts_epoch <= end_epoch:
+                continue
+            index = bisect_right(day_boundaries, event.ts_epoch)
+            if index in cached_days:
+                continue
+            slices[index][_session_group_key(event)].append(event)
+            live_events += 1
+        counts.update(events=live_events, cached_days=len(cached_days))
+
+    with profile_stage(profiler, "analyze_sessions") as counts:
+        day_rollups = dict(cached_days)
+        for index in sorted(slices):
+            day_rollups[index] = _roll_up_slices(slices[index], deep_commit_scan, session_cache)
+        if day_cache is not None:
+            for index, day in enumerate(days):
+                if day.finished and index not in cached_days:
+                    day_cache.put(day.key, timezone_name, session_scope, day_rollups.get(index, {}))
+
+        session_rollups: dict[str, list[dict[str, Any]]] = {}
+        for index in sorted(day_rollups):
+            for session_key, rollup in day_rollups[index].items():
+                session_rollups.setdefault(session_key, []).append(rollup)
+        sessions = [
+            session_record(session_key, merge_session_rollups(rollups))
+            for session_key, rollups in session_rollups.items()
         ]
-        active_events = [
-            event
-            for event in active_events
-            if (event.get("project_path") or "unknown") in allowed_paths
+        sessions = [session for session in sessions if session["status"] != "abandoned"]
+        session_start_epochs = {
+            session_key: rollups[0]["first_epoch"] for session_key, rollups in session_rollups.items()
+        }
+        sessions.sort(key=lambda session: session_start_epochs[session["group_key"]])
+        counts.update(sessions=len(sessions))
+
+    with profile_stage(profiler, "aggregate_projects") as counts:
+        active_session_keys = {session["group_key"] for session in sessions}
+        main_sessions = [session for session in sessions if not session.get("is_subagent")]
+        subagent_sessions = [session for session in sessions if session.get("is_subagent")]
+
+        projects = _aggregate_by_project(main_sessions)
+        projects = _filter_project_map(projects, project_filter)
+        projects = _assign_display_names(projects)
+
+        # One index over every active window answers the project, day and
+        # total durations below.
+        activity = [
+            ((days[index].key, project_key), window)
+            for index, rollups in day_rollups.items()
+            for session_key, rollup in rollups.items()
+            if session_key in active_session_keys
+            for project_key, windows in rollup["windows"].items()
+            for window in windows
         ]
-        _apply_project_union_durations(projects, active_events)
+        if project_filter:
+            allowed_paths = set(projects.keys())
+            main_sessions = [
+                session for session in main_sessions if session.get("project") in allowed_paths
+            ]
+            subagent_sessions = [
+                session for session in subagent_sessions if session.get("project") in allowed_paths
+            ]
+            activity = [entry for entry in activity if entry[0][1] in allowed_paths]
+        activity_index = WindowIndex(activity)
+        _apply_project_union_durations(projects, activity_index.minutes_by(1))
+        counts.update(projects=len(projects))
+
+    for session in main_sessions:
+        yield ReportRecord("session", session)
+    for session in subagent_sessions:
+        yield ReportRecord("subagent_session", session)
+
+    with profile_stage(profiler, "collect_git") as counts:
+        total_commits = 0
+        git_data = _collect_projects_git_data(list(projects), start, end, git_jobs, git_stats_cache)
+        for path, project in projects.items():
+            git_commits = git_data[path]
+            project["git_commits"] = git_commits
+            total_commits += len(git_commits)
+            touched_files = _dedupe_strings(
+                [file for commit in git_commits for file in commit.get("files", [])],
+                limit=20,
+            )
+            project["files_touched"] = touched_files
+        counts.update(projects=len(projects), commits=total_commits)
 
-    total_commits = 0
     for path, project in projects.items():
-        git_commits = collect_git_data(path, start, end)
-        project["git_commits"] = git_commits
-        total_commits += len(git_commits)
-        touched_files = _dedupe_strings(
-            [file for commit in git_commits for file in commit.get("files", [])],
-            limit=20,
-        )
-        project["files_touched"] = touched_files
-
-    total_tokens = {"input": 0, "output": 0, "cache_creation": 0, "cache_read": 0}
-    total_tool_usage: Counter[str] = Counter()
-    for session in sessions:
-        for key in total_tokens:
-            total_tokens[key] += int(session.get("tokens", {}).get(key, 0) or 0)
-        for tool_name, count in session.get("tools_used", {}).items():
-            total_tool_usage[tool_name] += count
-
-    total_duration = _calculate_duration_for_events(active_events)
-    daily_summary = _build_daily_summary(main_sessions, active_events, tz)
-    subagent_duration = sum(session.get("duration_minutes", 0) for session in subagent_sessions)
-    codex_sessions = _parse_codex_index_sessions(codex_home, start, end)
-    start_local = start.astimezone(tz)
-    end_local = end.astimezone(tz)
-
-    return {
-        "period": {
-            "start": start_local.isoformat(),
-            "end": end_local.isoformat(),
-            "timezone": timezone_name,
+        yield ReportRecord("project", project, path)
+
+    with profile_stage(profiler, "summarize"):
+        total_tokens = {"input": 0, "output": 0, "cache_creation": 0, "cache_read": 0}
+        total_tool_usage: Counter[str] = Counter()
+        for session in sessions:
+            for key in total_tokens:
+                total_tokens[key] += int(session.get("tokens", {}).get(key, 0) or 0)
+            for tool_name, count in session.get("tools_used", {}).items():
+                total_tool_usage[tool_name] += count
+
+        total_duration = activity_index.minutes()
+        daily_summary = _build_daily_summary(main_sessions, activity_index.minutes_by(0), tz, session_start_epochs)
+        subagent_duration = sum(session.get("duration_minutes", 0) for session in subagent_sessions)
+        codex_sessions = _parse_codex_index_sessions(codex_home, start, end)
+
+    for day in daily_summary:
+        yield ReportRecord("daily_summary", day)
+    for codex_session in codex_sessions:
+        yield ReportRecord("codex_session", codex_session)
+    yield ReportRecord("tool_summary", dict(total_tool_usage))
+    yield ReportRecord(
+        "token_summary",
+        {
+            "total_input": total_tokens["input"],
+            "total_output": total_tokens["output"],
+            "total_cache_creation": total_tokens["cache_creation"],
+            "total_cache_read": total_tokens["cache_read"],
         },
-        "summary": {
+    )
+    yield ReportRecord(
+        "summary",
+        {
             "total_duration_minutes": total_duration,
             "active_sessions": len(main_sessions),
             "project_count": len(projects),
@@ -787,59 +951,12 @@ def build_report(
             "subagent_duration_minutes": subagent_duration,
             "sources": sorted({source for project in projects.values() for source in project.get("sources", [])}),
         },
-        "projects": projects,
-        "sessions": main_sessions,
-        "subagent_sessions": subagent_sessions,
-        "daily_summary": daily_summary,
-        "codex_sessions": codex_sessions,
-        "tool_summary": dict(total_tool_usage),
-        "token_summary": {
-            "total_input": total_tokens["input"],
-            "total_output": total_tokens["output"],
-            "total_cache_creation": total_tokens["cache_creation"],
-            "total_cache_read": total_tokens["cache_read"],
-        },
-    }
-
-
-def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(
-        description="Generate work log data from Claude and Codex sessions"
-    )
-    parser.add_argument(
-        "time_range",
-        help="Time range: today|yesterday|this-week|this-month|YYYY-MM-DD",
-    )
-    parser.add_argument(
-        "end_date",
-        nargs="?",
-        default=None,
-        help="End date for custom range (YYYY-MM-DD)",
     )
-    parser.add_argument("--timezone", default="Asia/Taipei")
-    parser.add_argument("--project", default=None)
-    parser.add_argument("--claude-home", default=str(Path.home() / ".claude"))
-    parser.add_argument("--codex-home", default=str(Path.home() / ".codex"))
-    parser.add_argument("--emit-project-dir", default=None)
-    return parser.parse_args(argv)
-
-
-def main(argv: list[str] | None = None) -> None:
-    args = parse_args(argv)
-    start, end = parse_time_shortcut(args.time_range, args.timezone, args.end_date)
-    report = build_report(
-        start=start,
-        end=end,
-        timezone_name=args.timezone,
-        claude_home=Path(args.claude_home),
-        codex_home=Path(args.codex_home),
-        project_filter=args.project,
-    )
-    if args.emit_project_dir:
-        _emit_project_bundles(report, Path(args.emit_project_dir))
-    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
-    print()
 
 
 if __name__ == "__main__":
+    # Kept for existing invocations; `python -m wl_parser.cli` skips importing
+    # this pipeline when the daemon answers.
+    from wl_parser.cli import main
+
     main()